@@ -0,0 +1,121 @@
+"""empty message
+
+Revision ID: 9b41e7c05d26
+Revises: 5e7b0d3c2a18
+Create Date: 2026-10-18 14:22:09.471836
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from utils.series_codec import decode_floats, decode_weights, encode_floats, encode_weights
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b41e7c05d26'
+down_revision: Union[str, None] = '5e7b0d3c2a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 한 번에 변환할 행 수
+BATCH_SIZE = 500
+
+
+def _convert(source: dict, target: dict, convert) -> None:
+    """
+    source 컬럼 값을 convert 로 변환해 target 컬럼에 저장한다. (data_id 순으로 BATCH_SIZE 씩)
+    """
+    connection = op.get_bind()
+    table = sa.table(
+        'rebalancing_data',
+        sa.column('data_id', sa.Integer()),
+        *[sa.column(name, type_) for name, type_ in {**source, **target}.items()],
+    )
+    cursor = 0
+    while True:
+        rows = connection.execute(
+            sa.select(table.c.data_id, *[table.c[name] for name in source])
+            .where(table.c.data_id > cursor)
+            .order_by(table.c.data_id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            connection.execute(
+                table.update().where(table.c.data_id == row.data_id).values(**convert(row))
+            )
+        cursor = rows[-1].data_id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('rebalancing_data', sa.Column('last_rebalance_weight', sa.JSON(), nullable=True))
+    op.add_column('rebalancing_data', sa.Column('rebalance_weight_data', sa.LargeBinary(), nullable=True))
+    op.add_column('rebalancing_data', sa.Column('nav_history_data', sa.LargeBinary(), nullable=True))
+
+    _convert(
+        {'rebalance_weight_list': sa.JSON(), 'nav_history': sa.JSON()},
+        {
+            'rebalance_weight_data': sa.LargeBinary(),
+            'nav_history_data': sa.LargeBinary(),
+            'last_rebalance_weight': sa.JSON(),
+        },
+        lambda row: {
+            'rebalance_weight_data': encode_weights(row.rebalance_weight_list),
+            'nav_history_data': encode_floats(row.nav_history),
+            'last_rebalance_weight': (
+                row.rebalance_weight_list[-1] if row.rebalance_weight_list else None
+            ),
+        },
+    )
+
+    with op.batch_alter_table('rebalancing_data') as batch_op:
+        batch_op.drop_column('rebalance_weight_list')
+        batch_op.drop_column('nav_history')
+        batch_op.alter_column(
+            'rebalance_weight_data',
+            new_column_name='rebalance_weight_list',
+            existing_type=sa.LargeBinary(),
+            nullable=False,
+        )
+        batch_op.alter_column(
+            'nav_history_data',
+            new_column_name='nav_history',
+            existing_type=sa.LargeBinary(),
+            nullable=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('rebalancing_data', sa.Column('rebalance_weight_json', sa.JSON(), nullable=True))
+    op.add_column('rebalancing_data', sa.Column('nav_history_json', sa.JSON(), nullable=True))
+
+    _convert(
+        {'rebalance_weight_list': sa.LargeBinary(), 'nav_history': sa.LargeBinary()},
+        {'rebalance_weight_json': sa.JSON(), 'nav_history_json': sa.JSON()},
+        lambda row: {
+            'rebalance_weight_json': decode_weights(row.rebalance_weight_list),
+            'nav_history_json': decode_floats(row.nav_history),
+        },
+    )
+
+    with op.batch_alter_table('rebalancing_data') as batch_op:
+        batch_op.drop_column('rebalance_weight_list')
+        batch_op.drop_column('nav_history')
+        batch_op.drop_column('last_rebalance_weight')
+        batch_op.alter_column(
+            'rebalance_weight_json',
+            new_column_name='rebalance_weight_list',
+            existing_type=sa.JSON(),
+            nullable=False,
+        )
+        batch_op.alter_column(
+            'nav_history_json',
+            new_column_name='nav_history',
+            existing_type=sa.JSON(),
+            nullable=False,
+        )
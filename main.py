@@ -1,21 +1,48 @@
+import logging
 import os
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
+from fastapi.exceptions import RequestValidationError
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from stocks.api.routes.daily_ticker import router as daily_ticker_router
+from stocks.api.routes.jobs import router as jobs_router
+from stocks.api.routes.metrics import router as metrics_router
 from stocks.api.routes.rebalancing import router as rebalancing_router
 import uvicorn
 
-from stocks.core.middleware import standardize_response_middleware
+from stocks.core.executor import shutdown_pools
+from stocks.core.middleware import timing_middleware
+from stocks.services.jobs import resume_unfinished_jobs
+from stocks.core.response import (
+    StandardJSONResponse,
+    http_exception_handler,
+    validation_exception_handler,
+)
 
 load_dotenv()
 
-app = FastAPI()
-app.middleware("http")(standardize_response_middleware)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    resume_unfinished_jobs()
+    yield
+    shutdown_pools()
+
+
+app = FastAPI(default_response_class=StandardJSONResponse, lifespan=lifespan)
+app.add_exception_handler(StarletteHTTPException, http_exception_handler)
+app.add_exception_handler(RequestValidationError, validation_exception_handler)
+app.middleware("http")(timing_middleware)
 
 app.include_router(daily_ticker_router, prefix="/api/v1/daily_ticker")
 app.include_router(rebalancing_router, prefix="/api/v1/rebalancing")
+app.include_router(jobs_router, prefix="/api/v1/jobs")
+app.include_router(metrics_router)
 
 ENV = os.getenv("ENV")
 
@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from stocks.core.database import get_async_db
+from stocks.infra.database.rebalancing import async_rebalancing_repo
+from stocks.infra.database.rebalancing_job import async_rebalancing_job_repo
+from stocks.schemas.job import JobStatusOutput, JobSubmitOutput
+from stocks.schemas.rebalancing import RebalanceInput
+from stocks.services.jobs import submit_rebalancing_job
+from stocks.services.strategy import get_strategy
+
+router = APIRouter()
+
+
+@router.post("/rebalancing")
+async def submit_rebalancing(
+    data: RebalanceInput, db: AsyncSession = Depends(get_async_db)
+) -> JobSubmitOutput:
+    """
+    리밸런싱 작업 등록 API
+    작업은 백그라운드 프로세스에서 실행되며, 진행 상황과 결과는 /jobs/{job_id} 로 조회한다.
+
+    params: /rebalancing/process 와 같음
+
+    returns:
+    - job_id: int
+    - status: str  pending
+    """
+    try:
+        get_strategy(data.strategy)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    job = await async_rebalancing_job_repo.create(db, "rebalancing", data.dict())
+    submit_rebalancing_job(job.job_id)
+    return JobSubmitOutput(job_id=job.job_id, status=job.status)
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: int, db: AsyncSession = Depends(get_async_db)) -> JobStatusOutput:
+    """
+    작업 상태 조회 API
+    params:
+    - job_id: int
+
+    returns:
+    - status: str  pending, running, done, failed
+    - progress: int  완료한 리밸런싱 횟수
+    - total: int  전체 리밸런싱 횟수
+    - current_date: datetime  마지막으로 처리한 리밸런싱 날짜
+    - data_id, output, last_rebalance_weight: 완료된 경우 결과
+    - error: str  실패한 경우 오류 내용
+    """
+    job = await async_rebalancing_job_repo.fetch_by_job_id(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    output = JobStatusOutput(
+        job_id=job.job_id,
+        job_type=job.job_type,
+        status=job.status,
+        progress=job.progress,
+        total=job.total,
+        current_date=job.current_date,
+        data_id=job.data_id,
+        error=job.error,
+    )
+    if job.data_id is not None:
+        entry = await async_rebalancing_repo.fetch_by_data_id(db, job.data_id)
+        if entry:
+            output.output = entry.output_data
+            output.last_rebalance_weight = entry.last_rebalance_weight
+    return output
@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from stocks.core.metrics import render_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics() -> PlainTextResponse:
+    """
+    Prometheus 지표 API
+    요청 처리 시간(http_request_duration_seconds)과 백테스트 단계별 시간(backtest_phase_seconds)
+    지표는 프로세스별로 집계되므로 여러 워커로 실행하면 워커마다 따로 수집해야 한다.
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -1,25 +1,59 @@
+import asyncio
 import logging
 import traceback
+import weakref
 
-from fastapi import APIRouter, Depends, HTTPException
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from stocks.core.database import SessionLocal, engine, get_db
-from stocks.infra.database.rebalancing import rebalancing_repo
+from stocks.core.database import engine, get_async_db, get_db
+from stocks.core.executor import run_in_simulation_pool
+from stocks.infra.database.daily_ticker import async_daily_ticker_repo, daily_ticker_repo
+from stocks.infra.database.rebalancing import async_rebalancing_repo
 from stocks.models import Base
-from stocks.models.rebalancing import RebalancingData, serialize_rebalancing_data
+from stocks.models.rebalancing import (
+    REBALANCING_DATA_FIELDS,
+    RebalancingData,
+    serialize_rebalancing_data,
+)
 from stocks.schemas.rebalancing import *
+from stocks.services.analytics import analytics_service
+from stocks.services.monte_carlo import run_monte_carlo
 from stocks.services.rebalancing import rebalancing_service
+from stocks.services.response_cache import response_cache
+from stocks.services.result_cache import rebalancing_result_cache
+from stocks.services.strategy import STRATEGIES, get_strategy
+from stocks.services.sweep import expand_grid, get_sweep_price_range, run_sweep
 
 Base.metadata.create_all(bind=engine)
 
 router = APIRouter()
 
+SWEEP_MAX_COMBINATIONS = 100000
+MAX_FETCH_LIMIT = 200
+MONTE_CARLO_MAX_PATHS = 100000
+
+# 같은 입력을 동시에 계산해 중복 저장하지 않도록 input_hash 별로 잠근다 (사용 중인 잠금만 남음)
+_input_locks: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+
+def input_lock(input_hash: str) -> asyncio.Lock:
+    lock = _input_locks.get(input_hash)
+    if lock is None:
+        lock = _input_locks[input_hash] = asyncio.Lock()
+    return lock
+
 
 # API Endpoint
 @router.post("/process")
-def process_rebalance(data: RebalanceInput) -> RebalanceProcessOutput:
+async def process_rebalance(
+    data: RebalanceInput, db: AsyncSession = Depends(get_async_db)
+) -> RebalanceProcessOutput:
     """
     리밸런싱 API
+    시뮬레이션은 프로세스 풀에서 실행하므로 계산 중에도 다른 요청을 처리할 수 있다.
 
     params:
     - start_year: int  투자 시작 연도
@@ -28,71 +62,348 @@ def process_rebalance(data: RebalanceInput) -> RebalanceProcessOutput:
     - trading_day: int  거래일
     - trading_fee: float 거래 수수료
     - rebalance_month_period: int  리밸런싱 참고 주기 (월)
+    - strategy: str  리밸런싱 전략 (/rebalancing/strategies, 기본 dual_momentum)
+    - universe: list  투자 대상 종목 (생략하면 전체 종목)
 
     returns:
     - data_id: int
     - output: dict
     - last_rebalance_weight: list
     """
-    session = SessionLocal()
     try:
-        # Run trading strategy (dummy implementation)
-        rebalance_weight_list, stats, nav_history = rebalancing_service.run_rebalancing(
-            session,
+        get_strategy(data.strategy)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        input_data = data.dict()
+        input_hash = rebalancing_result_cache.make_key(
+            input_data, await async_daily_ticker_repo.price_version(db)
+        )
+        cached_output = rebalancing_result_cache.get(input_hash)
+        if cached_output is not None:
+            # 다른 프로세스에서 삭제되거나 연장된 결과일 수 있으므로 행이 그대로인지 확인
+            version = await async_rebalancing_repo.fetch_version(db, cached_output.data_id)
+            if version is not None and version[0] == input_hash:
+                return cached_output
+            rebalancing_result_cache.discard_data_id(cached_output.data_id)
+
+        # 같은 입력, 같은 가격 데이터로 이미 저장된 결과가 있으면 재사용
+        # (동시에 들어온 같은 입력은 먼저 들어온 요청이 저장한 결과를 읽는다)
+        async with input_lock(input_hash):
+            investment = await async_rebalancing_repo.fetch_by_input_hash(db, input_hash)
+            if investment is None:
+                since, tickers = rebalancing_service.get_input_price_range(input_data)
+                prices = await async_daily_ticker_repo.fetch_price_matrix(db, since, tickers)
+                rebalance_weight_list, stats, nav_history, state = await run_in_simulation_pool(
+                    rebalancing_service.simulate_with_state,
+                    prices,
+                    data.start_year,
+                    data.start_month,
+                    data.initial_nav,
+                    data.trading_day,
+                    data.trading_fee,
+                    data.rebalance_month_period,
+                    strategy=data.strategy,
+                    universe=data.universe,
+                )
+                # Save to DB
+                investment = await async_rebalancing_repo.create(
+                    db,
+                    RebalancingData(
+                        input_data=input_data,
+                        output_data=stats,
+                        rebalance_weight_list=rebalance_weight_list,
+                        nav_history=nav_history,
+                        input_hash=input_hash,
+                        simulation_state=state,
+                    ),
+                )
+
+        output = RebalanceProcessOutput(
+            data_id=investment.data_id,
+            output=investment.output_data,
+            last_rebalance_weight=investment.last_rebalance_weight,
+        )
+        rebalancing_result_cache.put(input_hash, output)
+        return output
+
+    except (ValueError, IndexError) as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        await db.rollback()
+        logging.error(f"/rebalance/: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/extend/{data_id}")
+async def extend_rebalance(
+    data_id: int, db: AsyncSession = Depends(get_async_db)
+) -> RebalanceProcessOutput:
+    """
+    저장된 리밸런싱 결과를 최신 가격까지 갱신하는 API
+    저장된 마지막 상태부터 새 리밸런싱만 실행한다. (상태가 없으면 처음부터 다시 실행)
+
+    params:
+    - data_id: int
+
+    returns:
+    - data_id: int
+    - output: dict
+    - last_rebalance_weight: list
+    """
+    entry = await async_rebalancing_repo.fetch_by_data_id(db, data_id, with_history=True)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Data not found")
+
+    try:
+        input_data = entry.input_data
+        input_hash = rebalancing_result_cache.make_key(
+            input_data, await async_daily_ticker_repo.price_version(db)
+        )
+        # 이미 최신 가격으로 계산된 결과면 그대로 반환
+        if entry.input_hash != input_hash:
+            since, tickers = rebalancing_service.get_input_price_range(input_data)
+            prices = await async_daily_ticker_repo.fetch_price_matrix(db, since, tickers)
+            rebalance_weight_list, stats, nav_history, state = await run_in_simulation_pool(
+                rebalancing_service.resume,
+                prices,
+                input_data,
+                entry.simulation_state,
+                entry.nav_history,
+                entry.rebalance_weight_list,
+            )
+            entry.output_data = stats
+            entry.rebalance_weight_list = rebalance_weight_list
+            entry.nav_history = nav_history
+            entry.simulation_state = state
+            entry.input_hash = input_hash
+            await async_rebalancing_repo.update(db, entry)
+            rebalancing_result_cache.discard_data_id(entry.data_id)
+            analytics_service.discard_data_id(entry.data_id)
+            response_cache.discard_data_id(entry.data_id)
+
+    except (ValueError, IndexError) as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        await db.rollback()
+        logging.error(f"/rebalance/extend: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    output = RebalanceProcessOutput(
+        data_id=entry.data_id,
+        output=entry.output_data,
+        last_rebalance_weight=entry.last_rebalance_weight,
+    )
+    rebalancing_result_cache.put(input_hash, output)
+    return output
+
+
+@router.post("/sweep")
+def sweep_rebalance(
+    data: RebalanceSweepInput, db: Session = Depends(get_db)
+) -> RebalanceSweepOutput:
+    """
+    리밸런싱 파라미터 그리드 탐색 API
+    모든 파라미터 조합을 프로세스 풀에서 실행하고 sort_by 지표 순으로 정렬해 반환한다.
+
+    params:
+    - start_year, start_month, initial_nav, trading_day, trading_fee, rebalance_month_period, strategy: list  파라미터별 후보
+    - universe: list  투자 대상 종목 (생략하면 전체 종목)
+    - sort_by: str  정렬 기준 지표 (total_return, cagr, vol, sharpe, mdd), vol 은 낮은 순, 나머지는 높은 순
+    - limit: int  반환할 상위 조합 수
+
+    returns:
+    - total: int  전체 조합 수
+    - results: list  파라미터와 투자 성과 지표
+    """
+    grid = data.dict()
+    total = len(expand_grid(grid))
+    if total > SWEEP_MAX_COMBINATIONS:
+        raise HTTPException(status_code=400, detail="Too many combinations")
+
+    try:
+        since, tickers = get_sweep_price_range(grid)
+        prices = daily_ticker_repo.fetch_price_matrix(db, since, tickers)
+        results = run_sweep(prices, grid, data.sort_by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return RebalanceSweepOutput(total=total, results=results[: data.limit])
+
+
+@router.post("/monte_carlo")
+async def monte_carlo_rebalance(
+    data: RebalanceMonteCarloInput, db: AsyncSession = Depends(get_async_db)
+) -> RebalanceMonteCarloOutput:
+    """
+    리밸런싱 몬테카를로 시뮬레이션 API
+    시작일 이후의 월별 수익률을 블록 부트스트랩한 가상 경로들에 같은 전략과 수수료를 적용하고
+    경로별 투자 성과 지표의 분포를 반환한다.
+
+    params:
+    - start_year, start_month, initial_nav, trading_day, trading_fee, rebalance_month_period, strategy, universe
+      /process 와 같음 (start_year, start_month, trading_day 이후의 수익률로 표본추출)
+    - paths: int  경로 수 (최대 100000)
+    - periods: int  경로별 리밸런싱 횟수 (생략하면 과거 데이터의 리밸런싱 횟수)
+    - block_months: int  부트스트랩 블록 길이 (개월)
+    - seed: int  난수 시드 (생략하면 임의로 정하고 응답에 포함)
+
+    returns:
+    - paths, periods, seed: int
+    - months: int  표본추출에 사용한 월별 수익률 개수
+    - stats: dict  지표별 분포 (mean, std, min, max, p5, p25, p50, p75, p95)
+    - loss_probability: float  전체 기간 수익률이 음수인 경로 비율
+    """
+    if not 0 < data.paths <= MONTE_CARLO_MAX_PATHS:
+        raise HTTPException(
+            status_code=400, detail=f"paths must be 1 ~ {MONTE_CARLO_MAX_PATHS}"
+        )
+    if data.block_months < 1:
+        raise HTTPException(status_code=400, detail="block_months must be at least 1")
+    try:
+        get_strategy(data.strategy)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    input_data = data.dict()
+    since, tickers = rebalancing_service.get_input_price_range(input_data)
+    prices = await async_daily_ticker_repo.fetch_price_matrix(db, since, tickers)
+    try:
+        result = await run_in_simulation_pool(
+            run_monte_carlo,
+            prices,
             data.start_year,
             data.start_month,
             data.initial_nav,
             data.trading_day,
             data.trading_fee,
             data.rebalance_month_period,
+            strategy=data.strategy,
+            universe=data.universe,
+            paths=data.paths,
+            periods=data.periods,
+            block_months=data.block_months,
+            seed=data.seed,
         )
-        print(data.dict())
-        # Save to DB
-        investment = RebalancingData(
-            input_data=data.dict(),
-            output_data=stats,
-            rebalance_weight_list=rebalance_weight_list,
-            nav_history=nav_history,
-        )
-        session.add(investment)
-        session.commit()
-        session.refresh(investment)
-        print("Asdf")
-        return RebalanceProcessOutput(
-            data_id=investment.data_id,
-            output=stats,
-            last_rebalance_weight=rebalance_weight_list[-1],
+    except (ValueError, IndexError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return RebalanceMonteCarloOutput(**result)
+
+
+@router.post("/daily_nav")
+async def daily_nav_rebalance(
+    data: RebalanceInput, db: AsyncSession = Depends(get_async_db)
+) -> RebalanceDailyNavOutput:
+    """
+    리밸런싱 일별 NAV API
+    리밸런싱 사이의 거래일마다 보유 종목을 그날 가격으로 평가한 NAV 와,
+    그 일별 NAV 로 계산한 투자 성과 지표 (연 252 거래일 기준)를 반환한다.
+
+    params:
+    - start_year, start_month, initial_nav, trading_day, trading_fee, rebalance_month_period, strategy, universe
+      /process 와 같음
+
+    returns:
+    - dates: list  거래일 (첫 날은 투자 시작일)
+    - nav: list  일별 NAV
+    - stats: dict  일별 NAV 기준 투자 성과 지표
+    - rebalance_stats: dict  리밸런싱 기준 투자 성과 지표 (/process 의 output 과 같음)
+    """
+    try:
+        get_strategy(data.strategy)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        since, tickers = rebalancing_service.get_input_price_range(data.dict())
+        prices = await async_daily_ticker_repo.fetch_price_matrix(db, since, tickers)
+        _, stats, _, daily = await run_in_simulation_pool(
+            rebalancing_service.simulate_daily,
+            prices,
+            data.start_year,
+            data.start_month,
+            data.initial_nav,
+            data.trading_day,
+            data.trading_fee,
+            data.rebalance_month_period,
+            strategy=data.strategy,
+            universe=data.universe,
         )
+    except (ValueError, IndexError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return RebalanceDailyNavOutput(
+        dates=np.datetime_as_string(daily["dates"]).tolist(),
+        nav=daily["nav"].tolist(),
+        stats=daily["stats"],
+        rebalance_stats=stats,
+    )
 
-    except Exception as e:
-        session.rollback()
-        logging.error(f"/rebalance/: {traceback.format_exc()}")
-        print(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        session.close()
+
+@router.get("/strategies")
+def get_strategies() -> GetStrategiesOutput:
+    """
+    사용 가능한 리밸런싱 전략 조회 API
+
+    returns:
+    - strategies: list  전략 이름과 설명
+    """
+    return GetStrategiesOutput(
+        strategies=[
+            StrategyOutput(name=strategy.name, description=strategy.description)
+            for strategy in STRATEGIES.values()
+        ]
+    )
 
 
 @router.get("/fetch/all")
-def get_rebalancing_all_data(db: Session = Depends(get_db)) -> GetRebalanceAllDataOutput:
+async def get_rebalancing_all_data(
+    cursor: int | None = None,
+    limit: int = 200,
+    fields: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> GetRebalanceAllDataOutput:
     """
     모든 리밸런싱 데이터 조회 API
-    좀비 쿼리나 response가 너무 커질 수 있으므로 최대 200개의 데이터만 조회 가능
+    좀비 쿼리나 response가 너무 커질 수 있으므로 한 번에 최대 200개씩 data_id 순으로 조회
+    params:
+    - cursor: int  이전 페이지의 next_cursor (첫 페이지는 생략)
+    - limit: int  페이지 크기 (최대 200)
+    - fields: str  조회할 컬럼 (쉼표로 구분, 생략하면 전체)
+      data_id, input_data, output_data, rebalance_weight_list, nav_history, last_rebalance_weight
+
     returns:
     - data_list: list
-
+    - next_cursor: int  다음 페이지 조회용 cursor, 마지막 페이지면 null
     """
-    limit = 200
-    entries = serialize_rebalancing_data(rebalancing_repo.fetch_all(db, limit))
-    if len(entries) == limit:
-        raise HTTPException(status_code=400, detail="Too many entries")
-    return GetRebalanceAllDataOutput(data_list=entries)
+    if not 0 < limit <= MAX_FETCH_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be 1 ~ {MAX_FETCH_LIMIT}")
+
+    selected_fields = REBALANCING_DATA_FIELDS
+    if fields:
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = set(requested) - set(REBALANCING_DATA_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {sorted(unknown)}")
+        selected_fields = ["data_id"] + [f for f in requested if f != "data_id"]
+
+    rows = await async_rebalancing_repo.fetch_all(db, limit, cursor, selected_fields)
+    return GetRebalanceAllDataOutput(
+        data_list=serialize_rebalancing_data(rows, selected_fields),
+        next_cursor=rows[-1].data_id if len(rows) == limit else None,
+    )
 
 
 @router.get("/fetch/{data_id}")
-def get_rebalancing_data(data_id: int, db: Session = Depends(get_db)) -> GetRebalanceDataOutput:
+async def get_rebalancing_data(
+    data_id: int, request: Request, db: AsyncSession = Depends(get_async_db)
+) -> GetRebalanceDataOutput:
     """
     리밸런싱 데이터 조회 API
+    결과가 바뀌지 않았으면 직렬화해 둔 응답을 그대로 보내고,
+    If-None-Match (ETag) 또는 If-Modified-Since 가 현재 결과와 같으면 304 를 반환한다.
+
     params:
     - data_id: int
 
@@ -101,18 +412,70 @@ def get_rebalancing_data(data_id: int, db: Session = Depends(get_db)) -> GetReba
     - output: dict
     - last_rebalance_weight: list
     """
-    entry = rebalancing_repo.fetch_by_data_id(db, data_id)
+    version = await async_rebalancing_repo.fetch_version(db, data_id)
+    if version is None:
+        response_cache.discard_data_id(data_id)
+        raise HTTPException(status_code=404, detail="Data not found")
+
+    key = ("fetch", data_id)
+    cached = response_cache.get(key, version)
+    if cached is None:
+        entry = await async_rebalancing_repo.fetch_by_data_id(db, data_id)
+        if not entry:
+            raise HTTPException(status_code=404, detail="Data not found")
+        output = GetRebalanceDataOutput(
+            input=entry.input_data,
+            output=entry.output_data,
+            last_rebalance_weight=entry.last_rebalance_weight,
+        )
+        cached = response_cache.put(
+            key, data_id, version, jsonable_encoder(output), entry.updated_at
+        )
+    return cached.to_response(request)
+
+
+@router.get("/analytics/{data_id}")
+async def get_rebalancing_analytics(
+    data_id: int, window: int = 12, db: AsyncSession = Depends(get_async_db)
+) -> GetRebalanceAnalyticsOutput:
+    """
+    리밸런싱 결과 성과 분석 API
+    저장된 nav_history 로 이동 지표와 손실 구간을 계산한다. (결과가 갱신되기 전까지 캐시)
+    기간은 nav_history 의 인덱스 (0 은 투자 시작, i 는 i 번째 리밸런싱 직후)
+
+    params:
+    - data_id: int
+    - window: int  이동 지표 구간 (리밸런싱 횟수, 기본 12)
+
+    returns:
+    - window: int
+    - sortino: float  소르티노 지수 (연환산 수익률 / 연환산 하방 편차)
+    - calmar: float  칼마 지수 (연환산 수익률 / 최대 손실폭)
+    - max_drawdown_duration: int  최장 손실 기간 (최고점부터 회복까지)
+    - drawdown: list  기간별 최고점 대비 손실폭 (%)
+    - underwater_periods: list  손실 구간 (start, trough, end, depth, duration, recovery)
+    - rolling: dict  window 구간별 return, cagr, vol, sharpe (i 번째 값은 기간 i ~ i + window)
+    """
+    if window < 2:
+        raise HTTPException(status_code=400, detail="window must be at least 2")
+
+    entry = await async_rebalancing_repo.fetch_by_data_id(db, data_id)
     if not entry:
         raise HTTPException(status_code=404, detail="Data not found")
-    return GetRebalanceDataOutput(
-        input=entry.input_data,
-        output=entry.output_data,
-        last_rebalance_weight=entry.rebalance_weight_list[-1],
-    )
+
+    version = entry.input_hash or ""
+    analytics = analytics_service.get(data_id, version, window)
+    if analytics is None:
+        await async_rebalancing_repo.load_history(db, entry, ["nav_history"])
+        analytics = analytics_service.calculate(entry.nav_history, entry.output_data, window)
+        analytics_service.put(data_id, version, window, analytics)
+    return GetRebalanceAnalyticsOutput(data_id=data_id, **analytics)
 
 
 @router.delete("/fetch/{data_id}")
-def delete_entry(data_id: int, db: Session = Depends(get_db)) -> DeleteRebalanceDataOutput:
+async def delete_entry(
+    data_id: int, db: AsyncSession = Depends(get_async_db)
+) -> DeleteRebalanceDataOutput:
     """
     리밸런싱 데이터 삭제 API
     params:
@@ -121,7 +484,10 @@ def delete_entry(data_id: int, db: Session = Depends(get_db)) -> DeleteRebalance
     returns:
     - data_id: int
     """
-    entry = rebalancing_repo.delete_by_data_id(db, data_id)
+    entry = await async_rebalancing_repo.delete_by_data_id(db, data_id)
     if not entry:
         raise HTTPException(status_code=404, detail="Data not found")
+    rebalancing_result_cache.discard_data_id(entry.data_id)
+    analytics_service.discard_data_id(entry.data_id)
+    response_cache.discard_data_id(entry.data_id)
     return DeleteRebalanceDataOutput(data_id=entry.data_id)
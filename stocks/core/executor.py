@@ -0,0 +1,76 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from stocks.core.metrics import profile_requested, record_timings, run_timed
+
+# 시뮬레이션(CPU 작업)을 실행할 프로세스 수
+SIMULATION_WORKERS = int(os.getenv("SIMULATION_WORKERS", str(os.cpu_count() or 1)))
+# 백그라운드 작업(/jobs)을 실행할 프로세스 수
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+
+_pool: ProcessPoolExecutor | None = None
+_job_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _init_job_worker() -> None:
+    """
+    부모 프로세스에서 복사된 DB 커넥션을 공유하지 않도록 커넥션 풀을 비운다.
+    """
+    from stocks.core.database import engine
+
+    engine.dispose(close=False)
+
+
+def get_simulation_pool() -> ProcessPoolExecutor:
+    """
+    시뮬레이션용 프로세스 풀 (처음 사용할 때 생성)
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=SIMULATION_WORKERS)
+    return _pool
+
+
+async def run_in_simulation_pool(func, *args, **kwargs):
+    """
+    CPU 작업을 프로세스 풀에서 실행해 이벤트 루프가 막히지 않도록 한다.
+    func 와 인자는 pickle 가능해야 한다.
+    워커에서 측정한 단계별 시간은 현재 요청에 기록된다.
+    """
+    loop = asyncio.get_running_loop()
+    result, timings = await loop.run_in_executor(
+        get_simulation_pool(), partial(run_timed, func, profile_requested(), *args, **kwargs)
+    )
+    record_timings(timings)
+    return result
+
+
+def get_job_pool() -> ProcessPoolExecutor:
+    """
+    백그라운드 작업용 프로세스 풀 (처음 사용할 때 생성)
+    작업은 DB 에 직접 진행 상황과 결과를 기록한다.
+    """
+    global _job_pool
+    if _job_pool is None:
+        with _pool_lock:
+            if _job_pool is None:
+                _job_pool = ProcessPoolExecutor(
+                    max_workers=JOB_WORKERS, initializer=_init_job_worker
+                )
+    return _job_pool
+
+
+def shutdown_pools() -> None:
+    global _pool, _job_pool
+    with _pool_lock:
+        for pool in (_pool, _job_pool):
+            if pool is not None:
+                pool.shutdown()
+        _pool = None
+        _job_pool = None
@@ -0,0 +1,202 @@
+import bisect
+import cProfile
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # pyinstrument 가 없으면 cProfile 로 프로파일링
+    Profiler = None
+
+# 응답에 Server-Timing 헤더를 붙일지 여부
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "false").lower() == "true"
+# 요청별 프로파일링 허용 여부 (허용되면 X-Profile: 1 헤더가 있는 요청만 프로파일링)
+PROFILE_ENABLED = os.getenv("PROFILE_ENABLED", "false").lower() == "true"
+# 프로파일 결과를 저장할 디렉터리
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "profiles"))
+
+# 히스토그램 구간 경계 (초)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# 현재 요청(또는 작업)에서 측정한 단계별 시간 {단계: 초}
+_timings: ContextVar[dict | None] = ContextVar("timings", default=None)
+# 현재 요청의 프로파일링 여부
+_profile: ContextVar[bool] = ContextVar("profile", default=False)
+
+
+class Histogram:
+    """
+    Prometheus 히스토그램 (레이블 조합별 구간 개수, 합계, 개수)
+    """
+
+    def __init__(self, name: str, description: str, labels: tuple, buckets: tuple = BUCKETS):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series: dict = {}
+
+    def observe(self, value: float, *label_values) -> None:
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series_items = [
+                (label_values, list(counts), total, count)
+                for label_values, (counts, total, count) in sorted(self._series.items())
+            ]
+        for label_values, counts, total, count in series_items:
+            labels = ",".join(
+                f'{name}="{value}"' for name, value in zip(self.labels, label_values)
+            )
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {count}")
+        return lines
+
+
+phase_seconds = Histogram(
+    "backtest_phase_seconds",
+    "Time spent in each backtest phase (fetch, weights, trades, stats, persist)",
+    ("phase",),
+)
+request_seconds = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency",
+    ("method", "handler", "status"),
+)
+
+
+def render_metrics() -> str:
+    """
+    Prometheus text exposition 형식의 지표 (프로세스별로 집계됨)
+    """
+    lines = phase_seconds.render() + request_seconds.render()
+    return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def collect_timings():
+    """
+    블록 안에서 timed() 로 측정한 단계별 시간을 모은다.
+    """
+    timings = {}
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+def record_timings(timings: dict) -> None:
+    """
+    다른 프로세스에서 측정한 단계별 시간을 현재 요청에 더한다.
+    """
+    current = _timings.get()
+    if current is None:
+        return
+    for phase, seconds in timings.items():
+        current[phase] = current.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def timed(phase: str):
+    """
+    블록의 실행 시간을 phase 단계로 기록한다. (collect_timings 밖에서는 아무것도 하지 않음)
+    """
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - started
+
+
+def observe_timings(timings: dict) -> None:
+    for phase, seconds in timings.items():
+        phase_seconds.observe(seconds, phase)
+
+
+def server_timing_header(timings: dict, total: float) -> str:
+    entries = [f"{phase};dur={seconds * 1000:.1f}" for phase, seconds in timings.items()]
+    return ", ".join(entries + [f"total;dur={total * 1000:.1f}"])
+
+
+def profile_requested() -> bool:
+    return _profile.get()
+
+
+@contextmanager
+def request_profile(requested: bool):
+    token = _profile.set(PROFILE_ENABLED and requested)
+    try:
+        yield
+    finally:
+        _profile.reset(token)
+
+
+@contextmanager
+def profiling(name: str, enabled: bool = True):
+    """
+    블록을 프로파일링해 PROFILE_DIR 에 저장한다.
+    pyinstrument 가 있으면 HTML, 없으면 cProfile 통계 파일(.prof)로 저장한다.
+    """
+    if not enabled:
+        yield
+        return
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(
+        PROFILE_DIR, f"{datetime.now():%Y%m%d-%H%M%S-%f}-{os.getpid()}-{name}"
+    )
+    if Profiler is not None:
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            with open(f"{path}.html", "w") as f:
+                f.write(profiler.output_html())
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(f"{path}.prof")
+
+
+def run_timed(func, profile: bool, *args, **kwargs):
+    """
+    다른 프로세스에서 func 를 실행하고 결과와 단계별 시간을 함께 반환한다.
+    """
+    with collect_timings() as timings, profiling(getattr(func, "__name__", "task"), profile):
+        result = func(*args, **kwargs)
+    return result, timings
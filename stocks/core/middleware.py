@@ -1,19 +1,40 @@
-import json
+import time
 
 from fastapi import Request
-from fastapi.responses import JSONResponse
 
-async def standardize_response_middleware(request: Request, call_next: callable):
-    """
-    같은 형식의 응답을 보내기 위한 미들웨어
-    """
-    response = await call_next(request)
+from stocks.core.metrics import (
+    SERVER_TIMING_ENABLED,
+    collect_timings,
+    observe_timings,
+    profile_requested,
+    profiling,
+    request_profile,
+    request_seconds,
+    server_timing_header,
+)
 
-    body = b"".join([chunk async for chunk in response.body_iterator])
 
-    try:
-        content = json.loads(body.decode("utf-8"))
-    except Exception:
-        return response
+async def timing_middleware(request: Request, call_next: callable):
+    """
+    요청 처리 시간과 단계별(fetch, weights, trades, stats, persist) 시간을 /metrics 지표로 기록한다.
+    SERVER_TIMING_ENABLED 이면 Server-Timing 헤더로도 보내고,
+    PROFILE_ENABLED 이면 X-Profile: 1 헤더가 있는 요청을 프로파일링해 PROFILE_DIR 에 저장한다.
+    """
+    started = time.perf_counter()
+    with collect_timings() as timings, request_profile(request.headers.get("X-Profile") == "1"):
+        with profiling(request.url.path.strip("/").replace("/", "_"), profile_requested()):
+            response = await call_next(request)
+    elapsed = time.perf_counter() - started
 
-    return JSONResponse(content={"status": "success", "data": content}, status_code=response.status_code)
+    # 경로 파라미터마다 시계열이 늘어나지 않도록 URL 대신 처리 함수 이름으로 집계
+    endpoint = request.scope.get("endpoint")
+    request_seconds.observe(
+        elapsed,
+        request.method,
+        endpoint.__name__ if endpoint is not None else "unmatched",
+        response.status_code,
+    )
+    observe_timings(timings)
+    if SERVER_TIMING_ENABLED:
+        response.headers["Server-Timing"] = server_timing_header(timings, elapsed)
+    return response
@@ -0,0 +1,60 @@
+import json
+import math
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+try:
+    import orjson
+except ImportError:  # orjson 이 없으면 표준 json 으로 직렬화
+    orjson = None
+
+
+def _replace_non_finite(value):
+    """
+    orjson 과 같은 결과가 나오도록 NaN, inf 를 None 으로 바꾼다.
+    """
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _replace_non_finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_replace_non_finite(item) for item in value]
+    return value
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(
+            content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(
+        _replace_non_finite(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class StandardJSONResponse(JSONResponse):
+    """
+    같은 형식의 응답을 보내기 위한 응답 클래스
+    직렬화 시점에 {"status": "success", "data": ...} 로 감싸므로 응답 본문을 다시 읽지 않는다.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps({"status": "success", "data": content})
+
+
+async def http_exception_handler(request: Request, exc: StarletteHTTPException):
+    return StandardJSONResponse(
+        {"detail": exc.detail},
+        status_code=exc.status_code,
+        headers=getattr(exc, "headers", None),
+    )
+
+
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    return StandardJSONResponse(
+        {"detail": jsonable_encoder(exc.errors())}, status_code=422
+    )
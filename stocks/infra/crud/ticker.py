@@ -1,5 +1,15 @@
+import io
+from datetime import date
+
+import pandas as pd
+from sqlalchemy import insert as sql_insert
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from stocks.models.daily_ticker import DailyTicker
+from stocks.models.price_data_change import PriceDataChange
+
+# 한 번의 INSERT 문에 담을 최대 행 수
+BULK_INSERT_BATCH_SIZE = 5000
 
 
 def create_ticker(db: Session, date: str, ticker: str, price: int) -> DailyTicker:
@@ -8,3 +18,95 @@ def create_ticker(db: Session, date: str, ticker: str, price: int) -> DailyTicke
     db.commit()
     db.refresh(new_ticker)
     return new_ticker
+
+
+def record_price_change(db: Session, since=None) -> None:
+    """
+    since 이후의 가격(또는 모멘텀)이 바뀌었음을 기록한다. (since 가 None 이면 전체)
+    저장과 같은 트랜잭션에서 호출해야 다른 프로세스의 가격 캐시가 바뀐 데이터를 놓치지 않는다.
+    """
+    if since is not None:
+        since = pd.Timestamp(since).date()
+    db.execute(sql_insert(PriceDataChange).values(since=since))
+
+
+def bulk_create_tickers(
+    db: Session, rows: list, batch_size: int = BULK_INSERT_BATCH_SIZE
+) -> (int, date | None, date | None):
+    """
+    (date, ticker, price) 딕셔너리 목록을 배치 단위로 저장한다.
+    이미 있는 (date, ticker) 는 건너뛰므로 여러 번 실행해도 안전하다.
+    가격 변경 기록(record_price_change)에는 실제로 저장된 행의 가장 이른 날짜만 남긴다.
+
+    Returns:
+        새로 저장된 행 수   ||
+        새로 저장된 행의 가장 이른 날짜 (없으면 None)   ||
+        새로 저장된 행의 가장 늦은 날짜 (없으면 None)
+    """
+    dialect = db.bind.dialect.name
+    if dialect == "postgresql":
+        insert = postgresql.insert
+    elif dialect == "sqlite":
+        insert = sqlite.insert
+    else:
+        raise NotImplementedError(f"Unsupported dialect: {dialect}")
+
+    statement = (
+        insert(DailyTicker)
+        .on_conflict_do_nothing(index_elements=["date", "ticker"])
+        .returning(DailyTicker.date)
+    )
+    dates = []
+    for i in range(0, len(rows), batch_size):
+        dates.extend(db.connection().execute(statement, rows[i : i + batch_size]).scalars())
+    if dates:
+        record_price_change(db, min(dates))
+    db.commit()
+    return len(dates), min(dates, default=None), max(dates, default=None)
+
+
+def bulk_load_tickers(db: Session, frame: pd.DataFrame) -> (int, date | None, date | None):
+    """
+    (date, ticker, price) DataFrame 을 한 번에 저장한다.
+    PostgreSQL 은 임시 테이블로 COPY 한 뒤 옮기고, 그 외 DB 는 bulk_create_tickers 를 사용한다.
+    이미 있는 (date, ticker) 는 건너뛴다.
+
+    Returns:
+        bulk_create_tickers 와 같다. (새로 저장된 행 수와 그 날짜 범위)
+    """
+    if frame.empty:
+        return 0, None, None
+    frame = frame[["date", "ticker", "price"]]
+    if db.bind.dialect.name != "postgresql":
+        return bulk_create_tickers(
+            db, frame.assign(date=pd.to_datetime(frame["date"]).dt.date).to_dict("records")
+        )
+
+    buffer = io.StringIO()
+    frame.to_csv(buffer, index=False, header=False, date_format="%Y-%m-%d")
+    buffer.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS daily_ticker_load "
+            "(LIKE daily_ticker INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+        cursor.copy_expert(
+            "COPY daily_ticker_load (date, ticker, price) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+        cursor.execute(
+            "WITH inserted AS ("
+            "INSERT INTO daily_ticker (date, ticker, price) "
+            "SELECT date, ticker, price FROM daily_ticker_load ON CONFLICT DO NOTHING "
+            "RETURNING date"
+            ") SELECT count(*), min(date), max(date) FROM inserted"
+        )
+        inserted, min_date, max_date = cursor.fetchone()
+    finally:
+        cursor.close()
+    if inserted:
+        record_price_change(db, min_date)
+    db.commit()
+    return inserted, min_date, max_date
@@ -1,23 +1,295 @@
+import asyncio
+import os
+import threading
+import time
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 
-from stocks.models import DailyTicker
+from stocks.core.metrics import timed
+from stocks.infra.database.ticker_momentum import (
+    momentum_history_query,
+    ticker_momentum_repo,
+    to_momentum_frame,
+)
+from stocks.models import DailyTicker, PriceDataChange
+from utils.momentum_table import MomentumTable
+from utils.price_matrix import PriceMatrix
+
+# 다른 프로세스(수집 배치 등)에서 추가된 가격을 확인하는 주기 (초)
+PRICE_CACHE_REFRESH_SECONDS = float(os.getenv("PRICE_CACHE_REFRESH_SECONDS", "60"))
+
+PRICE_COLUMNS = ["date", "ticker", "price"]
+
+
+def price_history_query(after_date=None):
+    query = select(DailyTicker.date, DailyTicker.ticker, DailyTicker.price)
+    if after_date is not None:
+        query = query.where(DailyTicker.date > pd.Timestamp(after_date).date())
+    return query.order_by(DailyTicker.date, DailyTicker.ticker)
+
+
+def to_price_frame(rows) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=PRICE_COLUMNS)
+    df["date"] = pd.to_datetime(df["date"])
+    df["price"] = df["price"].astype(np.float64)
+    return df
+
+
+def price_change_query(after_version: int | None):
+    """
+    after_version 이후의 변경 기록 (None 이면 마지막 변경 기록만, 처음 읽을 때 사용)
+    """
+    query = select(PriceDataChange.version, PriceDataChange.since)
+    if after_version is None:
+        return query.order_by(PriceDataChange.version.desc()).limit(1)
+    return query.where(PriceDataChange.version > after_version).order_by(PriceDataChange.version)
+
+
+class PriceHistoryCache:
+    """
+    daily_ticker 전체 가격 이력을 PriceMatrix 로 보관하는 프로세스 내 캐시
+
+    - 최초 1회만 전체를 읽고, 이후에는 캐시된 마지막 날짜보다 새로운 행만 읽어 이어 붙인다.
+    - ticker_momentum 도 같은 방식으로 읽어 PriceMatrix.momentum 으로 함께 보관한다.
+    - 행렬은 갱신 시 새로 만들어 교체하므로, 이미 꺼내간 행렬은 그대로 안전하게 사용할 수 있다.
+    - 동기 세션은 get(), 비동기 세션은 aget() 으로 같은 캐시를 사용한다.
+    - 갱신할 때마다 price_data_change 의 새 변경 기록을 확인해, 다른 프로세스가 캐시된 날짜 이전의
+      데이터를 바꿨으면 (과거 가격 보강, CSV 가져오기 등) 전체를 다시 읽는다.
+    """
+
+    def __init__(self, refresh_seconds: float = PRICE_CACHE_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._async_lock = asyncio.Lock()
+        self._matrix: PriceMatrix | None = None
+        # 캐시에 반영된 마지막 변경 기록 (price_data_change.version, 기록이 없으면 0, 읽기 전이면 None)
+        self._data_version: int | None = None
+        self._refreshed_at = 0.0
+        self._stale = True
+
+    def _needs_refresh(self) -> bool:
+        return (
+            self._matrix is None
+            or self._stale
+            or time.monotonic() - self._refreshed_at >= self.refresh_seconds
+        )
+
+    @property
+    def version(self) -> str:
+        """
+        캐시된 가격 데이터의 버전 (변경 기록 버전과 행렬 버전), 데이터가 바뀌면 달라진다.
+        """
+        return f"{self._data_version}:{self._matrix.version}"
+
+    def _plan(self, changes: list) -> (PriceMatrix | None, int | None):
+        """
+        새 변경 기록(changes)을 반영하기 위해 이어 붙일 기준 행렬 (None 이면 전체를 다시 읽음)과 새 버전
+        """
+        base = self._matrix
+        if self._data_version is None:
+            return None, changes[-1].version if changes else 0
+        if not changes:
+            return base, self._data_version
+        if base is not None:
+            # 캐시된 날짜 이전(당일 포함)이 바뀌었으면 이어 붙일 수 없다
+            cached_until = min(
+                [date for date in (base.max_date, base.momentum.max_date) if date is not None],
+                default=None,
+            )
+            if cached_until is None or any(
+                since is None or np.datetime64(since, "D") <= cached_until
+                for _, since in changes
+            ):
+                base = None
+        return base, changes[-1].version
+
+    @staticmethod
+    def _after_dates(base: PriceMatrix | None) -> (np.datetime64 | None, np.datetime64 | None):
+        """
+        base 이후로 새로 읽어야 하는 가격, 모멘텀의 기준 날짜 (None 이면 전체)
+        """
+        if base is None:
+            return None, None
+        return base.max_date, base.momentum.max_date
+
+    def _apply(
+        self,
+        expected: PriceMatrix | None,
+        base: PriceMatrix | None,
+        df: pd.DataFrame,
+        momentum_df: pd.DataFrame,
+        data_version: int | None,
+    ) -> None:
+        """
+        base 이후의 가격(df)과 모멘텀(momentum_df)을 반영한다. (base 가 None 이면 전체)
+        읽는 동안 다른 곳에서 캐시가 바뀌었으면 (expected 가 아니면) 버린다.
+        """
+        if self._matrix is not expected:
+            return
+        matrix = PriceMatrix.from_frame(df)
+        momentum = MomentumTable.from_frame(momentum_df)
+        if base is not None:
+            matrix = base.append(matrix)
+            momentum = base.momentum.append(momentum)
+        self._matrix = PriceMatrix(
+            matrix.dates,
+            matrix.tickers,
+            matrix.prices,
+            matrix.prev_valid,
+            matrix.next_valid,
+            matrix.offset,
+            momentum,
+        )
+        self._data_version = data_version
+        self._refreshed_at = time.monotonic()
+        self._stale = False
+
+    def get(self, session: Session) -> PriceMatrix:
+        if not self._needs_refresh():
+            return self._matrix
+
+        with self._lock:
+            if self._needs_refresh():
+                expected = self._matrix
+                # 변경 기록을 먼저 읽어야 읽는 도중에 저장된 데이터도 다음 갱신 때 확인된다
+                changes = session.execute(price_change_query(self._data_version)).all()
+                base, data_version = self._plan(changes)
+                price_after, momentum_after = self._after_dates(base)
+                df = pd.read_sql(price_history_query(price_after), session.bind)
+                momentum_df = pd.read_sql(momentum_history_query(momentum_after), session.bind)
+                self._apply(
+                    expected, base, to_price_frame(df), to_momentum_frame(momentum_df), data_version
+                )
+            return self._matrix
+
+    async def aget(self, session: AsyncSession) -> PriceMatrix:
+        if not self._needs_refresh():
+            return self._matrix
+
+        async with self._async_lock:
+            if not self._needs_refresh():
+                return self._matrix
+            expected = self._matrix
+            changes = (await session.execute(price_change_query(self._data_version))).all()
+            base, data_version = self._plan(changes)
+            price_after, momentum_after = self._after_dates(base)
+            result = await session.execute(price_history_query(price_after))
+            df = to_price_frame(result.all())
+            result = await session.execute(momentum_history_query(momentum_after))
+            momentum_df = to_momentum_frame(result.all())
+            with self._lock:
+                self._apply(expected, base, df, momentum_df, data_version)
+                matrix = self._matrix
+        return matrix if matrix is not None else await self.aget(session)
+
+    def invalidate(self, since=None) -> None:
+        """
+        새로운 가격이 저장되었음을 알린다. (같은 프로세스에서 저장한 경우 다음 주기를 기다리지 않음)
+        since 는 저장된 가격의 가장 이른 날짜로, 캐시된 마지막 날짜 이전이면 전체를 다시 읽는다.
+        """
+        with self._lock:
+            if (
+                since is not None
+                and self._matrix is not None
+                and self._matrix.max_date is not None
+                and np.datetime64(since, "D") <= self._matrix.max_date
+            ):
+                self._matrix = None
+            self._stale = True
 
 
 class DailyTickerRepo:
+    price_cache = PriceHistoryCache()
+
     @staticmethod
-    def fetch_ticker_data(session: Session, start_date: datetime) -> pd.DataFrame:
+    def fetch_ticker_data(
+        session: Session, start_date: datetime, tickers: list = None
+    ) -> pd.DataFrame:
         """
         DB에서 주어진 날짜 이후의 가격 데이터를 불러온다.
         주말(토, 일)은 제외한다.
+        tickers 가 주어지면 해당 종목만 불러온다.
         """
         query = select(DailyTicker).where(DailyTicker.date >= start_date)
+        if tickers is not None:
+            query = query.where(DailyTicker.ticker.in_(tickers))
         df = pd.read_sql(query, session.bind)
         df["date"] = pd.to_datetime(df["date"])
         return df
 
+    def fetch_price_matrix(
+        self, session: Session, start_date: datetime, tickers: list = None
+    ) -> PriceMatrix:
+        """
+        주어진 날짜 이후, 주어진 종목(None 이면 전체)의 가격 데이터를 캐시에서 (날짜 x 종목) 행렬로 가져온다.
+        """
+        with timed("fetch"):
+            return self.price_cache.get(session).since(start_date).select(tickers)
+
+    def price_version(self, session: Session) -> str:
+        """
+        현재 캐시된 가격 데이터의 버전
+        """
+        self.price_cache.get(session)
+        return self.price_cache.version
+
+    def invalidate_cache(self, since=None) -> None:
+        self.price_cache.invalidate(since)
+
+    def refresh_momentum(self, session: Session, since=None, until=None) -> int:
+        """
+        since ~ until 의 가격이 저장된 뒤 호출한다.
+        최신 가격으로 ticker_momentum 을 다시 계산하고 캐시가 가격과 모멘텀을 다시 읽도록 한다.
+
+        Returns:
+            저장된 모멘텀 행 수
+        """
+        self.price_cache.invalidate(since)
+        count = ticker_momentum_repo.refresh(session, self.price_cache.get(session), since, until)
+        self.price_cache.invalidate(since)
+        return count
+
+
+class AsyncDailyTickerRepo:
+    price_cache = DailyTickerRepo.price_cache
+
+    @staticmethod
+    async def fetch_ticker_data(
+        session: AsyncSession, start_date: datetime, tickers: list = None
+    ) -> pd.DataFrame:
+        """
+        DB에서 주어진 날짜 이후의 가격 데이터를 불러온다.
+        tickers 가 주어지면 해당 종목만 불러온다.
+        """
+        query = select(DailyTicker.date, DailyTicker.ticker, DailyTicker.price).where(
+            DailyTicker.date >= start_date
+        )
+        if tickers is not None:
+            query = query.where(DailyTicker.ticker.in_(tickers))
+        result = await session.execute(query)
+        return to_price_frame(result.all())
+
+    async def fetch_price_matrix(
+        self, session: AsyncSession, start_date: datetime, tickers: list = None
+    ) -> PriceMatrix:
+        """
+        주어진 날짜 이후, 주어진 종목(None 이면 전체)의 가격 데이터를 캐시에서 (날짜 x 종목) 행렬로 가져온다.
+        """
+        with timed("fetch"):
+            return (await self.price_cache.aget(session)).since(start_date).select(tickers)
+
+    async def price_version(self, session: AsyncSession) -> str:
+        """
+        현재 캐시된 가격 데이터의 버전
+        """
+        await self.price_cache.aget(session)
+        return self.price_cache.version
+
 
 daily_ticker_repo = DailyTickerRepo()
+async_daily_ticker_repo = AsyncDailyTickerRepo()
@@ -1,17 +1,38 @@
 from datetime import datetime
 
 import pandas as pd
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer
 from sqlalchemy import select
 
-from stocks.models.rebalancing import RebalancingData
+from stocks.core.metrics import timed
+from stocks.models.rebalancing import REBALANCING_DATA_FIELDS, RebalancingData
+
+
+def history_options() -> list:
+    return [undefer(getattr(RebalancingData, field)) for field in RebalancingData.HISTORY_FIELDS]
 
 
 class RebalancingRepo:
     @staticmethod
-    def fetch_by_data_id(db: Session, data_id: int) -> RebalancingData:
+    def fetch_by_data_id(
+        db: Session, data_id: int, with_history: bool = False
+    ) -> RebalancingData:
+        """
+        with_history 이면 rebalance_weight_list, nav_history 도 함께 읽는다. (아니면 사용할 때 읽음)
+        """
+        query = db.query(RebalancingData).filter(RebalancingData.data_id == data_id)
+        if with_history:
+            query = query.options(*history_options())
+        return query.first()
+
+    @staticmethod
+    def fetch_by_input_hash(db: Session, input_hash: str) -> RebalancingData:
         return (
-            db.query(RebalancingData).filter(RebalancingData.data_id == data_id).first()
+            db.query(RebalancingData)
+            .filter(RebalancingData.input_hash == input_hash)
+            .order_by(RebalancingData.data_id)
+            .first()
         )
 
     @staticmethod
@@ -25,8 +46,114 @@ class RebalancingRepo:
         return entry
 
     @staticmethod
-    def fetch_all(db: Session, limit: int = 2000) -> list:
-        return db.query(RebalancingData).all()[:limit]
+    def fetch_all(
+        db: Session,
+        limit: int = 2000,
+        cursor: int = None,
+        fields: list = REBALANCING_DATA_FIELDS,
+    ) -> list:
+        """
+        data_id 순으로 cursor 다음부터 limit 개를 조회한다.
+        fields 에 있는 컬럼만 읽으므로 큰 JSON 컬럼을 제외하면 조회 비용이 줄어든다.
+        """
+        query = (
+            select(*[getattr(RebalancingData, field) for field in fields])
+            .order_by(RebalancingData.data_id)
+            .limit(limit)
+        )
+        if cursor is not None:
+            query = query.where(RebalancingData.data_id > cursor)
+        return db.execute(query).all()
+
+
+class AsyncRebalancingRepo:
+    @staticmethod
+    async def fetch_by_data_id(
+        db: AsyncSession, data_id: int, with_history: bool = False
+    ) -> RebalancingData:
+        """
+        비동기 세션은 지연 로딩을 할 수 없으므로, 이력 컬럼이 필요하면 with_history 로 함께 읽어야 한다.
+        """
+        return await db.get(
+            RebalancingData, data_id, options=history_options() if with_history else None
+        )
+
+    @staticmethod
+    async def load_history(
+        db: AsyncSession, entry: RebalancingData, fields: list = RebalancingData.HISTORY_FIELDS
+    ) -> RebalancingData:
+        """
+        이미 조회한 entry 의 이력 컬럼(fields)을 읽는다.
+        """
+        await db.refresh(entry, attribute_names=fields)
+        return entry
+
+    @staticmethod
+    async def fetch_version(db: AsyncSession, data_id: int) -> tuple | None:
+        """
+        결과가 바뀌었는지 확인하기 위한 (input_hash, updated_at), 데이터가 없으면 None
+        (큰 컬럼은 읽지 않음)
+        """
+        result = await db.execute(
+            select(RebalancingData.input_hash, RebalancingData.updated_at).where(
+                RebalancingData.data_id == data_id
+            )
+        )
+        row = result.first()
+        return tuple(row) if row is not None else None
+
+    @staticmethod
+    async def fetch_by_input_hash(db: AsyncSession, input_hash: str) -> RebalancingData:
+        result = await db.execute(
+            select(RebalancingData)
+            .where(RebalancingData.input_hash == input_hash)
+            .order_by(RebalancingData.data_id)
+            .limit(1)
+        )
+        return result.scalars().first()
+
+    @staticmethod
+    async def delete_by_data_id(db: AsyncSession, data_id: int) -> RebalancingData:
+        entry = await db.get(RebalancingData, data_id)
+        if entry:
+            await db.delete(entry)
+            await db.commit()
+        return entry
+
+    @staticmethod
+    async def fetch_all(
+        db: AsyncSession,
+        limit: int = 2000,
+        cursor: int = None,
+        fields: list = REBALANCING_DATA_FIELDS,
+    ) -> list:
+        """
+        data_id 순으로 cursor 다음부터 limit 개를 조회한다.
+        """
+        query = (
+            select(*[getattr(RebalancingData, field) for field in fields])
+            .order_by(RebalancingData.data_id)
+            .limit(limit)
+        )
+        if cursor is not None:
+            query = query.where(RebalancingData.data_id > cursor)
+        return (await db.execute(query)).all()
+
+    @staticmethod
+    async def create(db: AsyncSession, entry: RebalancingData) -> RebalancingData:
+        with timed("persist"):
+            db.add(entry)
+            await db.commit()
+            await db.refresh(entry)
+        return entry
+
+    @staticmethod
+    async def update(db: AsyncSession, entry: RebalancingData) -> RebalancingData:
+        with timed("persist"):
+            await db.commit()
+            await db.refresh(entry)
+        return entry
 
 
 rebalancing_repo = RebalancingRepo()
+async_rebalancing_repo = AsyncRebalancingRepo()
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from stocks.models.rebalancing_job import (
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_PENDING,
+    JOB_RUNNING,
+    RebalancingJob,
+)
+
+
+class RebalancingJobRepo:
+    @staticmethod
+    def fetch_by_job_id(db: Session, job_id: int) -> RebalancingJob:
+        return db.get(RebalancingJob, job_id)
+
+    @staticmethod
+    def fetch_pending_job_ids(db: Session) -> list:
+        query = (
+            select(RebalancingJob.job_id)
+            .where(RebalancingJob.status == JOB_PENDING)
+            .order_by(RebalancingJob.job_id)
+        )
+        return db.execute(query).scalars().all()
+
+    @staticmethod
+    def _update(db: Session, job_id: int, **values) -> None:
+        db.execute(
+            update(RebalancingJob)
+            .where(RebalancingJob.job_id == job_id)
+            .values(updated_at=datetime.now(), **values)
+        )
+        db.commit()
+
+    @staticmethod
+    def claim(db: Session, job_id: int) -> bool:
+        """
+        대기 중인 작업을 실행 중으로 바꾼다.
+        여러 프로세스가 같은 작업을 동시에 가져가려 해도 한 곳만 성공한다.
+
+        Returns:
+            이 프로세스가 작업을 가져왔는지 여부
+        """
+        result = db.execute(
+            update(RebalancingJob)
+            .where(RebalancingJob.job_id == job_id, RebalancingJob.status == JOB_PENDING)
+            .values(status=JOB_RUNNING, progress=0, error=None, updated_at=datetime.now())
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    def heartbeat(db: Session, job_id: int) -> None:
+        """
+        실행 중인 작업이 살아있음을 기록한다. (updated_at 갱신)
+        """
+        db.execute(
+            update(RebalancingJob)
+            .where(RebalancingJob.job_id == job_id, RebalancingJob.status == JOB_RUNNING)
+            .values(updated_at=datetime.now())
+        )
+        db.commit()
+
+    @staticmethod
+    def requeue_stale(db: Session, timeout_seconds: float) -> int:
+        """
+        timeout_seconds 동안 heartbeat 가 없는 실행 중 작업을 (실행하던 프로세스가 종료됨) 대기 상태로 되돌린다.
+
+        Returns:
+            되돌린 작업 수
+        """
+        result = db.execute(
+            update(RebalancingJob)
+            .where(
+                RebalancingJob.status == JOB_RUNNING,
+                RebalancingJob.updated_at < datetime.now() - timedelta(seconds=timeout_seconds),
+            )
+            .values(status=JOB_PENDING, updated_at=datetime.now())
+        )
+        db.commit()
+        return result.rowcount
+
+    def update_progress(
+        self, db: Session, job_id: int, progress: int, total: int, current_date: datetime
+    ) -> None:
+        self._update(db, job_id, progress=progress, total=total, current_date=current_date)
+
+    def mark_done(self, db: Session, job_id: int, data_id: int) -> None:
+        self._update(db, job_id, status=JOB_DONE, data_id=data_id)
+
+    def mark_failed(self, db: Session, job_id: int, error: str) -> None:
+        self._update(db, job_id, status=JOB_FAILED, error=error)
+
+
+class AsyncRebalancingJobRepo:
+    @staticmethod
+    async def fetch_by_job_id(db: AsyncSession, job_id: int) -> RebalancingJob:
+        return await db.get(RebalancingJob, job_id)
+
+    @staticmethod
+    async def create(db: AsyncSession, job_type: str, input_data: dict) -> RebalancingJob:
+        job = RebalancingJob(job_type=job_type, status=JOB_PENDING, input_data=input_data)
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        return job
+
+
+rebalancing_job_repo = RebalancingJobRepo()
+async_rebalancing_job_repo = AsyncRebalancingJobRepo()
@@ -0,0 +1,89 @@
+import os
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from stocks.infra.crud.ticker import BULK_INSERT_BATCH_SIZE, record_price_change
+from stocks.models import TickerMomentum
+from utils.momentum_table import MOMENTUM_COLUMNS, calculate_momentum_frame
+from utils.price_matrix import PriceMatrix
+
+# 미리 계산해 두는 모멘텀 기간 (개월, 쉼표로 구분)
+MOMENTUM_MONTHS = [int(months) for months in os.getenv("MOMENTUM_MONTHS", "1,3,6,12").split(",")]
+
+
+def momentum_history_query(after_date=None):
+    query = select(
+        TickerMomentum.date, TickerMomentum.ticker, TickerMomentum.months, TickerMomentum.momentum
+    )
+    if after_date is not None:
+        query = query.where(TickerMomentum.date > pd.Timestamp(after_date).date())
+    return query.order_by(TickerMomentum.date, TickerMomentum.ticker)
+
+
+def to_momentum_frame(rows) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=MOMENTUM_COLUMNS)
+    df["date"] = pd.to_datetime(df["date"])
+    df["momentum"] = df["momentum"].astype(np.float64)
+    return df
+
+
+class TickerMomentumRepo:
+    @staticmethod
+    def refresh(
+        session: Session,
+        prices: PriceMatrix,
+        since=None,
+        until=None,
+        months_list: list = MOMENTUM_MONTHS,
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> int:
+        """
+        since ~ until 에 저장된 가격이 바뀌었을 때 영향을 받는 날짜의 모멘텀을 다시 계산해 저장한다.
+        until 이후에도 가장 긴 기간만큼의 거래일은 구간에 바뀐 가격이 포함되므로 함께 다시 계산한다.
+        prices 는 daily_ticker 전체 가격 행렬이어야 한다. (since/until 이 None 이면 전체)
+        전체 구간을 한 번에 만들지 않고 한 배치(약 batch_size 행)에 들어갈 거래일씩 계산해 저장하므로
+        구간 길이와 관계없이 메모리 사용량이 일정하다.
+
+        Returns:
+            저장된 행 수
+        """
+        end_date = None
+        if until is not None:
+            end_date = pd.Timestamp(until) + relativedelta(months=max(months_list))
+
+        statement = delete(TickerMomentum)
+        if since is not None:
+            statement = statement.where(TickerMomentum.date >= pd.Timestamp(since).date())
+        if end_date is not None:
+            statement = statement.where(TickerMomentum.date <= end_date.date())
+        session.execute(statement)
+
+        lo = 0 if since is None else int(
+            np.searchsorted(prices.dates, np.datetime64(since, "D"), side="left")
+        )
+        hi = len(prices.dates) if end_date is None else int(
+            np.searchsorted(prices.dates, np.datetime64(end_date, "D"), side="right")
+        )
+        days_per_batch = max(1, batch_size // max(1, len(prices.tickers) * len(months_list)))
+        count = 0
+        for start in range(lo, hi, days_per_batch):
+            stop = min(start + days_per_batch, hi) - 1
+            frame = calculate_momentum_frame(
+                prices, months_list, prices.dates[start], prices.dates[stop]
+            )
+            if frame.empty:
+                continue
+            frame["date"] = frame["date"].dt.date
+            # NaN 은 DB 마다 저장 방식이 달라 NULL 로 저장
+            frame["momentum"] = frame["momentum"].astype(object).where(frame["momentum"].notna(), None)
+            session.execute(insert(TickerMomentum), frame.to_dict("records"))
+            count += len(frame)
+        record_price_change(session, since)
+        session.commit()
+        return count
+
+ticker_momentum_repo = TickerMomentumRepo()
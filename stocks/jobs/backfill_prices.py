@@ -0,0 +1,133 @@
+import argparse
+import asyncio
+import datetime
+import logging
+
+import httpx
+import numpy as np
+from sqlalchemy.orm import Session
+
+from stocks.core.database import SessionLocal
+from stocks.infra.crud.ticker import bulk_load_tickers
+from stocks.infra.database.daily_ticker import daily_ticker_repo
+from stocks.services.fetch_stock_data import STOCKS, async_fetch_price_history
+
+# 한 번의 요청으로 가져올 최대 기간 (일)
+BACKFILL_CHUNK_DAYS = 3650
+
+
+def split_range(start_date, end_date, chunk_days: int = BACKFILL_CHUNK_DAYS) -> list:
+    """
+    [start_date, end_date] 를 chunk_days 이하의 구간들로 나눈다.
+    """
+    chunks = []
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        chunk_end = min(end_date, chunk_start + datetime.timedelta(days=chunk_days - 1))
+        chunks.append((chunk_start, chunk_end))
+        chunk_start = chunk_end + datetime.timedelta(days=1)
+    return chunks
+
+
+async def backfill_ticker(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    db: Session,
+    ticker: str,
+    ranges: list,
+    chunk_days: int,
+) -> int:
+    """
+    한 종목의 누락 구간을 순서대로 가져와 저장한다.
+    구간마다 바로 커밋하므로 중간에 실패해도 다시 실행하면 남은 구간부터 이어서 채운다.
+
+    Returns:
+        새로 저장된 행 수   ||
+        새로 저장된 행의 가장 이른 날짜   ||
+        새로 저장된 행의 가장 늦은 날짜 (저장된 행이 없으면 날짜는 None)
+    """
+    inserted, min_date, max_date = 0, None, None
+    for range_start, range_end in ranges:
+        for chunk_start, chunk_end in split_range(range_start, range_end, chunk_days):
+            async with semaphore:
+                frame = await async_fetch_price_history(client, ticker, chunk_start, chunk_end)
+            count, chunk_min_date, chunk_max_date = bulk_load_tickers(db, frame)
+            if count:
+                inserted += count
+                min_date = chunk_min_date if min_date is None else min(min_date, chunk_min_date)
+                max_date = chunk_max_date if max_date is None else max(max_date, chunk_max_date)
+            logging.info(f"Backfilled {ticker} {chunk_start} ~ {chunk_end}: {count} rows")
+    return inserted, min_date, max_date
+
+
+async def backfill_prices(
+    tickers: list,
+    start_date: datetime.date,
+    end_date: datetime.date,
+    chunk_days: int = BACKFILL_CHUNK_DAYS,
+    concurrency: int = 20,
+) -> int:
+    """
+    종목별로 daily_ticker 에서 비어있는 구간을 찾아 Yahoo chart API 에서 채운다.
+
+    Returns:
+        새로 저장된 행 수
+    """
+    db: Session = SessionLocal()
+    try:
+        prices = daily_ticker_repo.price_cache.get(db)
+        missing = {
+            ticker: [
+                (range_start.astype(datetime.date), range_end.astype(datetime.date))
+                for range_start, range_end in prices.missing_ranges(ticker, start_date, end_date)
+            ]
+            for ticker in tickers
+        }
+
+        semaphore = asyncio.Semaphore(concurrency)
+        headers = {"User-Agent": "Mozilla/5.0"}
+        async with httpx.AsyncClient(headers=headers, timeout=30.0) as client:
+            results = await asyncio.gather(
+                *[
+                    backfill_ticker(client, semaphore, db, ticker, ranges, chunk_days)
+                    for ticker, ranges in missing.items()
+                    if ranges
+                ],
+                return_exceptions=True,
+            )
+
+        inserted = 0
+        inserted_ranges = []
+        for ticker, result in zip([t for t, r in missing.items() if r], results):
+            if isinstance(result, Exception):
+                logging.error(f"Failed to backfill {ticker}: {result}")
+            elif result[0]:
+                inserted += result[0]
+                inserted_ranges.append(result[1:])
+
+        # 실제로 저장된 날짜 범위의 모멘텀만 다시 계산한다
+        if inserted:
+            daily_ticker_repo.refresh_momentum(
+                db,
+                np.datetime64(min(since for since, _ in inserted_ranges), "D"),
+                np.datetime64(max(until for _, until in inserted_ranges), "D"),
+            )
+    finally:
+        db.close()
+    return inserted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="과거 가격 데이터 보강")
+    parser.add_argument("--tickers", nargs="+", default=STOCKS)
+    parser.add_argument("--start", type=datetime.date.fromisoformat, required=True)
+    parser.add_argument("--end", type=datetime.date.fromisoformat, default=datetime.date.today())
+    parser.add_argument("--chunk-days", type=int, default=BACKFILL_CHUNK_DAYS)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    inserted = asyncio.run(
+        backfill_prices(args.tickers, args.start, args.end, args.chunk_days, args.concurrency)
+    )
+    print(f"Saved {inserted} rows")
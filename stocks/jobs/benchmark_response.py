@@ -0,0 +1,68 @@
+import argparse
+import random
+import time
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from stocks.core.response import StandardJSONResponse
+
+
+def make_payload(entries: int, history: int) -> dict:
+    """
+    /fetch/all 과 같은 형태의 응답 데이터 (nav_history 포함)
+    """
+    rng = random.Random(0)
+    return {
+        "data_list": [
+            {
+                "data_id": data_id,
+                "input_data": {"start_year": 2010, "start_month": 1, "initial_nav": 1000},
+                "output_data": {"total_return": rng.random(), "sharpe": rng.random()},
+                "rebalance_weight_list": [
+                    [["SPY", 0.5], ["QQQ", 0.5], ["GLD", 0], ["TIP", 0], ["BIL", 0]]
+                    for _ in range(history)
+                ],
+                "nav_history": [1000 + rng.random() for _ in range(history)],
+            }
+            for data_id in range(entries)
+        ]
+    }
+
+
+def build_app(payload: dict, response_class: type) -> FastAPI:
+    app = FastAPI(default_response_class=response_class)
+
+    @app.get("/fetch/all")
+    def fetch_all() -> dict:
+        return payload
+
+    return app
+
+
+def measure(app: FastAPI, requests: int) -> (float, int):
+    client = TestClient(app)
+    body = client.get("/fetch/all").content
+    started = time.perf_counter()
+    for _ in range(requests):
+        client.get("/fetch/all")
+    return (time.perf_counter() - started) / requests * 1000, len(body)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="기본 JSONResponse 와 StandardJSONResponse 의 /fetch/all 응답 시간 비교"
+    )
+    parser.add_argument("--entries", type=int, default=200)
+    parser.add_argument("--history", type=int, default=240)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = make_payload(args.entries, args.history)
+    for name, response_class in [
+        ("JSONResponse", JSONResponse),
+        ("StandardJSON", StandardJSONResponse),
+    ]:
+        elapsed, size = measure(build_app(payload, response_class), args.requests)
+        print(f"{name:>15}: {elapsed:8.1f} ms/request, {size:,} bytes")
@@ -0,0 +1,342 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# 거래일 중 가격이 빠지는 비율 (종목별로 무작위)
+MISSING_RATIO = 0.01
+# 벤치마크에 사용하는 리밸런싱 파라미터
+BENCH_PARAMS = {"start_month": 1, "trading_day": 15, "trading_fee": 0.001, "rebalance_month_period": 3}
+# 결과 비교용 파라미터 조합 (시작 연도는 데이터 시작 연도 기준 오프셋)
+GOLDEN_CONFIGS = [
+    (year_offset, start_month, trading_day, trading_fee, period, strategy)
+    for year_offset in (1, 3)
+    for start_month, trading_day in ((1, 15), (6, 28))
+    for trading_fee, period in ((0.0, 1), (0.001, 3), (0.003, 12))
+    for strategy in ("dual_momentum", "equal_weight")
+]
+
+
+def make_tickers(count: int) -> list:
+    """
+    dual_momentum 전략에 필요한 기본 종목 뒤에 임의의 종목을 붙인다.
+    """
+    base = ["SPY", "QQQ", "GLD", "TIP", "BIL"]
+    return base[:count] + [f"T{i:04d}" for i in range(max(count - len(base), 0))]
+
+
+def generate_prices(tickers: int, years: int, end_year: int = 2024, seed: int = 0) -> pd.DataFrame:
+    """
+    기하 브라운 운동으로 만든 종목별 일별 가격 (date, ticker, price)
+    일부 종목은 중간에 상장되고, 거래일마다 일부 가격이 빠진다.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(datetime(end_year - years + 1, 1, 1), datetime(end_year, 12, 31))
+    names = make_tickers(tickers)
+
+    drift = rng.normal(0.0003, 0.0002, size=len(names))
+    volatility = rng.uniform(0.005, 0.02, size=len(names))
+    returns = rng.normal(drift, volatility, size=(len(dates), len(names)))
+    prices = np.round(rng.uniform(20, 300, size=len(names)) * np.exp(np.cumsum(returns, axis=0)), 4)
+
+    # 기본 종목을 제외한 종목의 절반은 기간 중간에 상장
+    listed_at = np.zeros(len(names), dtype=int)
+    late = np.arange(len(names)) >= 5
+    late &= rng.random(len(names)) < 0.5
+    listed_at[late] = rng.integers(1, len(dates) // 2, size=late.sum())
+    valid = np.arange(len(dates))[:, None] >= listed_at[None, :]
+    valid &= rng.random(valid.shape) >= MISSING_RATIO
+    valid[0, ~late] = True
+
+    rows, columns = np.nonzero(valid)
+    return pd.DataFrame(
+        {
+            "date": dates[rows].date,
+            "ticker": np.array(names, dtype=object)[columns],
+            "price": prices[rows, columns],
+        }
+    )
+
+
+def build_database(path: str, tickers: int, years: int, seed: int = 0) -> None:
+    """
+    합성 가격 데이터로 SQLite DB 를 만든다. (ticker_momentum 포함)
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from stocks.infra.crud.ticker import bulk_create_tickers
+    from stocks.infra.database.ticker_momentum import ticker_momentum_repo
+    from stocks.models import Base
+    from utils.price_matrix import PriceMatrix
+
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    frame = generate_prices(tickers, years, seed=seed)
+    session = sessionmaker(bind=engine)()
+    try:
+        bulk_create_tickers(session, frame.to_dict("records"))
+        prices = PriceMatrix.from_frame(frame.assign(date=pd.to_datetime(frame["date"])))
+        ticker_momentum_repo.refresh(session, prices)
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def measure(func, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - started) * 1000)
+    return {"min_ms": min(times), "median_ms": statistics.median(times)}
+
+
+def to_plain(value):
+    """
+    결과 비교를 위해 NumPy 값을 JSON 으로 저장 가능한 값으로 바꾼다.
+    """
+    if isinstance(value, dict):
+        return {key: to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_plain(item) for item in value]
+    if isinstance(value, str):
+        return value
+    return float(value)
+
+
+def run_benchmarks(repeat: int) -> dict:
+    """
+    DATABASE_URL 의 DB 로 엔진 각 단계와 API 의 실행 시간을 측정한다. (별도 프로세스에서 실행)
+    """
+    from fastapi.testclient import TestClient
+
+    from main import app
+    from stocks.core.database import SessionLocal
+    from stocks.infra.database.daily_ticker import PriceHistoryCache, daily_ticker_repo
+    from stocks.services.rebalancing import rebalancing_service
+    from stocks.services.strategy import get_strategy
+    from utils.constant import RebalancingContext
+
+    session = SessionLocal()
+    results = {}
+    try:
+        prices = daily_ticker_repo.price_cache.get(session)
+        start_year = int(str(prices.dates[0])[:4]) + 1
+        start_date = datetime(start_year, BENCH_PARAMS["start_month"], BENCH_PARAMS["trading_day"])
+        since, _ = rebalancing_service.get_price_range(
+            start_year,
+            BENCH_PARAMS["start_month"],
+            BENCH_PARAMS["trading_day"],
+            BENCH_PARAMS["rebalance_month_period"],
+        )
+
+        results["fetch_ticker_data"] = measure(
+            lambda: daily_ticker_repo.fetch_ticker_data(session, since), repeat
+        )
+        results["fetch_price_matrix_cold"] = measure(
+            lambda: PriceHistoryCache().get(session).since(since), repeat
+        )
+        results["fetch_price_matrix_warm"] = measure(
+            lambda: daily_ticker_repo.fetch_price_matrix(session, since), repeat
+        )
+
+        matrix = daily_ticker_repo.fetch_price_matrix(session, since)
+        rebalance_dates = pd.DatetimeIndex(
+            rebalancing_service.get_rebalance_dates(
+                matrix, start_date, BENCH_PARAMS["trading_day"], 1
+            )
+        )
+        strategy = get_strategy("dual_momentum")
+        results["calculate_weights"] = measure(
+            lambda: strategy.calculate_weights(
+                matrix, rebalance_dates, BENCH_PARAMS["rebalance_month_period"]
+            ),
+            repeat,
+        )
+
+        weights, _ = strategy.calculate_weights(
+            matrix, rebalance_dates, BENCH_PARAMS["rebalance_month_period"]
+        )
+        profit_rates, seen, _ = rebalancing_service.calculate_profit_rates(
+            matrix, rebalance_dates, BENCH_PARAMS["rebalance_month_period"]
+        )
+        nav_history = []
+
+        def execute_all_trades():
+            context = RebalancingContext(1000.0, matrix.tickers)
+            nav_history[:] = [1000.0]
+            for i in range(len(rebalance_dates)):
+                context.weight = weights[i]
+                context.profit_rate = np.where(seen[i], profit_rates[i], 0.0)
+                context.seen = seen[i]
+                rebalancing_service.execute_trades(context, BENCH_PARAMS["trading_fee"])
+                nav_history.append(context.account_status.current_nav)
+
+        results["execute_trades"] = measure(execute_all_trades, repeat)
+        results["calculate_statistics"] = measure(
+            lambda: rebalancing_service.calculate_statistics(
+                nav_history, (rebalance_dates[-1] - start_date).days
+            ),
+            repeat,
+        )
+        results["simulate"] = measure(
+            lambda: rebalancing_service.simulate(
+                matrix, start_year, initial_nav=1000.0, **BENCH_PARAMS
+            ),
+            repeat,
+        )
+
+        with TestClient(app) as client:
+            # 결과 캐시를 피하도록 요청마다 초기 자산을 바꾼다
+            navs = iter(range(1000, 1000 + repeat * 2))
+
+            def process():
+                response = client.post(
+                    "/api/v1/rebalancing/process",
+                    json={"start_year": start_year, "initial_nav": next(navs), **BENCH_PARAMS},
+                )
+                response.raise_for_status()
+
+            client.post(
+                "/api/v1/rebalancing/process",
+                json={"start_year": start_year, "initial_nav": 999, **BENCH_PARAMS},
+            ).raise_for_status()
+            results["api_process"] = measure(process, repeat)
+            results["api_fetch_all"] = measure(
+                lambda: client.get("/api/v1/rebalancing/fetch/all").raise_for_status(), repeat
+            )
+    finally:
+        session.close()
+    return results
+
+
+def run_golden() -> list:
+    """
+    DATABASE_URL 의 DB 로 GOLDEN_CONFIGS 를 실행한 결과 (별도 프로세스에서 실행)
+    """
+    from stocks.core.database import SessionLocal
+    from stocks.infra.database.daily_ticker import daily_ticker_repo
+    from stocks.services.rebalancing import rebalancing_service
+
+    session = SessionLocal()
+    outputs = []
+    try:
+        prices = daily_ticker_repo.price_cache.get(session)
+        first_year = int(str(prices.dates[0])[:4])
+        for year_offset, start_month, trading_day, trading_fee, period, strategy in GOLDEN_CONFIGS:
+            try:
+                weights, stats, nav_history = rebalancing_service.simulate(
+                    prices,
+                    first_year + year_offset,
+                    start_month,
+                    1000.0,
+                    trading_day,
+                    trading_fee,
+                    period,
+                    strategy=strategy,
+                )
+                outputs.append(to_plain({"weights": weights, "stats": stats, "nav": nav_history}))
+            except Exception as e:
+                outputs.append({"error": type(e).__name__})
+    finally:
+        session.close()
+    return outputs
+
+
+def run_in_subprocess(path: str, mode: str, repeat: int):
+    """
+    DB 마다 DATABASE_URL 을 바꿔야 하므로 측정은 별도 프로세스에서 실행한다.
+    """
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{path}",
+        LOG_LEVEL="WARNING",
+        SIMULATION_WORKERS="1",
+    )
+    completed = subprocess.run(
+        [sys.executable, "-m", "stocks.jobs.benchmark_suite", "--worker", mode, path,
+         "--repeat", str(repeat)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare_golden(expected: dict, actual: dict) -> int:
+    mismatches = 0
+    for dataset, outputs in actual.items():
+        if dataset not in expected:
+            print(f"{dataset}: no golden output")
+            continue
+        for config, before, after in zip(GOLDEN_CONFIGS, expected[dataset], outputs):
+            if before != after:
+                mismatches += 1
+                print(f"{dataset} {config}: result changed")
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="리밸런싱 엔진/API 벤치마크 (합성 가격 데이터, SQLite)"
+    )
+    parser.add_argument("--tickers", type=int, nargs="+", default=[5, 50])
+    parser.add_argument("--years", type=int, nargs="+", default=[5, 20])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "benchmark_suite"))
+    parser.add_argument("--save-golden", help="결과를 저장할 JSON 경로 (변경 전 실행)")
+    parser.add_argument("--check-golden", help="저장된 결과 JSON 경로 (변경 후 실행, 다르면 종료 코드 1)")
+    parser.add_argument("--output", help="측정 결과를 저장할 JSON 경로")
+    parser.add_argument("--worker", nargs=2, metavar=("MODE", "DB"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        mode, _ = args.worker
+        result = run_benchmarks(args.repeat) if mode == "bench" else run_golden()
+        print(json.dumps(result))
+        raise SystemExit(0)
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    report = {}
+    golden = {}
+    for tickers in args.tickers:
+        for years in args.years:
+            dataset = f"{tickers}tickers_{years}y"
+            path = os.path.join(args.data_dir, f"{dataset}.db")
+            build_database(path, tickers, years, args.seed)
+
+            if args.save_golden or args.check_golden:
+                golden[dataset] = run_in_subprocess(path, "golden", args.repeat)
+            report[dataset] = run_in_subprocess(path, "bench", args.repeat)
+
+            print(f"\n{dataset}")
+            for name, timing in report[dataset].items():
+                print(f"  {name:<26} min {timing['min_ms']:9.2f} ms   median {timing['median_ms']:9.2f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_golden:
+        with open(args.save_golden, "w") as f:
+            json.dump(golden, f)
+        print(f"\nSaved golden outputs for {len(golden)} datasets to {args.save_golden}")
+
+    if args.check_golden:
+        with open(args.check_golden) as f:
+            mismatches = compare_golden(json.load(f), golden)
+        print(f"\n{len(golden) * len(GOLDEN_CONFIGS)} results checked, {mismatches} mismatches")
+        raise SystemExit(1 if mismatches else 0)
@@ -0,0 +1,129 @@
+import argparse
+import time
+
+import numpy as np
+
+from stocks.services.rebalancing import rebalancing_service
+from utils.constant import RebalancingContext, TickerInfo
+
+
+def legacy_execute_trades(ticker_info: dict, state: dict, trading_fee: float):
+    """
+    종목별 TickerInfo 객체로 계산하던 기존 execute_trades (출력문 제외)
+    state: {"total_nav": ..., "current_nav": ...}
+    """
+    for stock_code, info in ticker_info.items():
+        info.before_nav = round(info.after_nav * info.profit_rate, 2)
+        state["total_nav"] += info.before_nav - info.target_nav
+
+    sell_amount = 0
+    for stock_code, info in ticker_info.items():
+        purchase_amount = round(state["total_nav"] * info.weight - info.before_nav, 2)
+        if purchase_amount < 0:
+            sell_amount += purchase_amount
+            info.target_nav = round(purchase_amount + info.before_nav, 2)
+            info.fee = round(abs(purchase_amount) * trading_fee, 2)
+            info.after_nav = round(purchase_amount + info.before_nav - info.fee, 2)
+            info.before_weight = info.weight
+            info.actioned = True
+            state["total_nav"] -= info.fee
+        else:
+            info.actioned = False
+
+    for stock_code, info in ticker_info.items():
+        if not info.actioned:
+            purchase_amount = round(state["total_nav"] * info.weight - info.before_nav, 2)
+            info.target_nav = purchase_amount + info.before_nav
+            info.fee = round(abs(purchase_amount) * trading_fee, 2)
+            info.after_nav = round(purchase_amount + info.before_nav - info.fee, 2)
+            info.before_weight = info.weight
+
+    total_fee = sum([info.fee for info in ticker_info.values()])
+    state["current_nav"] = state["total_nav"] - total_fee
+
+
+def make_scenario(tickers: int, periods: int, top_n: int, seed: int = 0):
+    """
+    리밸런싱마다 top_n 종목에 같은 비중을 두는 임의의 비중과 가격 변화율
+    첫 리밸런싱은 직전 가격이 없고, 일부 종목은 중간에 상장된다.
+    """
+    rng = np.random.default_rng(seed)
+    weights = np.zeros((periods, tickers))
+    for i in range(periods):
+        weights[i, rng.choice(tickers, size=min(top_n, tickers), replace=False)] = 1 / top_n
+    profit_rates = np.round(rng.lognormal(0.005, 0.05, size=(periods, tickers)), 5)
+    listed_at = rng.integers(1, max(periods // 4, 2), size=tickers)
+    listed_at[: max(tickers // 2, 1)] = 1
+    seen = np.arange(periods)[:, None] >= listed_at[None, :]
+    return weights, profit_rates, seen
+
+
+def run_legacy(tickers: list, initial_nav, trading_fee, weights, profit_rates, seen) -> list:
+    ticker_info = {ticker: TickerInfo() for ticker in tickers}
+    state = {"total_nav": initial_nav, "current_nav": initial_nav}
+    nav_history = [initial_nav]
+    for i in range(len(weights)):
+        period_weights = weights[i].tolist()
+        for j, info in enumerate(ticker_info.values()):
+            info.weight = period_weights[j]
+            info.profit_rate = profit_rates[i, j] if seen[i, j] else 0
+        legacy_execute_trades(ticker_info, state, trading_fee)
+        nav_history.append(state["current_nav"])
+    return nav_history, ticker_info
+
+
+def run_arrays(tickers: list, initial_nav, trading_fee, weights, profit_rates, seen) -> list:
+    context = RebalancingContext(initial_nav, tickers)
+    nav_history = [initial_nav]
+    for i in range(len(weights)):
+        context.weight = weights[i]
+        context.profit_rate = np.where(seen[i], profit_rates[i], 0.0)
+        context.seen = seen[i]
+        rebalancing_service.execute_trades(context, trading_fee)
+        nav_history.append(context.account_status.current_nav)
+    return nav_history, context
+
+
+def same_result(legacy, arrays) -> bool:
+    legacy_navs, ticker_info = legacy
+    array_navs, context = arrays
+    if [float(nav) for nav in legacy_navs] != [float(nav) for nav in array_navs]:
+        return False
+    for field in ["weight", "before_weight", "target_nav", "fee", "before_nav", "after_nav"]:
+        legacy_values = [float(getattr(info, field)) for info in ticker_info.values()]
+        if legacy_values != getattr(context, field).tolist():
+            return False
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="execute_trades 구현별 실행 시간 비교 (TickerInfo vs 배열)")
+    parser.add_argument("--tickers", type=int, nargs="+", default=[5, 100, 1000])
+    parser.add_argument("--periods", type=int, default=240)
+    parser.add_argument("--trading-fee", type=float, default=0.001)
+    parser.add_argument("--seeds", type=int, default=3)
+    args = parser.parse_args()
+
+    for count in args.tickers:
+        tickers = [f"T{i:04d}" for i in range(count)]
+        top_n = max(2, count // 10)
+        legacy_time = array_time = 0.0
+        mismatches = 0
+        for seed in range(args.seeds):
+            scenario = make_scenario(count, args.periods, top_n, seed)
+
+            started = time.perf_counter()
+            legacy = run_legacy(tickers, 1000.0, args.trading_fee, *scenario)
+            legacy_time += time.perf_counter() - started
+
+            started = time.perf_counter()
+            arrays = run_arrays(tickers, 1000.0, args.trading_fee, *scenario)
+            array_time += time.perf_counter() - started
+
+            mismatches += not same_result(legacy, arrays)
+
+        print(
+            f"{count:>5} tickers: TickerInfo {legacy_time / args.seeds * 1000:9.1f} ms, "
+            f"arrays {array_time / args.seeds * 1000:8.1f} ms "
+            f"({legacy_time / array_time:5.1f}x), mismatches {mismatches}/{args.seeds}"
+        )
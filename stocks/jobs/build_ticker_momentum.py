@@ -0,0 +1,35 @@
+import argparse
+import datetime
+import logging
+import time
+
+from sqlalchemy.orm import Session
+
+from stocks.core.database import SessionLocal
+from stocks.infra.database.daily_ticker import daily_ticker_repo
+
+
+def build_ticker_momentum(since: datetime.date = None) -> int:
+    """
+    daily_ticker 전체 가격으로 since 이후(None 이면 전체)의 ticker_momentum 을 다시 계산한다.
+    가격 수집 배치는 저장한 구간만 갱신하므로, 테이블을 처음 만들 때나 MOMENTUM_MONTHS 를 바꿨을 때 실행한다.
+
+    Returns:
+        저장된 행 수
+    """
+    db: Session = SessionLocal()
+    try:
+        return daily_ticker_repo.refresh_momentum(db, since)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="종목 모멘텀 테이블 재계산")
+    parser.add_argument("--since", type=datetime.date.fromisoformat, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    started = time.perf_counter()
+    count = build_ticker_momentum(args.since)
+    print(f"Saved {count} rows in {time.perf_counter() - started:.1f}s")
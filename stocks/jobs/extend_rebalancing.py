@@ -0,0 +1,74 @@
+import argparse
+import logging
+import time
+import traceback
+
+from sqlalchemy.orm import Session
+
+from stocks.core.database import SessionLocal
+from stocks.infra.database.daily_ticker import daily_ticker_repo
+from stocks.infra.database.rebalancing import rebalancing_repo
+from stocks.services.rebalancing import rebalancing_service
+from stocks.services.result_cache import rebalancing_result_cache
+
+
+def extend_all(batch_size: int = 200) -> (int, int):
+    """
+    저장된 모든 리밸런싱 결과를 최신 가격까지 갱신한다. (fetch_stock_data 이후 실행)
+    저장된 마지막 상태부터 이어서 실행하므로 새로 추가된 리밸런싱 기간만 계산한다.
+
+    Returns:
+        갱신한 결과 수, 실패한 결과 수
+    """
+    db: Session = SessionLocal()
+    updated = 0
+    failed = 0
+    cursor = None
+    try:
+        price_version = daily_ticker_repo.price_version(db)
+        while True:
+            rows = rebalancing_repo.fetch_all(db, batch_size, cursor, ["data_id"])
+            for row in rows:
+                entry = rebalancing_repo.fetch_by_data_id(db, row.data_id)
+                input_data = entry.input_data
+                input_hash = rebalancing_result_cache.make_key(input_data, price_version)
+                if entry.input_hash == input_hash:
+                    continue
+                try:
+                    since, tickers = rebalancing_service.get_input_price_range(input_data)
+                    prices = daily_ticker_repo.fetch_price_matrix(db, since, tickers)
+                    rebalance_weight_list, stats, nav_history, state = rebalancing_service.resume(
+                        prices,
+                        input_data,
+                        entry.simulation_state,
+                        entry.nav_history,
+                        entry.rebalance_weight_list,
+                    )
+                    entry.output_data = stats
+                    entry.rebalance_weight_list = rebalance_weight_list
+                    entry.nav_history = nav_history
+                    entry.simulation_state = state
+                    entry.input_hash = input_hash
+                    db.commit()
+                    updated += 1
+                except Exception:
+                    db.rollback()
+                    failed += 1
+                    logging.error(f"extend {row.data_id}: {traceback.format_exc()}")
+            if len(rows) < batch_size:
+                break
+            cursor = rows[-1].data_id
+    finally:
+        db.close()
+    return updated, failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="저장된 리밸런싱 결과를 최신 가격까지 갱신")
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    started = time.perf_counter()
+    updated, failed = extend_all(args.batch_size)
+    print(f"Extended {updated} results ({failed} failed) in {time.perf_counter() - started:.1f}s")
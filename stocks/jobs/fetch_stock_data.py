@@ -1,25 +1,51 @@
+import argparse
+import asyncio
 import logging
 from sqlalchemy.orm import Session
 from stocks.core.database import SessionLocal
-from stocks.infra.crud.ticker import create_ticker
+from stocks.infra.crud.ticker import bulk_create_tickers
+from stocks.infra.database.daily_ticker import daily_ticker_repo
 from stocks.services.fetch_stock_data import (
-    fetch_stock_price,
     STOCKS,
-    fetch_adjusted_close_price,
+    async_fetch_adjusted_close_prices,
 )
 
 
-def update_stock_prices() -> None:
-    db: Session = SessionLocal()
-    for ticker in STOCKS:
-        date, close = fetch_adjusted_close_price(ticker)
-        create_ticker(db, date, ticker, close)
+def update_stock_prices(
+    tickers: list = STOCKS, range: str = "1mo", concurrency: int = 20
+) -> int:
+    """
+    종목들의 최근 수정 종가를 동시에 가져와 한 번에 저장한다.
 
-        print(f"Saved {ticker} - {date}: {close}")
-        logging.info(f"Saved {ticker} - {date}: {close}")
+    Returns:
+        새로 저장된 행 수
+    """
+    prices = asyncio.run(
+        async_fetch_adjusted_close_prices(tickers, range, concurrency)
+    )
+    rows = [
+        {"date": date, "ticker": ticker, "price": price}
+        for ticker, ticker_prices in prices.items()
+        for date, price in ticker_prices
+    ]
 
-    db.close()
+    db: Session = SessionLocal()
+    try:
+        inserted, since, until = bulk_create_tickers(db, rows)
+        logging.info(f"Saved {inserted} rows for {len(prices)}/{len(tickers)} tickers")
+        # 이미 저장된 날짜는 건너뛰므로 새로 저장된 날짜 범위의 모멘텀만 다시 계산한다
+        if inserted:
+            daily_ticker_repo.refresh_momentum(db, since, until)
+    finally:
+        db.close()
+    return inserted
 
 
 if __name__ == "__main__":
-    update_stock_prices()
+    parser = argparse.ArgumentParser(description="최근 수정 종가 수집")
+    parser.add_argument("--tickers", nargs="+", default=STOCKS)
+    parser.add_argument("--range", default="1mo", help="Yahoo chart range (1mo, 3mo, ...)")
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Saved {update_stock_prices(args.tickers, args.range, args.concurrency)} rows")
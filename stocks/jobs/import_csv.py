@@ -1,16 +1,75 @@
+import argparse
+import logging
+import time
+
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from stocks.core.database import SessionLocal
+from stocks.infra.crud.ticker import bulk_load_tickers
+from stocks.infra.database.daily_ticker import daily_ticker_repo
+
+# 한 번에 읽을 CSV 행 수 (날짜 수)
+IMPORT_CHUNK_ROWS = 10000
+
+
+def import_csv(path: str, chunk_rows: int = IMPORT_CHUNK_ROWS) -> int:
+    """
+    date 열과 종목별 가격 열로 이루어진 CSV 를 daily_ticker 에 저장한다.
+
+    파일을 chunk_rows 행씩 읽어 (date, ticker, price) 형태로 변환해 저장하므로
+    파일 크기와 관계없이 메모리 사용량이 일정하다.
+    이미 있는 (date, ticker) 는 건너뛰므로 여러 번 실행해도 안전하다.
+
+    Returns:
+        새로 저장된 행 수
+    """
+    db: Session = SessionLocal()
+    started = time.perf_counter()
+    read_rows = 0
+    inserted = 0
+    min_date = None
+    max_date = None
+    try:
+        for chunk in pd.read_csv(path, chunksize=chunk_rows, parse_dates=["date"]):
+            frame = chunk.melt(id_vars=["date"], var_name="ticker", value_name="price")
+            frame["price"] = pd.to_numeric(frame["price"], errors="coerce")
+            frame = frame.dropna(subset=["date", "price"])
+            if frame.empty:
+                continue
 
-from stocks.core.database import DATABASE_URL
+            count, chunk_min_date, chunk_max_date = bulk_load_tickers(db, frame)
+            read_rows += len(frame)
+            if count:
+                inserted += count
+                min_date = chunk_min_date if min_date is None else min(min_date, chunk_min_date)
+                max_date = chunk_max_date if max_date is None else max(max_date, chunk_max_date)
 
-engine = create_engine(DATABASE_URL)
+            elapsed = time.perf_counter() - started
+            logging.info(
+                f"{read_rows} rows read, {inserted} inserted "
+                f"({read_rows / elapsed:,.0f} rows/sec)"
+            )
 
-df = pd.read_csv("/Users/jangjiwan/Downloads/제목 없는 스프레드시트 - 시트1.csv")
+        # 실제로 저장된 날짜 범위의 모멘텀만 다시 계산한다
+        if inserted:
+            daily_ticker_repo.refresh_momentum(
+                db, np.datetime64(min_date, "D"), np.datetime64(max_date, "D")
+            )
+    finally:
+        db.close()
+    return inserted
 
-df_melted = df.melt(id_vars=["date"], var_name="ticker", value_name="price")
 
-# 변환된 데이터 확인 (상위 5개 출력)
-print(df_melted.head())
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="가격 CSV 가져오기 (date, 종목1, 종목2, ...)")
+    parser.add_argument("path")
+    parser.add_argument("--chunk-rows", type=int, default=IMPORT_CHUNK_ROWS)
+    args = parser.parse_args()
 
-# PostgreSQL에 저장
-df_melted.to_sql("daily_ticker", engine, if_exists="append", index=False)
+    logging.basicConfig(level=logging.INFO)
+    started = time.perf_counter()
+    inserted = import_csv(args.path, args.chunk_rows)
+    elapsed = time.perf_counter() - started
+    print(f"Saved {inserted} rows in {elapsed:.1f}s")
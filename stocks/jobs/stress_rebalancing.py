@@ -0,0 +1,64 @@
+import argparse
+import json
+import logging
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.orm import Session
+
+from stocks.core.database import SessionLocal
+from stocks.services.rebalancing import rebalancing_service
+
+
+def run_once(params: tuple) -> str:
+    """
+    /process 요청과 동일하게 세션을 새로 열고 리밸런싱을 실행한다.
+    결과 비교를 위해 JSON 문자열로 반환한다.
+    """
+    session: Session = SessionLocal()
+    try:
+        result = rebalancing_service.run_rebalancing(session, *params)
+    finally:
+        session.close()
+    return json.dumps(result, default=float)
+
+
+def stress_rebalancing(requests: int, workers: int, seed: int = 0) -> int:
+    """
+    서로 다른 파라미터로 동시에 리밸런싱을 실행하고, 직렬 실행 결과와 다른 건수를 반환한다.
+    """
+    rng = random.Random(seed)
+    params_list = [
+        (
+            rng.randint(2015, 2022),
+            rng.randint(1, 12),
+            rng.choice([1000, 5000, 12345.67]),
+            rng.randint(1, 28),
+            rng.choice([0, 0.001, 0.003]),
+            rng.choice([1, 3, 6, 12]),
+        )
+        for _ in range(requests)
+    ]
+
+    expected = [run_once(params) for params in params_list]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        actual = list(executor.map(run_once, params_list))
+
+    mismatches = 0
+    for params, serial_result, concurrent_result in zip(params_list, expected, actual):
+        if serial_result != concurrent_result:
+            mismatches += 1
+            logging.error(f"result mismatch: {params}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="동시 리밸런싱 요청 검증")
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    mismatches = stress_rebalancing(args.requests, args.workers, args.seed)
+    print(f"{args.requests} requests, {mismatches} mismatches")
+    raise SystemExit(1 if mismatches else 0)
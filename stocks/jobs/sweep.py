@@ -0,0 +1,61 @@
+import argparse
+import time
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from stocks.core.database import SessionLocal
+from stocks.infra.database.daily_ticker import daily_ticker_repo
+from stocks.services.strategy import DEFAULT_STRATEGY
+from stocks.services.sweep import (
+    SWEEP_MAX_WORKERS,
+    STAT_KEYS,
+    get_sweep_price_range,
+    run_sweep,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="리밸런싱 파라미터 그리드 탐색")
+    parser.add_argument("--start-year", type=int, nargs="+", required=True)
+    parser.add_argument("--start-month", type=int, nargs="+", default=[1])
+    parser.add_argument("--initial-nav", type=float, nargs="+", default=[1000])
+    parser.add_argument("--trading-day", type=int, nargs="+", default=[15])
+    parser.add_argument("--trading-fee", type=float, nargs="+", default=[0.001])
+    parser.add_argument("--rebalance-month-period", type=int, nargs="+", default=[3])
+    parser.add_argument("--strategy", nargs="+", default=[DEFAULT_STRATEGY])
+    parser.add_argument("--sort-by", choices=STAT_KEYS, default="sharpe")
+    parser.add_argument("--workers", type=int, default=SWEEP_MAX_WORKERS)
+    parser.add_argument("--top", type=int, default=20, help="출력할 상위 조합 수")
+    parser.add_argument("--output", help="전체 결과를 저장할 CSV 경로")
+    args = parser.parse_args()
+
+    grid = {
+        "start_year": args.start_year,
+        "start_month": args.start_month,
+        "initial_nav": args.initial_nav,
+        "trading_day": args.trading_day,
+        "trading_fee": args.trading_fee,
+        "rebalance_month_period": args.rebalance_month_period,
+        "strategy": args.strategy,
+    }
+
+    since, tickers = get_sweep_price_range(grid)
+    session: Session = SessionLocal()
+    try:
+        prices = daily_ticker_repo.fetch_price_matrix(session, since, tickers)
+    finally:
+        session.close()
+
+    started = time.perf_counter()
+    results = pd.DataFrame(run_sweep(prices, grid, args.sort_by, args.workers))
+    elapsed = time.perf_counter() - started
+
+    if args.output:
+        results.to_csv(args.output, index=False)
+    print(results.head(args.top).to_string(index=False))
+    print(f"{len(results)} combinations in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import json
+import time
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from stocks.core.database import SessionLocal
+from stocks.infra.database.daily_ticker import daily_ticker_repo
+from stocks.services.strategy import DualMomentumStrategy
+from stocks.services.sweep import STAT_KEYS, get_sweep_price_range
+from stocks.services.walk_forward import WALK_FORWARD_MAX_WORKERS, run_walk_forward
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="dual_momentum 의 rebalance_month_period, top_n 워크 포워드 최적화"
+    )
+    parser.add_argument("--start-year", type=int, required=True)
+    parser.add_argument("--start-month", type=int, default=1)
+    parser.add_argument("--initial-nav", type=float, default=1000)
+    parser.add_argument("--trading-day", type=int, default=15)
+    parser.add_argument("--trading-fee", type=float, default=0.001)
+    parser.add_argument("--rebalance-month-period", type=int, nargs="+", default=[1, 3, 6, 12])
+    parser.add_argument("--top-n", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--in-sample-months", type=int, default=60)
+    parser.add_argument("--out-of-sample-months", type=int, default=12)
+    parser.add_argument("--sort-by", choices=STAT_KEYS, default="sharpe")
+    parser.add_argument("--universe", nargs="+", help="투자 대상 종목 (생략하면 전체 종목)")
+    parser.add_argument("--workers", type=int, default=WALK_FORWARD_MAX_WORKERS)
+    parser.add_argument("--output", help="구간별 결과와 NAV 를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    # 모든 후보 기간의 모멘텀을 계산할 수 있도록 가장 긴 기간 기준으로 불러온다 (top_n 과는 무관)
+    since, tickers = get_sweep_price_range(
+        {
+            "start_year": [args.start_year],
+            "rebalance_month_period": args.rebalance_month_period,
+            "strategy": [DualMomentumStrategy.name],
+            "universe": args.universe,
+        }
+    )
+    session: Session = SessionLocal()
+    try:
+        prices = daily_ticker_repo.fetch_price_matrix(session, since, tickers)
+    finally:
+        session.close()
+
+    started = time.perf_counter()
+    result = run_walk_forward(
+        prices,
+        args.start_year,
+        args.start_month,
+        args.initial_nav,
+        args.trading_day,
+        args.trading_fee,
+        args.rebalance_month_period,
+        args.top_n,
+        args.in_sample_months,
+        args.out_of_sample_months,
+        args.sort_by,
+        args.universe,
+        args.workers,
+    )
+    elapsed = time.perf_counter() - started
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    rows = [
+        {
+            "out_of_sample": " ~ ".join(window["out_of_sample"]),
+            **(window["params"] or {}),
+            f"in_sample_{args.sort_by}": (window["in_sample_stats"] or {}).get(args.sort_by),
+            f"out_of_sample_{args.sort_by}": (window["out_of_sample_stats"] or {}).get(
+                args.sort_by
+            ),
+            "error": window["error"],
+        }
+        for window in result["windows"]
+    ]
+    print(pd.DataFrame(rows).to_string(index=False))
+    print(f"stitched out-of-sample: {result['stats']}")
+    print(f"{len(rows)} windows in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
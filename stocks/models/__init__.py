@@ -1,7 +1,17 @@
 from stocks.models.daily_ticker import DailyTicker
 from stocks.models.base import Base
+from stocks.models.price_data_change import PriceDataChange
 from stocks.models.rebalancing import RebalancingData
+from stocks.models.rebalancing_job import RebalancingJob
+from stocks.models.ticker_momentum import TickerMomentum
 
 # 모든 모델을 등록
-__all__ = ["Base", "DailyTicker", "RebalancingData"]
+__all__ = [
+    "Base",
+    "DailyTicker",
+    "PriceDataChange",
+    "RebalancingData",
+    "RebalancingJob",
+    "TickerMomentum",
+]
 
@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, Integer
+from stocks.models.base import Base
+
+
+class PriceDataChange(Base):
+    """
+    daily_ticker, ticker_momentum 변경 기록 (가격을 저장하는 작업마다 한 행)
+    다른 프로세스의 가격 캐시가 이 기록으로 바뀐 데이터를 다시 읽을지 판단한다.
+    """
+
+    __tablename__ = "price_data_change"
+
+    version = Column(Integer, primary_key=True, autoincrement=True)
+    # 바뀐 데이터의 가장 이른 날짜 (NULL 이면 전체)
+    since = Column(Date, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
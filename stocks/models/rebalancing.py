@@ -1,5 +1,44 @@
-from sqlalchemy import Column, Integer, JSON
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Integer, JSON, LargeBinary, String
+from sqlalchemy.orm import deferred, validates
+from sqlalchemy.types import TypeDecorator
 from stocks.models.base import Base
+from utils.series_codec import decode_floats, decode_weights, encode_floats, encode_weights
+
+
+class FloatSeries(TypeDecorator):
+    """
+    float 리스트를 (압축된) float64 배열로 저장하는 컬럼 타입
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else encode_floats(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else decode_floats(value)
+
+
+class WeightSeries(TypeDecorator):
+    """
+    리밸런싱별 [(종목, 비중), ...] 리스트를 (압축된) 리밸런싱 x 종목 float64 행렬로 저장하는 컬럼 타입
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else encode_weights(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else decode_weights(value)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
 class RebalancingData(Base):
@@ -8,18 +47,39 @@ class RebalancingData(Base):
     data_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     input_data = Column(JSON, nullable=False)
     output_data = Column(JSON, nullable=False)
-    rebalance_weight_list = Column(JSON, nullable=False)
-    nav_history = Column(JSON, nullable=False)
+    # 전체 이력은 크기가 크므로 실제로 사용할 때만 읽는다 (단건 조회는 last_rebalance_weight 만 사용)
+    rebalance_weight_list = deferred(Column(WeightSeries, nullable=False), group="history")
+    nav_history = deferred(Column(FloatSeries, nullable=False), group="history")
+    # rebalance_weight_list 의 마지막 원소 (rebalance_weight_list 를 저장하면 함께 저장됨)
+    last_rebalance_weight = Column(JSON, nullable=True)
+    # 입력값과 가격 데이터 버전의 해시 (같은 요청의 결과 재사용용)
+    input_hash = Column(String(64), nullable=True, index=True)
+    # 마지막으로 확정된 리밸런싱 직후의 시뮬레이션 상태 (새 가격이 들어오면 이어서 실행)
+    simulation_state = Column(JSON, nullable=True)
+    # 결과를 저장하거나 갱신한 시각 (UTC, 조회 API 의 Last-Modified)
+    updated_at = Column(DateTime, nullable=True, default=_utcnow, onupdate=_utcnow)
+
+    # 이력 컬럼 (조회할 때 함께 읽어야 하는 경우 undefer 에 사용)
+    HISTORY_FIELDS = ["rebalance_weight_list", "nav_history"]
+
+    @validates("rebalance_weight_list")
+    def _set_last_rebalance_weight(self, key, value):
+        self.last_rebalance_weight = [list(weight) for weight in value[-1]] if value else None
+        return value
+
+
+REBALANCING_DATA_FIELDS = [
+    "data_id",
+    "input_data",
+    "output_data",
+    "rebalance_weight_list",
+    "nav_history",
+    "last_rebalance_weight",
+]
 
 
-def serialize_rebalancing_data(value):
+def serialize_rebalancing_data(value, fields: list = REBALANCING_DATA_FIELDS):
     if isinstance(value, list):
-        return [serialize_rebalancing_data(value) for value in value]
+        return [serialize_rebalancing_data(value, fields) for value in value]
     else:
-        return {
-            "data_id": value.data_id,
-            "input_data": value.input_data,
-            "output_data": value.output_data,
-            "rebalance_weight_list": value.rebalance_weight_list,
-            "nav_history": value.nav_history,
-        }
+        return {field: getattr(value, field) for field in fields}
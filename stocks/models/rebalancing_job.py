@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String, Text
+from stocks.models.base import Base
+
+# 작업 상태
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+JOB_UNFINISHED_STATUSES = [JOB_PENDING, JOB_RUNNING]
+
+
+class RebalancingJob(Base):
+    __tablename__ = "rebalancing_job"
+
+    job_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    job_type = Column(String(32), nullable=False, default="rebalancing")
+    status = Column(String(16), nullable=False, default=JOB_PENDING, index=True)
+    input_data = Column(JSON, nullable=False)
+    # 진행 상황 (완료한 리밸런싱 횟수 / 전체 리밸런싱 횟수, 마지막으로 처리한 리밸런싱 날짜)
+    progress = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=True)
+    current_date = Column(DateTime, nullable=True)
+    data_id = Column(
+        Integer, ForeignKey("rebalancing_data.data_id", ondelete="SET NULL"), nullable=True
+    )
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+    updated_at = Column(DateTime, nullable=False, default=datetime.now, onupdate=datetime.now)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Date, Float, Integer, String
+from stocks.models.base import Base
+
+
+class TickerMomentum(Base):
+    """
+    거래일별 직전 months 개월 구간의 종목 모멘텀 (가격 수집 시 함께 갱신)
+    """
+
+    __tablename__ = "ticker_momentum"
+
+    date = Column(Date, primary_key=True, nullable=False, index=True)
+    ticker = Column(String(10), primary_key=True, nullable=False)
+    months = Column(Integer, primary_key=True, nullable=False)
+    momentum = Column(Float, nullable=True)
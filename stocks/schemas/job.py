@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class JobSubmitOutput(BaseModel):
+    job_id: int
+    status: str
+
+
+class JobStatusOutput(BaseModel):
+    job_id: int
+    job_type: str
+    status: str
+    progress: int
+    total: int | None = None
+    current_date: datetime | None = None
+    data_id: int | None = None
+    output: dict | None = None
+    last_rebalance_weight: list | None = None
+    error: str | None = None
@@ -1,14 +1,21 @@
-from pydantic import BaseModel
+from typing import Annotated
+
+from pydantic import BaseModel, Field
 from datetime import date
 
+# 매월 리밸런싱하는 날 (그 달에 없는 날짜면 말일)
+TradingDay = Annotated[int, Field(ge=1, le=31)]
+
 
 class RebalanceInput(BaseModel):
     start_year: int
     start_month: int
     initial_nav: float
-    trading_day: int
+    trading_day: TradingDay
     trading_fee: float
     rebalance_month_period: int
+    strategy: str = "dual_momentum"
+    universe: list[str] | None = None
 
 
 class RebalanceProcessOutput(BaseModel):
@@ -23,9 +30,71 @@ class DeleteRebalanceDataOutput(BaseModel):
 
 class GetRebalanceAllDataOutput(BaseModel):
     data_list: list
+    next_cursor: int | None = None
 
 
 class GetRebalanceDataOutput(BaseModel):
     input: dict
     output: dict
     last_rebalance_weight: list
+
+
+class RebalanceSweepInput(BaseModel):
+    start_year: list[int]
+    start_month: list[int]
+    initial_nav: list[float]
+    trading_day: list[TradingDay]
+    trading_fee: list[float]
+    rebalance_month_period: list[int]
+    strategy: list[str] = ["dual_momentum"]
+    universe: list[str] | None = None
+    sort_by: str = "sharpe"
+    limit: int = 100
+
+
+class RebalanceSweepOutput(BaseModel):
+    total: int
+    results: list
+
+
+class StrategyOutput(BaseModel):
+    name: str
+    description: str
+
+
+class GetStrategiesOutput(BaseModel):
+    strategies: list[StrategyOutput]
+
+
+class GetRebalanceAnalyticsOutput(BaseModel):
+    data_id: int
+    window: int
+    sortino: float | None = None
+    calmar: float | None = None
+    max_drawdown_duration: int
+    drawdown: list
+    underwater_periods: list
+    rolling: dict
+
+
+class RebalanceMonteCarloInput(RebalanceInput):
+    paths: int = 1000
+    periods: int | None = None
+    block_months: int = 12
+    seed: int | None = None
+
+
+class RebalanceMonteCarloOutput(BaseModel):
+    paths: int
+    periods: int
+    seed: int
+    months: int
+    stats: dict
+    loss_probability: float
+
+
+class RebalanceDailyNavOutput(BaseModel):
+    dates: list[str]
+    nav: list[float]
+    stats: dict
+    rebalance_stats: dict
@@ -0,0 +1,164 @@
+import math
+import os
+
+import numpy as np
+
+from utils.lru import LRUCache
+
+ANALYTICS_CACHE_SIZE = int(os.getenv("ANALYTICS_CACHE_SIZE", "256"))
+# 1년 리밸런싱 횟수 (리밸런싱은 매월 실행되므로 calculate_statistics 의 yearly_trade_day 와 같음)
+PERIODS_PER_YEAR = 12
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    길이 window 구간 합 (누적합의 차이로 계산하므로 O(n), 길이 len(values) - window + 1)
+    """
+    cumsum = np.concatenate([[0.0], np.cumsum(values)])
+    return cumsum[window:] - cumsum[:-window]
+
+
+def rolling_statistics(
+    nav: np.ndarray, window: int, periods_per_year: int = PERIODS_PER_YEAR
+) -> dict:
+    """
+    nav 의 window 기간 이동 지표 (i 번째 값은 nav[i] ~ nav[i + window] 구간)
+    calculate_statistics 와 같은 방식 (모집단 표준편차, 무위험 수익률 0)으로 계산한다.
+
+    Returns:
+        {"return", "cagr", "vol", "sharpe"} (% 단위, 구간 수 len(nav) - window)
+    """
+    if len(nav) <= window:
+        empty = np.array([], dtype=np.float64)
+        return {"return": empty, "cagr": empty, "vol": empty, "sharpe": empty}
+
+    returns = np.diff(nav) / nav[:-1]
+    growth = nav[window:] / nav[:-window]
+
+    # 분산은 평균을 뺀 값의 누적합으로 계산해 오차를 줄인다
+    centered = returns - returns.mean()
+    mean = rolling_sum(centered, window) / window
+    variance = np.maximum(rolling_sum(centered**2, window) / window - mean**2, 0.0)
+
+    cagr = (growth ** (periods_per_year / window) - 1) * 100
+    vol = np.sqrt(variance) * np.sqrt(periods_per_year) * 100
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(vol > 0, cagr / vol, np.nan)
+    return {"return": (growth - 1) * 100, "cagr": cagr, "vol": vol, "sharpe": sharpe}
+
+
+def underwater_periods(nav: np.ndarray) -> (np.ndarray, list):
+    """
+    최고점 대비 손실폭 곡선과 손실 구간 목록
+
+    Returns:
+        손실폭 (%, len(nav))   ||
+        [{"start", "trough", "end", "depth", "duration", "recovery"}, ...]
+        start 는 직전 최고점, end 는 회복한 시점 (회복하지 못했으면 None),
+        duration 은 최고점부터 회복(또는 마지막)까지, recovery 는 저점부터 회복까지의 기간 수
+    """
+    running_max = np.maximum.accumulate(nav)
+    drawdown = (nav - running_max) / running_max * 100
+    underwater = drawdown < 0
+    if not underwater.any():
+        return drawdown, []
+
+    edges = np.diff(np.concatenate([[False], underwater, [False]]).astype(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    # 구간 사이의 손실폭은 0 이므로 다음 구간 시작 전까지 최솟값을 구해도 구간의 최저값과 같다
+    depths = np.minimum.reduceat(drawdown, starts)
+    # 구간별 저점 위치 (구간 안에서 처음으로 최저값이 되는 곳)
+    segment = np.cumsum(edges[:-1] == 1) - 1
+    is_trough = underwater & (drawdown == depths[np.maximum(segment, 0)])
+    _, first = np.unique(segment[is_trough], return_index=True)
+    troughs = np.flatnonzero(is_trough)[first]
+
+    periods = []
+    for start, trough, end, depth in zip(
+        starts.tolist(), troughs.tolist(), ends.tolist(), depths.tolist()
+    ):
+        recovered = end < len(nav)
+        periods.append(
+            {
+                "start": start - 1,
+                "trough": trough,
+                "end": end if recovered else None,
+                "depth": depth,
+                "duration": (end if recovered else len(nav) - 1) - (start - 1),
+                "recovery": end - trough if recovered else None,
+            }
+        )
+    return drawdown, periods
+
+
+def to_json_list(values: np.ndarray) -> list:
+    """NaN, inf 는 JSON 으로 보낼 수 없으므로 None 으로 바꾼다."""
+    return [value if math.isfinite(value) else None for value in values.tolist()]
+
+
+def to_json_value(value: float):
+    return value if value is not None and math.isfinite(value) else None
+
+
+class AnalyticsService:
+    """
+    저장된 리밸런싱 결과(nav_history)의 구간별 성과 분석 서비스
+
+    결과는 (data_id, 결과 해시, window) 별로 캐시하므로
+    /extend 등으로 결과가 갱신되면 새로 계산한다.
+    """
+
+    def __init__(self, maxsize: int = ANALYTICS_CACHE_SIZE):
+        self._cache = LRUCache(maxsize)
+
+    def calculate(
+        self, nav_history: list, output_data: dict, window: int = 12
+    ) -> dict:
+        """
+        Parameters:
+            nav_history (list): 리밸런싱별 순자산 가치(NAV) 리스트
+            output_data (dict): calculate_statistics 결과 (cagr, mdd 사용)
+            window (int): 이동 지표 구간 (리밸런싱 횟수)
+
+        Returns:
+            dict: 소르티노 지수, 칼마 지수, 최장 손실 기간, 손실폭 곡선, 손실 구간, 이동 지표
+        """
+        nav = np.asarray(nav_history, dtype=np.float64)
+        returns = np.diff(nav) / nav[:-1]
+        cagr = output_data.get("cagr")
+        mdd = output_data.get("mdd")
+
+        # 소르티노 지수 - 하방 편차 (목표 수익률 0)
+        downside = (
+            np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2)) * np.sqrt(PERIODS_PER_YEAR) * 100
+            if len(returns)
+            else 0.0
+        )
+        sortino = cagr / downside if cagr is not None and downside > 0 else None
+        # 칼마 지수 - 연환산 수익률 / 최대 손실폭
+        calmar = cagr / abs(mdd) if cagr is not None and mdd else None
+
+        drawdown, periods = underwater_periods(nav)
+        rolling = rolling_statistics(nav, window)
+        return {
+            "window": window,
+            "sortino": to_json_value(sortino),
+            "calmar": to_json_value(calmar),
+            "max_drawdown_duration": max((p["duration"] for p in periods), default=0),
+            "drawdown": to_json_list(drawdown),
+            "underwater_periods": periods,
+            "rolling": {name: to_json_list(values) for name, values in rolling.items()},
+        }
+
+    def get(self, data_id: int, version: str, window: int):
+        return self._cache.get((data_id, version, window))
+
+    def put(self, data_id: int, version: str, window: int, analytics: dict) -> None:
+        self._cache.put((data_id, version, window), analytics)
+
+    def discard_data_id(self, data_id: int) -> None:
+        self._cache.discard(lambda key, analytics: key[0] == data_id)
+
+
+analytics_service = AnalyticsService()
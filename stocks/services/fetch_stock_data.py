@@ -1,8 +1,24 @@
+import asyncio
+import logging
+import os
+import random
+import time
+
+import httpx
+import numpy as np
+import pandas as pd
 import requests
 import datetime
 
 YAHOO_URL = "https://query1.finance.yahoo.com/v7/finance/download/"
-STOCKS = ["SPY", "QQQ", "GLD", "TIP", "BIL"]
+YAHOO_CHART_URL = os.getenv(
+    "YAHOO_CHART_URL", "https://query1.finance.yahoo.com/v8/finance/chart/"
+)
+# 수집 대상 종목 (쉼표로 구분, 전략의 유니버스는 이 종목들 중에서 선택)
+STOCKS = os.getenv("STOCKS", "SPY,QQQ,GLD,TIP,BIL").split(",")
+
+# 재시도 대상 HTTP 상태 코드 (요청 과다, 서버 오류)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
 
 
 def fetch_stock_price(ticker: str, range: int = 1) -> (str, float):
@@ -29,27 +45,172 @@ def fetch_stock_price(ticker: str, range: int = 1) -> (str, float):
 
 
 def fetch_adjusted_close_price(ticker: str) -> (str, float):
-    url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}?interval=1d&range=1mo"
+    """
+    최근 1개월 중 가장 최근 거래일의 수정 종가
+    """
+    url = f"{YAHOO_CHART_URL}{ticker}?interval=1d&range=1mo"
     headers = {"User-Agent": "Mozilla/5.0"}
 
     response = requests.get(url, headers=headers)
 
     if response.status_code == 200:
-        data = response.json()
-        chart = data.get("chart", {}).get("result", [])[0]
-        timestamps = chart.get("timestamp", [])
-        indicators = chart.get("indicators", {})
+        rows = parse_chart_prices(response.json())
+        if not rows:
+            raise Exception(f"No price data: {ticker}")
+        date, adjusted_price = rows[-1]
+        return date.strftime("%Y-%m-%d"), adjusted_price
+
+    else:
+        raise Exception(f"Failed to fetch data: {response.status_code}")
 
-        adj_closes = indicators.get("adjclose", [{}])[0].get("adjclose", [])
-        closes = indicators.get("quote", [{}])[0].get("close", [])
 
-        for i, ts in enumerate(timestamps):
-            dt = datetime.datetime.fromtimestamp(ts).strftime("%Y-%m-%d")
-            if dt == "2025-02-14":
-                adjusted_price = (
-                    adj_closes[i] if adj_closes[i] is not None else closes[i]
+def _to_float_array(values: list, length: int) -> np.ndarray:
+    array = np.full(length, np.nan)
+    values = values[:length]
+    array[: len(values)] = np.array(values, dtype=np.float64)
+    return array
+
+
+def _open_session_start(chart: dict, now: float) -> float:
+    """
+    아직 끝나지 않은 정규장의 시작 시각 (epoch 초), 장중이 아니면 None
+    """
+    regular = chart.get("meta", {}).get("currentTradingPeriod", {}).get("regular") or {}
+    if regular.get("start") is None or regular.get("end") is None:
+        return None
+    return regular["start"] if now < regular["end"] else None
+
+
+def parse_chart_frame(data: dict, now: float = None) -> pd.DataFrame:
+    """
+    Yahoo chart 응답 전체를 (date, price) DataFrame 으로 한 번에 변환한다.
+    수정 종가가 없으면 종가를 사용하고, 둘 다 없는 날은 제외한다.
+    날짜는 거래소 시간대(gmtoffset) 기준이다.
+    장이 끝나지 않은 당일 봉은 종가가 아니므로 제외한다. (now: 기준 시각, 기본값은 현재 시각)
+    """
+    chart = (data.get("chart", {}).get("result") or [{}])[0]
+    timestamps = np.array(chart.get("timestamp") or [], dtype=np.int64)
+    indicators = chart.get("indicators", {})
+    gmt_offset = chart.get("meta", {}).get("gmtoffset") or 0
+
+    adj_closes = (indicators.get("adjclose") or [{}])[0].get("adjclose") or []
+    closes = (indicators.get("quote") or [{}])[0].get("close") or []
+
+    adj_prices = _to_float_array(adj_closes, len(timestamps))
+    prices = np.where(
+        np.isnan(adj_prices), _to_float_array(closes, len(timestamps)), adj_prices
+    )
+    dates = (timestamps + gmt_offset).astype("datetime64[s]").astype("datetime64[D]")
+    valid = ~np.isnan(prices)
+    session_start = _open_session_start(chart, time.time() if now is None else now)
+    if session_start is not None:
+        valid &= timestamps < session_start
+    return pd.DataFrame({"date": dates[valid], "price": prices[valid]})
+
+
+def parse_chart_prices(data: dict) -> list:
+    """
+    Yahoo chart 응답에서 (날짜, 수정 종가) 목록을 추출한다.
+    """
+    frame = parse_chart_frame(data)
+    return list(zip(frame["date"].dt.date, frame["price"].tolist()))
+
+
+async def async_fetch_chart(
+    client: httpx.AsyncClient,
+    ticker: str,
+    params: dict,
+    max_retries: int = 3,
+    backoff: float = 0.5,
+) -> dict:
+    """
+    Yahoo chart API 를 호출한다.
+    네트워크 오류나 RETRY_STATUS_CODES 응답은 지수 백오프로 재시도한다.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            response = await client.get(f"{YAHOO_CHART_URL}{ticker}", params=params)
+            if response.status_code == 200:
+                return response.json()
+            if response.status_code not in RETRY_STATUS_CODES:
+                raise Exception(f"Failed to fetch data: {response.status_code}")
+            error = Exception(f"Failed to fetch data: {response.status_code}")
+        except httpx.TransportError as e:
+            error = e
+
+        if attempt == max_retries:
+            raise error
+        delay = backoff * 2**attempt * (1 + random.random())
+        logging.warning(f"Retry {ticker} in {delay:.2f}s: {error}")
+        await asyncio.sleep(delay)
+
+
+async def async_fetch_adjusted_close_prices(
+    tickers: list,
+    range: str = "1mo",
+    concurrency: int = 20,
+    timeout: float = 10.0,
+) -> dict:
+    """
+    여러 종목의 수정 종가를 동시에 가져온다. 동시 요청 수는 concurrency 로 제한한다.
+
+    Returns:
+        {ticker: [(date, price), ...]}  (실패한 종목은 제외)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    headers = {"User-Agent": "Mozilla/5.0"}
+
+    async with httpx.AsyncClient(headers=headers, limits=limits, timeout=timeout) as client:
+
+        async def fetch(ticker: str) -> list:
+            async with semaphore:
+                data = await async_fetch_chart(
+                    client, ticker, {"interval": "1d", "range": range}
                 )
-                return dt, adjusted_price
+            return parse_chart_prices(data)
 
-    else:
-        raise Exception(f"Failed to fetch data: {response.status_code}")
+        results = await asyncio.gather(
+            *[fetch(ticker) for ticker in tickers], return_exceptions=True
+        )
+
+    prices = {}
+    for ticker, result in zip(tickers, results):
+        if isinstance(result, Exception):
+            logging.error(f"Failed to fetch {ticker}: {result}")
+            continue
+        prices[ticker] = result
+    return prices
+
+
+async def async_fetch_price_history(
+    client: httpx.AsyncClient,
+    ticker: str,
+    start_date: datetime.date,
+    end_date: datetime.date,
+) -> pd.DataFrame:
+    """
+    [start_date, end_date] 구간의 일별 수정 종가를 한 번의 요청으로 가져온다.
+
+    Returns:
+        (date, ticker, price) DataFrame
+    """
+    period1 = datetime.datetime.combine(start_date, datetime.time(), datetime.UTC)
+    period2 = datetime.datetime.combine(
+        end_date + datetime.timedelta(days=1), datetime.time(), datetime.UTC
+    )
+    data = await async_fetch_chart(
+        client,
+        ticker,
+        {
+            "interval": "1d",
+            "period1": int(period1.timestamp()),
+            "period2": int(period2.timestamp()),
+        },
+    )
+    frame = parse_chart_frame(data)
+    frame = frame[
+        (frame["date"] >= pd.Timestamp(start_date))
+        & (frame["date"] <= pd.Timestamp(end_date))
+    ]
+    return frame.assign(ticker=ticker)[["date", "ticker", "price"]]
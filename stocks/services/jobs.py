@@ -0,0 +1,168 @@
+import logging
+import os
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from stocks.core.database import SessionLocal
+from stocks.core.executor import get_job_pool
+from stocks.core.metrics import collect_timings, timed
+from stocks.infra.database.daily_ticker import daily_ticker_repo
+from stocks.infra.database.rebalancing import rebalancing_repo
+from stocks.infra.database.rebalancing_job import rebalancing_job_repo
+from stocks.models.rebalancing import RebalancingData
+from stocks.services.rebalancing import rebalancing_service
+from stocks.services.result_cache import rebalancing_result_cache
+from stocks.services.strategy import DEFAULT_STRATEGY
+
+# 진행 상황을 DB 에 기록하는 최소 간격 (초)
+JOB_PROGRESS_INTERVAL_SECONDS = float(os.getenv("JOB_PROGRESS_INTERVAL_SECONDS", "1"))
+# 실행 중인 작업이 살아있음을 기록하는 간격 (초)
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "10"))
+# 이 시간 (초) 동안 heartbeat 가 없는 실행 중 작업은 서버 시작 시 다시 실행한다
+JOB_HEARTBEAT_TIMEOUT_SECONDS = float(os.getenv("JOB_HEARTBEAT_TIMEOUT_SECONDS", "60"))
+
+logger = logging.getLogger(__name__)
+
+
+def run_rebalancing_job(job_id: int) -> None:
+    """
+    작업 프로세스에서 리밸런싱을 실행하고 결과를 rebalancing_data 에 저장한다.
+    진행 상황은 JOB_PROGRESS_INTERVAL_SECONDS 마다 rebalancing_job 에 기록한다.
+    """
+    with collect_timings() as timings:
+        _run_rebalancing_job(job_id)
+    logger.info(
+        "rebalancing job %s: %s",
+        job_id,
+        ", ".join(f"{phase}={seconds * 1000:.1f}ms" for phase, seconds in timings.items()),
+    )
+
+
+@contextmanager
+def heartbeat(job_id: int, interval: float = JOB_HEARTBEAT_SECONDS):
+    """
+    블록을 실행하는 동안 별도 스레드에서 interval 마다 작업의 heartbeat 를 기록한다.
+    """
+    stop = threading.Event()
+
+    def beat() -> None:
+        session = SessionLocal()
+        try:
+            while not stop.wait(interval):
+                rebalancing_job_repo.heartbeat(session, job_id)
+        except Exception:
+            logger.error(f"rebalancing job {job_id} heartbeat: {traceback.format_exc()}")
+        finally:
+            session.close()
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _run_rebalancing_job(job_id: int) -> None:
+    session = SessionLocal()
+    try:
+        # 다른 프로세스가 이미 가져간 작업이면 실행하지 않는다
+        if not rebalancing_job_repo.claim(session, job_id):
+            return
+        input_data = rebalancing_job_repo.fetch_by_job_id(session, job_id).input_data
+        with heartbeat(job_id):
+            _execute_rebalancing_job(session, job_id, input_data)
+    except Exception as e:
+        session.rollback()
+        logger.error(f"rebalancing job {job_id}: {traceback.format_exc()}")
+        rebalancing_job_repo.mark_failed(session, job_id, f"{type(e).__name__}: {e}")
+    finally:
+        session.close()
+
+
+def _execute_rebalancing_job(session: Session, job_id: int, input_data: dict) -> None:
+    input_hash = rebalancing_result_cache.make_key(
+        input_data, daily_ticker_repo.price_version(session)
+    )
+    # 같은 입력, 같은 가격 데이터로 이미 저장된 결과가 있으면 재사용
+    investment = rebalancing_repo.fetch_by_input_hash(session, input_hash)
+    if investment is None:
+        last_saved = 0.0
+
+        def save_progress(progress: int, total: int, current_date: datetime) -> None:
+            nonlocal last_saved
+            now = time.monotonic()
+            if progress < total and now - last_saved < JOB_PROGRESS_INTERVAL_SECONDS:
+                return
+            last_saved = now
+            rebalancing_job_repo.update_progress(
+                session, job_id, progress, total, current_date
+            )
+
+        since, tickers = rebalancing_service.get_input_price_range(input_data)
+        prices = daily_ticker_repo.fetch_price_matrix(session, since, tickers)
+        rebalance_weight_list, stats, nav_history, state = (
+            rebalancing_service.simulate_with_state(
+                prices,
+                input_data["start_year"],
+                input_data["start_month"],
+                input_data["initial_nav"],
+                input_data["trading_day"],
+                input_data["trading_fee"],
+                input_data["rebalance_month_period"],
+                progress=save_progress,
+                strategy=input_data.get("strategy", DEFAULT_STRATEGY),
+                universe=input_data.get("universe"),
+            )
+        )
+        investment = RebalancingData(
+            input_data=input_data,
+            output_data=stats,
+            rebalance_weight_list=rebalance_weight_list,
+            nav_history=nav_history,
+            input_hash=input_hash,
+            simulation_state=state,
+        )
+        with timed("persist"):
+            session.add(investment)
+            session.commit()
+            session.refresh(investment)
+
+    rebalancing_job_repo.mark_done(session, job_id, investment.data_id)
+
+
+def _log_job_error(future) -> None:
+    # 작업 프로세스가 비정상 종료된 경우 (작업 안의 예외는 run_rebalancing_job 에서 기록)
+    if future.exception() is not None:
+        logger.error(f"rebalancing job worker failed: {future.exception()!r}")
+
+
+def submit_rebalancing_job(job_id: int) -> None:
+    get_job_pool().submit(run_rebalancing_job, job_id).add_done_callback(_log_job_error)
+
+
+def resume_unfinished_jobs(timeout_seconds: float = JOB_HEARTBEAT_TIMEOUT_SECONDS) -> int:
+    """
+    서버가 재시작되기 전에 끝나지 않은 작업을 다시 실행한다.
+    실행 중인 작업은 timeout_seconds 동안 heartbeat 가 없을 때만 (실행하던 프로세스가 종료됨) 다시 실행하고,
+    여러 프로세스가 동시에 시작해도 작업은 claim 에 성공한 한 곳에서만 실행된다.
+
+    Returns:
+        다시 실행을 요청한 작업 수
+    """
+    session = SessionLocal()
+    try:
+        rebalancing_job_repo.requeue_stale(session, timeout_seconds)
+        job_ids = rebalancing_job_repo.fetch_pending_job_ids(session)
+    finally:
+        session.close()
+
+    for job_id in job_ids:
+        submit_rebalancing_job(job_id)
+    return len(job_ids)
@@ -0,0 +1,240 @@
+import math
+import os
+from datetime import datetime
+
+import numpy as np
+
+from stocks.services.rebalancing import rebalancing_service
+from stocks.services.strategy import DEFAULT_STRATEGY, get_strategy
+from stocks.services.sweep import STAT_KEYS
+from utils.calculator import round_numpy, round_python, sequential_sum
+from utils.price_matrix import PriceMatrix
+from utils.trading_calendar import clamp_date
+
+# 한 번에 계산하는 경로들의 (경로 수 x 기간 x 종목 수) 배열이 쓸 수 있는 메모리 (바이트)
+MONTE_CARLO_MEMORY_BUDGET = int(os.getenv("MONTE_CARLO_MEMORY_BUDGET", str(256 * 1024 * 1024)))
+# 경로 하나를 계산하는 동안 함께 잡히는 (기간 x 종목 수) float64 배열 수
+# (가격 변화율, 누적 가격, 비중과 계산 중의 임시 배열)
+MONTE_CARLO_ARRAYS_PER_PATH = 6
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+def monthly_returns(
+    prices: PriceMatrix, start_date: datetime, trading_day: int
+) -> (np.ndarray, list):
+    """
+    start_date 부터 매월 trading_day(거래일이 아니면 직전 거래일)의 종목별 가격 변화율
+    모든 종목의 가격이 있는 달만 사용한다.
+
+    Returns:
+        가격 변화율 (개월 수 x 종목 수, 1 + 수익률)   ||
+        종목 리스트
+    """
+    dates = rebalancing_service.get_rebalance_dates(prices, start_date, trading_day, 1)
+    _, levels, present = prices.window_prices(
+        np.full(len(dates), prices.dates[0]), np.array(dates, dtype="datetime64[D]")
+    )
+    levels = levels[present.all(axis=1)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = levels[1:] / levels[:-1]
+    return growth, prices.tickers
+
+
+def chunk_paths_for(
+    length: int, tickers: int, memory_budget: int = MONTE_CARLO_MEMORY_BUDGET
+) -> int:
+    """
+    memory_budget 안에서 한 번에 계산할 수 있는 경로 수 (최소 1)
+    """
+    path_bytes = MONTE_CARLO_ARRAYS_PER_PATH * (length + 1) * max(tickers, 1) * 8
+    return max(1, memory_budget // path_bytes)
+
+
+def block_bootstrap_indices(
+    rng: np.random.Generator, paths: int, length: int, months: int, block_months: int
+) -> np.ndarray:
+    """
+    이동 블록 부트스트랩 - 연속된 block_months 개월을 무작위로 골라 이어 붙인 월 인덱스
+
+    경로마다 같은 개수의 난수를 순서대로 사용하므로 같은 rng 로 여러 번 나눠 뽑아도
+    한 번에 뽑은 것과 같다.
+
+    Returns:
+        경로별 월 인덱스 (경로 수 x length)
+    """
+    block_months = min(block_months, months)
+    blocks = math.ceil(length / block_months)
+    starts = (rng.random((paths, blocks)) * (months - block_months + 1)).astype(np.int64)
+    indices = starts[:, :, None] + np.arange(block_months)
+    return indices.reshape(paths, -1)[:, :length]
+
+
+def execute_trades_batch(
+    weights: np.ndarray, growth: np.ndarray, initial_nav: float, trading_fee: float
+) -> np.ndarray:
+    """
+    execute_trades 를 경로 단위로 한 번에 계산한다.
+    반올림과 합산 순서도 execute_trades 와 같으므로 (첫 기간은 파이썬 반올림, 종목 순서대로 누적)
+    같은 비중과 가격 변화율이면 경로마다 simulate 의 NAV 와 같다.
+
+    Parameters:
+        weights: 리밸런싱별 비중 (경로 수 x 기간 x 종목 수)
+        growth: 직전 리밸런싱 대비 가격 변화율 (경로 수 x 기간 x 종목 수, 첫 기간은 사용하지 않음)
+
+    Returns:
+        NAV (경로 수 x (기간 + 1)), 첫 값은 initial_nav
+    """
+    paths, periods, tickers = weights.shape
+    after_nav = np.zeros((paths, tickers))
+    target_nav = np.zeros((paths, tickers))
+    total_nav = np.full(paths, float(initial_nav))
+    nav = np.empty((paths, periods + 1))
+    nav[:, 0] = initial_nav
+
+    for t in range(periods):
+        weight = weights[:, t]
+        round2 = round_numpy if t else round_python
+        before_nav = round_numpy(after_nav * growth[:, t])
+        total_nav = sequential_sum(total_nav, before_nav - target_nav)[:, -1]
+
+        # 매도 수수료가 뒤 종목의 주문 금액에 반영되므로 모든 경로가 수렴할 때까지 반복
+        sell = np.zeros((paths, tickers), dtype=bool)
+        sell_fee = np.zeros((paths, tickers))
+        for _ in range(tickers + 1):
+            navs = sequential_sum(total_nav, -sell_fee)
+            purchase_amount = round2(navs[:, :-1] * weight - before_nav)
+            next_sell = purchase_amount < 0
+            next_sell_fee = np.where(
+                next_sell, round2(np.abs(purchase_amount) * trading_fee), 0.0
+            )
+            if (next_sell == sell).all() and (next_sell_fee == sell_fee).all():
+                break
+            sell, sell_fee = next_sell, next_sell_fee
+        total_nav = navs[:, -1]
+
+        buy_amount = round2(total_nav[:, None] * weight - before_nav)
+        purchase_amount = np.where(sell, purchase_amount, buy_amount)
+        fee = np.where(sell, sell_fee, round2(np.abs(buy_amount) * trading_fee))
+        target = purchase_amount + before_nav
+
+        target_nav = np.where(sell, round2(target), target)
+        after_nav = round2(target - fee)
+        nav[:, t + 1] = total_nav - sequential_sum(0.0, fee)[:, -1]
+    return nav
+
+
+def calculate_statistics_batch(
+    nav: np.ndarray, trade_day: float, yearly_trade_day: int = 12
+) -> dict:
+    """
+    calculate_statistics 를 경로 단위로 한 번에 계산한다. (nav: 경로 수 x 기간)
+    """
+    total_return = (nav[:, -1] / nav[:, 0] - 1) * 100
+    num_years = trade_day / 365
+    cagr = ((nav[:, -1] / nav[:, 0]) ** (1 / num_years) - 1) * 100
+    daily_returns = np.diff(nav, axis=1) / nav[:, :-1]
+    annualized_volatility = np.std(daily_returns, axis=1) * np.sqrt(yearly_trade_day) * 100
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe_ratio = np.where(annualized_volatility > 0, cagr / annualized_volatility, np.nan)
+    running_max = np.maximum.accumulate(nav, axis=1)
+    max_drawdown = np.min((nav - running_max) / running_max, axis=1) * 100
+    return {
+        "total_return": total_return,
+        "cagr": cagr,
+        "vol": annualized_volatility,
+        "sharpe": sharpe_ratio,
+        "mdd": max_drawdown,
+    }
+
+
+def summarize(values: np.ndarray) -> dict:
+    """
+    지표 분포 요약 (NaN 인 경로는 제외)
+    """
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return {"mean": None, "std": None, "min": None, "max": None} | {
+            f"p{q}": None for q in PERCENTILES
+        }
+    return {
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+    } | {f"p{q}": float(v) for q, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+def run_monte_carlo(
+    prices: PriceMatrix,
+    start_year: int,
+    start_month: int,
+    initial_nav: float,
+    trading_day: int,
+    trading_fee: float,
+    rebalance_month_period: int,
+    strategy: str = DEFAULT_STRATEGY,
+    universe: list = None,
+    paths: int = 1000,
+    periods: int = None,
+    block_months: int = 12,
+    seed: int = None,
+    chunk_paths: int = None,
+) -> dict:
+    """
+    시작일 이후의 월별 가격 변화율을 블록 부트스트랩으로 재표본추출한 paths 개의 가상 경로에
+    같은 비중/수수료 계산을 적용하고 calculate_statistics 지표의 분포를 반환한다.
+
+    각 경로는 전략의 lookback_months 개월 이후부터 periods 번 (기본은 과거 데이터의 리밸런싱 횟수)
+    매월 리밸런싱한다. 경로는 chunk_paths 개씩 (기본은 MONTE_CARLO_MEMORY_BUDGET 에 맞는 수)
+    나눠 계산하고 표본도 묶음마다 뽑지만, 결과는 chunk_paths 와 무관하게 seed 로 재현된다.
+
+    Returns:
+        {"paths", "periods", "seed", "months", "stats": {지표: 분포 요약}, "loss_probability"}
+    """
+    strategy = get_strategy(strategy)
+    if rebalance_month_period < 1:
+        raise ValueError("rebalance_month_period must be at least 1")
+    start_date = clamp_date(start_year, start_month, trading_day)
+    prices = strategy.select_prices(prices, universe)
+    growth, tickers = monthly_returns(prices, start_date, trading_day)
+    if len(growth) < 2:
+        raise ValueError("Not enough price data for the bootstrap")
+    if periods is None:
+        periods = len(growth) + 1
+    if periods < 2:
+        raise ValueError("periods must be at least 2")
+
+    if seed is None:
+        seed = int(np.random.SeedSequence().generate_state(1)[0])
+    rng = np.random.default_rng(seed)
+    lookback = strategy.lookback_months(rebalance_month_period)
+    # 첫 비중을 계산하는 데 필요한 lookback 개월 + 리밸런싱 사이의 periods - 1 개월
+    length = lookback + periods - 1
+    if chunk_paths is None:
+        chunk_paths = chunk_paths_for(length, len(tickers))
+
+    stats = {key: np.empty(paths) for key in STAT_KEYS}
+    for lo in range(0, paths, chunk_paths):
+        hi = min(lo + chunk_paths, paths)
+        indices = block_bootstrap_indices(rng, hi - lo, length, len(growth), block_months)
+        path_growth = growth[indices]
+        levels = np.concatenate(
+            [np.ones((hi - lo, 1, len(tickers))), np.cumprod(path_growth, axis=1)], axis=1
+        )
+        weights = strategy.calculate_path_weights(levels, tickers, rebalance_month_period)
+        nav = execute_trades_batch(
+            weights, path_growth[:, lookback - 1 :], initial_nav, trading_fee
+        )
+        chunk_stats = calculate_statistics_batch(nav, (periods - 1) * 365 / 12)
+        for key in STAT_KEYS:
+            stats[key][lo:hi] = chunk_stats[key]
+
+    return {
+        "paths": paths,
+        "periods": periods,
+        "seed": seed,
+        "months": len(growth),
+        "stats": {key: summarize(stats[key]) for key in STAT_KEYS},
+        "loss_probability": float((stats["total_return"] < 0).mean()),
+    }
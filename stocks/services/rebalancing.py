@@ -1,22 +1,33 @@
+import logging
 import math
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Callable, Dict
 
 import numpy as np
 import pandas as pd
-from dateutil.relativedelta import relativedelta
 from sqlalchemy.orm import Session
 
+from stocks.core.metrics import timed
 from stocks.infra.database.daily_ticker import daily_ticker_repo
-from utils.calculator import calculate_momentum
-from utils.constant import AccountStatus, TickerInfo
+from stocks.services.strategy import DEFAULT_STRATEGY, Strategy, get_strategy
+from utils.calculator import round_numpy, round_python, sequential_sum
+from utils.constant import RebalancingContext
+from utils.price_matrix import PriceMatrix, carry_forward
+from utils.trading_calendar import TradingCalendar, clamp_date
+
+logger = logging.getLogger(__name__)
+
+# 일별 NAV 로 투자 성과 지표를 계산할 때의 1년 거래일 수
+TRADING_DAYS_PER_YEAR = 252
 
 
 class RebalancingService:
-    def __init__(self):
-        self.account_status = AccountStatus()
-        self.ticker_info: dict[str, TickerInfo] = {}
-        self.total_nav = 0
+    """
+    리밸런싱 시뮬레이션 서비스
+
+    실행 중의 상태는 모두 RebalancingContext 에 보관하므로
+    하나의 인스턴스를 여러 요청에서 동시에 사용해도 안전하다.
+    """
 
     def calculate_statistics(
         self, nav_history, trade_day, yearly_trade_day: int = 12
@@ -66,112 +77,123 @@ class RebalancingService:
         }
 
     def get_next_trading_date(
-        self, df, current_date, trading_day, trading_month_period
+        self, prices: PriceMatrix, current_date, trading_day, trading_month_period
     ):
         """
         다음 리밸런싱 날짜를 찾는 함수.
-        - 기본적으로 다음 달 `trading_day`을 목표로 함
-        - 만약 존재하지 않는 날짜라면, 가장 가까운 이전 날짜를 선택
+        - 기본적으로 다음 달 `trading_day`을 목표로 함 (그 달에 없는 날짜면 말일)
+        - 만약 거래일이 아니라면, 가장 가까운 이전 거래일을 선택
+        - 그 이전에 거래일이 없으면 None (시뮬레이션 종료)
         """
-        next_month = current_date + relativedelta(months=trading_month_period)
-        target_date = datetime(next_month.year, next_month.month, trading_day)
-        # 해당 날짜가 존재하는지 확인
-        available_dates = df[target_date >= df["date"]]["date"]
-        return available_dates.max()
-
-    def calculate_rebalancing_weights(
-        self,
-        df: pd.DataFrame,
-        start_date: pd.Timestamp,
-        period_months: int,
-        top_n: int = 2,
-    ):
-        df_tip = df.query("ticker == 'TIP'")
-
-        # 날짜 필터링 (최근 3개월)
-        tip_cutoff_date = start_date - pd.DateOffset(months=3)
-        tip_df_filtered = df_tip[df_tip["date"].between(tip_cutoff_date, start_date)]
-
-        tip_profit = 1 - tip_df_filtered.iloc[0].price / tip_df_filtered.iloc[-1].price
+        return prices.calendar.next_trading_date(current_date, trading_day, trading_month_period)
 
-        cutoff_date = start_date - pd.DateOffset(months=period_months)
-        df_filtered = df[df["date"].between(cutoff_date, start_date)]
-
-        for ticker, ticker_data in df_filtered.groupby("ticker"):
-            self.ticker_info[ticker].momentum = calculate_momentum(ticker_data)
-            self.ticker_info[ticker].profit_rate = (
-                round(
-                    ticker_data.iloc[-1].price / self.ticker_info[ticker].current_price,
-                    5,
-                )
-                if self.ticker_info[ticker].current_price != 0
-                else 0
-            )
-            self.ticker_info[ticker].current_price = ticker_data.iloc[-1].price
-
-        for ticker, info in self.ticker_info.items():
-            info.weight = 0
+    def get_target_date(self, current_date, trading_day, trading_month_period) -> datetime:
+        """
+        current_date 다음 리밸런싱의 목표 날짜 (거래일 여부와 무관)
+        """
+        return TradingCalendar.target_date(current_date, trading_day, trading_month_period)
 
-        buy_bil = True if tip_profit < 0 else False
-        if buy_bil:
-            for ticker, info in self.ticker_info.items():
-                if ticker == "BIL":
-                    info.weight = 1
-            return
+    def get_rebalance_dates(
+        self, prices: PriceMatrix, start_date, trading_day, trading_month_period
+    ) -> list:
+        """
+        시작일부터 더 이상 다음 리밸런싱 날짜가 없을 때까지의 리밸런싱 날짜 목록
+        (같은 가격 데이터로 다시 계산하면 달력에 캐시된 일정을 사용)
+        시작일이 마지막 가격 날짜 이후면 ValueError 를 발생시킨다.
+        """
+        if prices.max_date is None or np.datetime64(start_date, "D") > prices.max_date:
+            raise ValueError(f"No price data on or after {pd.Timestamp(start_date):%Y-%m-%d}")
+        return prices.calendar.schedule(start_date, trading_day, trading_month_period)
 
-        # BIL과 TIP을 제외한 종목만 필터링
-        filtered_tickers = {
-            k: v for k, v in self.ticker_info.items() if k not in {"BIL", "TIP"}
-        }
+    def calculate_profit_rates(
+        self,
+        prices: PriceMatrix,
+        rebalance_dates: pd.DatetimeIndex,
+        period_months: int,
+        initial_prices=0,
+        initial_profit_rates=0,
+        initial_seen=False,
+    ) -> (np.ndarray, np.ndarray, np.ndarray):
+        """
+        직전 리밸런싱 대비 종목별 가격 변화율을 계산한다.
+        initial_* 는 첫 리밸런싱 이전의 종목별 가격, 변화율, 직전 가격 존재 여부 (이어서 실행할 때 사용)
 
-        sorted_tickers = sorted(
-            filtered_tickers.items(), key=lambda x: x[1].momentum, reverse=True
+        Returns:
+            가격 변화율 (리밸런싱 횟수 x 종목 수)   ||
+            직전 가격 존재 여부 (리밸런싱 횟수 x 종목 수)   ||
+            리밸런싱 시점의 가격 (리밸런싱 횟수 x 종목 수)
+        """
+        _, last_prices, present = prices.window_prices(
+            (rebalance_dates - pd.DateOffset(months=period_months)).values,
+            rebalance_dates.values,
+        )
+        current_prices = carry_forward(last_prices, present, initial_prices)
+        previous_prices = np.vstack(
+            [
+                np.broadcast_to(initial_prices, (1, current_prices.shape[1])),
+                current_prices[:-1],
+            ]
         )
 
-        for i, (ticker, info) in enumerate(sorted_tickers):
-            if i < top_n:
-                info.weight = 0.5
+        with np.errstate(divide="ignore", invalid="ignore"):
+            profit_rates = np.round(last_prices / previous_prices, 5)
+        seen = previous_prices != 0
+        profit_rates = carry_forward(
+            np.where(seen, profit_rates, 0), present, initial_profit_rates
+        )
+        seen = carry_forward(seen, present, initial_seen)
+        return profit_rates, seen, current_prices
 
     def execute_trades(
         self,
+        context: RebalancingContext,
         trading_fee: float,
     ):
         """
         리밸런싱 후 NAV를 계산한다.
+
+        종목별 계산은 배열로 한 번에 하되, 종목 순서대로 하나씩 계산하던 것과 결과가 같도록
+        - total_nav 는 종목 순서대로 누적하고 (sequential_sum)
+        - 가격 변화율이 반영된 종목이 있으면 NumPy 반올림, 없으면 (첫 리밸런싱) 파이썬 반올림을 사용한다.
         """
-        for stock_code, info in self.ticker_info.items():
-            info.before_nav = round(info.after_nav * info.profit_rate, 2)
-            self.total_nav += info.before_nav - info.target_nav
-
-        sell_amount = 0
-        for stock_code, info in self.ticker_info.items():
-            # TODO 구매 후 남은 잔액은 어떻게 할까?
-            purchase_amount = round(self.total_nav * info.weight - info.before_nav, 2)
-            if purchase_amount < 0:
-                sell_amount += purchase_amount
-                info.target_nav = round(purchase_amount + info.before_nav, 2)
-                info.fee = round(abs(purchase_amount) * trading_fee, 2)
-                info.after_nav = round(purchase_amount + info.before_nav - info.fee, 2)
-                info.before_weight = info.weight
-                info.actioned = True
-                self.total_nav -= info.fee
-                print(purchase_amount, stock_code, "sell")
-            else:
-                info.actioned = False
+        round2 = round_numpy if context.seen.any() else round_python
+
+        context.before_nav = round_numpy(context.after_nav * context.profit_rate)
+        total_nav = sequential_sum(context.total_nav, context.before_nav - context.target_nav)[-1]
+
+        # 매도 종목의 수수료는 뒤 종목의 매수/매도 금액 계산에 반영되므로,
+        # 매도 종목과 수수료가 더 이상 바뀌지 않을 때까지 반복한다. (보통 1~2회)
+        sell = np.zeros(len(context.tickers), dtype=bool)
+        sell_fee = np.zeros(len(context.tickers))
+        for _ in range(len(context.tickers) + 1):
+            navs = sequential_sum(total_nav, -sell_fee)
+            purchase_amount = round2(navs[:-1] * context.weight - context.before_nav)
+            next_sell = purchase_amount < 0
+            next_sell_fee = np.where(
+                next_sell, round2(np.abs(purchase_amount) * trading_fee), 0.0
+            )
+            if (next_sell == sell).all() and (next_sell_fee == sell_fee).all():
+                break
+            sell, sell_fee = next_sell, next_sell_fee
+        total_nav = navs[-1]
 
+        # TODO 구매 후 남은 잔액은 어떻게 할까?
         # TODO 예제 목표 NAV가 수수료를 고려하지 않고 계산되어 있음
-        for stock_code, info in self.ticker_info.items():
-            if not info.actioned:
-                purchase_amount = round(self.total_nav * info.weight - info.before_nav, 2)
-                print(purchase_amount, stock_code, "buy")
-                info.target_nav = purchase_amount + info.before_nav
-                info.fee = round(abs(purchase_amount) * trading_fee, 2)
-                info.after_nav = round(purchase_amount + info.before_nav - info.fee, 2)
-                info.before_weight = info.weight
+        buy_amount = round2(total_nav * context.weight - context.before_nav)
+        purchase_amount = np.where(sell, purchase_amount, buy_amount)
+        fee = np.where(sell, sell_fee, round2(np.abs(buy_amount) * trading_fee))
+        target_nav = purchase_amount + context.before_nav
+
+        context.target_nav = np.where(sell, round2(target_nav), target_nav)
+        context.fee = fee
+        context.after_nav = round2(target_nav - fee)
+        context.before_weight = context.weight
+        context.actioned = sell
+        context.total_nav = total_nav
 
-        total_fee = sum([info.fee for info in self.ticker_info.values()])
+        total_fee = sequential_sum(0, fee)[-1]
 
-        self.account_status.current_nav = self.total_nav - total_fee
+        context.account_status.current_nav = context.total_nav - total_fee
 
     def run_rebalancing(
         self,
@@ -183,6 +205,9 @@ class RebalancingService:
         trading_fee: float,
         rebalance_month_period: int,
         trading_month_period: int = 1,
+        progress: Callable[[int, int, datetime], None] = None,
+        strategy: str = DEFAULT_STRATEGY,
+        universe: list = None,
     ) -> (list, dict, list):
         """
         리밸런싱 프로세스를 실행하는 메인 함수
@@ -196,65 +221,442 @@ class RebalancingService:
             trading_fee (float): 거래 수수료
             rebalance_month_period (int): 리밸런싱 참고 주기 (월)
             trading_month_period (int): 거래 주기 (월)
+            progress (callable): 리밸런싱마다 (완료 횟수, 전체 횟수, 리밸런싱 날짜)로 호출
+            strategy (str): 전략 이름 (STRATEGIES)
+            universe (list): 투자 대상 종목 (None 이면 가격 데이터의 전체 종목)
 
         Returns:
             최종 리밸런싱 비중 rebalance_weight   ||
             투자 성과 지표 stats
         """
-        start_date = datetime(start_year, start_month, trading_day)
-        stock_data = daily_ticker_repo.fetch_ticker_data(
-            session, start_date - timedelta(days=200)
+        start_date, tickers = self.get_price_range(
+            start_year, start_month, trading_day, rebalance_month_period, strategy, universe
+        )
+        prices = daily_ticker_repo.fetch_price_matrix(session, start_date, tickers)
+        return self.simulate(
+            prices,
+            start_year,
+            start_month,
+            initial_nav,
+            trading_day,
+            trading_fee,
+            rebalance_month_period,
+            trading_month_period,
+            progress,
+            strategy,
+            universe,
+        )
+
+    def get_price_range(
+        self,
+        start_year: int,
+        start_month: int,
+        trading_day: int,
+        rebalance_month_period: int,
+        strategy: str = DEFAULT_STRATEGY,
+        universe: list = None,
+    ) -> (datetime, list | None):
+        """
+        시뮬레이션에 필요한 가격 데이터의 시작일과 종목 (None 이면 전체 종목)
+        """
+        strategy = get_strategy(strategy)
+        start_date = clamp_date(start_year, start_month, trading_day)
+        lookback = timedelta(days=strategy.lookback_days(rebalance_month_period))
+        return start_date - lookback, strategy.required_tickers(universe)
+
+    def get_input_price_range(self, input_data: dict) -> (datetime, list | None):
+        """
+        저장된 입력값(RebalanceInput) 기준의 get_price_range
+        """
+        return self.get_price_range(
+            input_data["start_year"],
+            input_data["start_month"],
+            input_data["trading_day"],
+            input_data["rebalance_month_period"],
+            input_data.get("strategy", DEFAULT_STRATEGY),
+            input_data.get("universe"),
         )
-        nav_history = [initial_nav]
-        rebalance_weight_list = []
 
-        self.account_status.initial_nav = initial_nav
-        self.total_nav = initial_nav
-        self.account_status.current_nav = initial_nav
+    def _slice_prices(
+        self,
+        prices: PriceMatrix,
+        start_date: datetime,
+        rebalance_month_period: int,
+        strategy: Strategy,
+        universe: list,
+    ) -> PriceMatrix:
+        lookback = timedelta(days=strategy.lookback_days(rebalance_month_period))
+        return strategy.select_prices(prices.since(start_date - lookback), universe)
 
-        self.ticker_info = {
-            ticker: TickerInfo() for ticker in stock_data["ticker"].unique()
-        }
-        cnt = 0
-        while True:
-            print("\nstart_date", start_date)
-            self.calculate_rebalancing_weights(
-                stock_data, start_date, rebalance_month_period
+    def simulate(
+        self,
+        prices: PriceMatrix,
+        start_year: int,
+        start_month: int,
+        initial_nav: float,
+        trading_day: int,
+        trading_fee: float,
+        rebalance_month_period: int,
+        trading_month_period: int = 1,
+        progress: Callable[[int, int, datetime], None] = None,
+        strategy: str = DEFAULT_STRATEGY,
+        universe: list = None,
+    ) -> (list, dict, list):
+        """
+        이미 불러온 가격 행렬로 리밸런싱을 실행한다. (DB 접근 없음)
+        파라미터와 반환값은 run_rebalancing 과 같다.
+        """
+        rebalance_weight_list, stats, nav_history, _ = self.simulate_with_state(
+            prices,
+            start_year,
+            start_month,
+            initial_nav,
+            trading_day,
+            trading_fee,
+            rebalance_month_period,
+            trading_month_period,
+            progress,
+            strategy,
+            universe,
+        )
+        return rebalance_weight_list, stats, nav_history
+
+    def simulate_with_state(
+        self,
+        prices: PriceMatrix,
+        start_year: int,
+        start_month: int,
+        initial_nav: float,
+        trading_day: int,
+        trading_fee: float,
+        rebalance_month_period: int,
+        trading_month_period: int = 1,
+        progress: Callable[[int, int, datetime], None] = None,
+        strategy: str = DEFAULT_STRATEGY,
+        universe: list = None,
+        holdings: list = None,
+    ) -> (list, dict, list, dict):
+        """
+        simulate 와 같고, 이어서 실행(extend)할 수 있는 마지막 상태를 함께 반환한다.
+        holdings 가 주어지면 리밸런싱마다 (종목별 매매 후 금액, 리밸런싱 시점의 가격)을 추가한다.
+        """
+        strategy = get_strategy(strategy)
+        start_date = clamp_date(start_year, start_month, trading_day)
+        prices = self._slice_prices(
+            prices, start_date, rebalance_month_period, strategy, universe
+        )
+        context = RebalancingContext(initial_nav, prices.tickers)
+
+        rebalance_dates = self.get_rebalance_dates(
+            prices, start_date, trading_day, trading_month_period
+        )
+        if len(rebalance_dates) < 2:
+            raise ValueError(
+                f"No rebalance date after {start_date:%Y-%m-%d} (last price date: {prices.max_date})"
             )
-            print(
-                self.ticker_info["SPY"].weight,
-                self.ticker_info["QQQ"].weight,
-                self.ticker_info["GLD"].weight,
-                self.ticker_info["BIL"].weight,
-                "weight",
+        return self._run_periods(
+            prices,
+            context,
+            rebalance_dates,
+            start_date,
+            [initial_nav],
+            [],
+            strategy,
+            trading_day,
+            trading_fee,
+            rebalance_month_period,
+            trading_month_period,
+            progress,
+            holdings=holdings,
+        )
+
+    def simulate_daily(
+        self,
+        prices: PriceMatrix,
+        start_year: int,
+        start_month: int,
+        initial_nav: float,
+        trading_day: int,
+        trading_fee: float,
+        rebalance_month_period: int,
+        trading_month_period: int = 1,
+        strategy: str = DEFAULT_STRATEGY,
+        universe: list = None,
+    ) -> (list, dict, list, dict):
+        """
+        simulate 와 같고, 리밸런싱 사이의 거래일마다 평가한 일별 NAV 를 함께 반환한다.
+
+        Returns:
+            최종 리밸런싱 비중 rebalance_weight   ||
+            투자 성과 지표 stats (리밸런싱 기준)   ||
+            nav_history   ||
+            {"dates": 거래일 (datetime64[D]), "nav": 일별 NAV, "stats": 일별 NAV 기준 투자 성과 지표}
+        """
+        holdings = []
+        rebalance_weight_list, stats, nav_history, _ = self.simulate_with_state(
+            prices,
+            start_year,
+            start_month,
+            initial_nav,
+            trading_day,
+            trading_fee,
+            rebalance_month_period,
+            trading_month_period,
+            strategy=strategy,
+            universe=universe,
+            holdings=holdings,
+        )
+        start_date = clamp_date(start_year, start_month, trading_day)
+        prices = self._slice_prices(
+            prices, start_date, rebalance_month_period, get_strategy(strategy), universe
+        )
+        rebalance_dates = self.get_rebalance_dates(
+            prices, start_date, trading_day, trading_month_period
+        )
+        with timed("daily_nav"):
+            dates, nav = self.calculate_daily_nav(
+                prices, rebalance_dates, nav_history, holdings
             )
-            print(
-                self.ticker_info["SPY"].after_nav,
-                self.ticker_info["QQQ"].after_nav,
-                self.ticker_info["GLD"].after_nav,
-                self.ticker_info["BIL"].after_nav,
-                "after_nav",
+            daily_stats = self.calculate_statistics(
+                nav, (rebalance_dates[-1] - start_date).days, TRADING_DAYS_PER_YEAR
             )
+        daily = {"dates": dates, "nav": nav, "stats": daily_stats}
+        return rebalance_weight_list, stats, nav_history, daily
+
+    def calculate_daily_nav(
+        self,
+        prices: PriceMatrix,
+        rebalance_dates: list,
+        nav_history: list,
+        holdings: list,
+    ) -> (np.ndarray, np.ndarray):
+        """
+        리밸런싱 사이의 거래일마다 직전 리밸런싱의 보유 종목을 그날 가격으로 평가한 NAV
 
-            self.execute_trades(trading_fee)
+        - 첫 날(시작일)은 초기 자산가치, 리밸런싱 날은 nav_history 의 매매 후 NAV
+        - 그 사이의 날은 (매매 후 NAV - 종목별 금액 합) + 종목별 금액 x 리밸런싱 이후 가격 변화율
+          가격이 없는 날은 직전 가격을 사용하고, 리밸런싱 시점의 가격이 없던 종목은
+          다음 리밸런싱과 같게 0 으로 평가한다.
+        - 거래일마다 직전 리밸런싱의 보유 금액을 모아 한 번에 계산한다. (반복문 없음)
 
-            nav_history.append(self.account_status.current_nav)
-            before_date = start_date
-            start_date = self.get_next_trading_date(
-                stock_data, start_date, trading_day, trading_month_period
-            )
-            rebalance_weight_list.append(
-                [(ticker, info.weight) for ticker, info in self.ticker_info.items()]
+        Returns:
+            날짜 (datetime64[D])   ||
+            일별 NAV
+        """
+        nav_history = np.asarray(nav_history, dtype=np.float64)
+        rebalance_days = np.array(rebalance_dates, dtype="datetime64[D]")
+        amounts = np.array([amount for amount, _ in holdings]).reshape(
+            len(holdings), len(prices.tickers)
+        )
+        base_prices = np.array([price for _, price in holdings]).reshape(amounts.shape)
+        cash = nav_history[1:] - amounts.sum(axis=1)
+
+        lo = int(np.searchsorted(prices.dates, rebalance_days[0], side="right"))
+        hi = int(np.searchsorted(prices.dates, rebalance_days[-1], side="right"))
+        days = prices.dates[lo:hi]
+        period = np.searchsorted(rebalance_days, days, side="left") - 1
+
+        # 거래일별 종목 가격 (없으면 직전 가격, 직전 가격도 없으면 NaN)
+        rows = prices.prev_valid[lo:hi] - prices.offset
+        columns = np.arange(len(prices.tickers))
+        day_prices = np.where(rows >= 0, prices.prices[np.maximum(rows, 0), columns], np.nan)
+
+        base = base_prices[period]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            growth = np.where(
+                base > 0, np.where(np.isnan(day_prices), 1.0, day_prices / base), 0.0
             )
-            if start_date == before_date:
-                break
-            cnt += 1
-        stats = self.calculate_statistics(
-            nav_history,
-            (start_date - datetime(start_year, start_month, trading_day)).days,
+        nav = cash[period] + np.einsum("ij,ij->i", amounts[period], growth)
+
+        # 리밸런싱 날은 매매 후 NAV
+        next_rebalance = rebalance_days[np.minimum(period + 1, len(rebalance_days) - 1)]
+        rebalanced = np.flatnonzero(days == next_rebalance)
+        nav[rebalanced] = nav_history[period[rebalanced] + 2]
+
+        return (
+            np.concatenate([rebalance_days[:1], days]),
+            np.concatenate([nav_history[:1], nav]),
         )
-        print(stats)
-        return rebalance_weight_list, stats, nav_history
+
+    def extend(
+        self,
+        prices: PriceMatrix,
+        start_year: int,
+        start_month: int,
+        trading_day: int,
+        trading_fee: float,
+        rebalance_month_period: int,
+        state: dict,
+        nav_history: list,
+        rebalance_weight_list: list,
+        trading_month_period: int = 1,
+        progress: Callable[[int, int, datetime], None] = None,
+        strategy: str = DEFAULT_STRATEGY,
+        universe: list = None,
+    ) -> (list, dict, list, dict):
+        """
+        저장된 마지막 상태(state)부터 이어서 새 리밸런싱만 실행한다.
+        결과는 처음부터 다시 실행한 것과 같다.
+
+        state 이후의 기록(가격이 다 들어오기 전에 임시로 계산된 마지막 리밸런싱)은 다시 계산한다.
+        종목 구성이 state 와 달라졌으면 ValueError 를 발생시킨다. (처음부터 다시 실행해야 함)
+        """
+        strategy = get_strategy(strategy)
+        start_date = clamp_date(start_year, start_month, trading_day)
+        prices = self._slice_prices(
+            prices, start_date, rebalance_month_period, strategy, universe
+        )
+        context = RebalancingContext.from_state(state)
+        if context.tickers != prices.tickers:
+            raise ValueError("Tickers have changed since the saved state")
+
+        last_date = pd.Timestamp(state["last_rebalance_date"])
+        periods = state["periods"]
+        rebalance_dates = self.get_rebalance_dates(
+            prices, last_date, trading_day, trading_month_period
+        )[1:]
+        return self._run_periods(
+            prices,
+            context,
+            rebalance_dates,
+            start_date,
+            nav_history[: periods + 1],
+            rebalance_weight_list[:periods],
+            strategy,
+            trading_day,
+            trading_fee,
+            rebalance_month_period,
+            trading_month_period,
+            progress,
+            state,
+        )
+
+    def resume(
+        self,
+        prices: PriceMatrix,
+        input_data: dict,
+        state: dict | None,
+        nav_history: list,
+        rebalance_weight_list: list,
+        progress: Callable[[int, int, datetime], None] = None,
+    ) -> (list, dict, list, dict):
+        """
+        저장된 결과를 최신 가격까지 갱신한다.
+        저장된 상태로 이어서 실행할 수 없으면 처음부터 다시 실행한다.
+        """
+        if state is not None:
+            try:
+                return self.extend(
+                    prices,
+                    input_data["start_year"],
+                    input_data["start_month"],
+                    input_data["trading_day"],
+                    input_data["trading_fee"],
+                    input_data["rebalance_month_period"],
+                    state,
+                    nav_history,
+                    rebalance_weight_list,
+                    progress=progress,
+                    strategy=input_data.get("strategy", DEFAULT_STRATEGY),
+                    universe=input_data.get("universe"),
+                )
+            except ValueError:
+                pass
+        return self.simulate_with_state(
+            prices,
+            input_data["start_year"],
+            input_data["start_month"],
+            input_data["initial_nav"],
+            input_data["trading_day"],
+            input_data["trading_fee"],
+            input_data["rebalance_month_period"],
+            progress=progress,
+            strategy=input_data.get("strategy", DEFAULT_STRATEGY),
+            universe=input_data.get("universe"),
+        )
+
+    def _run_periods(
+        self,
+        prices: PriceMatrix,
+        context: RebalancingContext,
+        rebalance_dates: list,
+        start_date: datetime,
+        nav_history: list,
+        rebalance_weight_list: list,
+        strategy: Strategy,
+        trading_day: int,
+        trading_fee: float,
+        rebalance_month_period: int,
+        trading_month_period: int,
+        progress: Callable[[int, int, datetime], None] = None,
+        state: dict = None,
+        holdings: list = None,
+    ) -> (list, dict, list, dict):
+        """
+        context 상태에서 rebalance_dates 의 리밸런싱을 차례로 실행한다.
+        state 가 주어지면 그 상태에서 이어서 실행한다.
+        holdings 가 주어지면 리밸런싱마다 (종목별 매매 후 금액, 리밸런싱 시점의 가격)을 추가한다.
+
+        마지막 리밸런싱은 목표 날짜까지 가격이 들어와 있어야 확정된 것으로 보고,
+        확정된 마지막 리밸런싱 직후의 상태를 반환한다.
+        """
+        all_dates = ([pd.Timestamp(state["last_rebalance_date"])] if state else []) + rebalance_dates
+        settled = len(rebalance_dates)
+        if len(all_dates) >= 2 and self.get_target_date(
+            all_dates[-2], trading_day, trading_month_period
+        ) > pd.Timestamp(prices.max_date):
+            settled -= 1
+
+        if rebalance_dates:
+            with timed("weights"):
+                rebalance_index = pd.DatetimeIndex(rebalance_dates)
+                weights, momentum = strategy.calculate_weights(
+                    prices,
+                    rebalance_index,
+                    rebalance_month_period,
+                    initial_momentum=context.momentum,
+                )
+                profit_rates, seen, current_prices = self.calculate_profit_rates(
+                    prices,
+                    rebalance_index,
+                    rebalance_month_period,
+                    initial_prices=context.current_price,
+                    initial_profit_rates=context.profit_rate,
+                    initial_seen=context.seen,
+                )
+
+        # 반복문 안에서 매번 로그 레벨을 확인하지 않도록 한 번만 확인
+        debug = logger.isEnabledFor(logging.DEBUG)
+        with timed("trades"):
+            for i, rebalance_date in enumerate(rebalance_dates):
+                if debug:
+                    logger.debug("rebalance %s", rebalance_date)
+                context.weight = weights[i]
+                context.momentum = momentum[i]
+                context.profit_rate = np.where(seen[i], profit_rates[i], 0.0)
+                context.seen = seen[i]
+                context.current_price = current_prices[i]
+
+                self.execute_trades(context, trading_fee)
+
+                nav_history.append(context.account_status.current_nav)
+                rebalance_weight_list.append(list(zip(context.tickers, weights[i].tolist())))
+                if holdings is not None:
+                    holdings.append((context.after_nav, context.current_price))
+                if i + 1 == settled:
+                    state = context.to_state() | {
+                        "last_rebalance_date": rebalance_date.isoformat(),
+                        "periods": len(rebalance_weight_list),
+                    }
+                if progress is not None:
+                    progress(i + 1, len(rebalance_dates), rebalance_date)
+
+        with timed("stats"):
+            stats = self.calculate_statistics(
+                nav_history, (all_dates[-1] - start_date).days
+            )
+        logger.debug("stats %s", stats)
+        return rebalance_weight_list, stats, nav_history, state
 
 
 rebalancing_service = RebalancingService()
@@ -0,0 +1,104 @@
+import hashlib
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+from stocks.core.response import StandardJSONResponse
+from utils.lru import LRUCache
+
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+# 저장된 결과는 갱신(extend)되거나 삭제될 수 있으므로 클라이언트가 매번 ETag 로 재검증하게 한다
+RESPONSE_CACHE_CONTROL = os.getenv("RESPONSE_CACHE_CONTROL", "private, no-cache")
+
+
+class CachedResponse:
+    """
+    직렬화된 응답 본문과 검증 헤더 (ETag, Last-Modified)
+    ETag 는 data_id 와 본문 해시로 만든다. (강한 ETag)
+    """
+
+    def __init__(self, data_id: int, version: tuple, body: bytes, last_modified: datetime = None):
+        self.data_id = data_id
+        self.version = version
+        self.body = body
+        self.etag = f'"{data_id}-{hashlib.sha256(body).hexdigest()[:32]}"'
+        # DB 에는 UTC 시각이 timezone 없이 저장됨
+        self.last_modified = (
+            last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+            if last_modified is not None
+            else None
+        )
+
+    @property
+    def headers(self) -> dict:
+        headers = {"ETag": self.etag, "Cache-Control": RESPONSE_CACHE_CONTROL}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def is_not_modified(self, request: Request) -> bool:
+        """
+        조건부 요청(If-None-Match, 없으면 If-Modified-Since)의 값이 현재 응답과 같은지 확인한다.
+        """
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or self.etag in tags
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None or self.last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return self.last_modified <= since
+
+    def to_response(self, request: Request) -> Response:
+        if self.is_not_modified(request):
+            return Response(status_code=304, headers=self.headers)
+        return Response(self.body, media_type="application/json", headers=self.headers)
+
+
+class ResponseCache:
+    """
+    조회 API 의 직렬화된 응답 캐시
+
+    (API 이름, data_id) 를 키로 응답 본문을 보관하고, 저장된 결과의 버전(input_hash, updated_at)이
+    같을 때만 재사용한다. 버전은 큰 컬럼 없이 조회할 수 있으므로
+    다른 프로세스(extend_rebalancing 작업 등)에서 갱신한 결과도 본문을 다시 읽지 않고 확인할 수 있다.
+    """
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE):
+        self._cache = LRUCache(maxsize)
+
+    def get(self, key: tuple, version: tuple) -> CachedResponse | None:
+        cached = self._cache.get(key)
+        if cached is None or cached.version != version:
+            return None
+        return cached
+
+    def put(
+        self, key: tuple, data_id: int, version: tuple, content, last_modified: datetime = None
+    ) -> CachedResponse:
+        """
+        content 를 API 응답과 같은 형식으로 직렬화해 보관한다.
+        """
+        cached = CachedResponse(
+            data_id, version, StandardJSONResponse(content).body, last_modified
+        )
+        self._cache.put(key, cached)
+        return cached
+
+    def discard_data_id(self, data_id: int) -> None:
+        """
+        삭제되거나 갱신된 리밸런싱 데이터의 응답을 제거한다.
+        """
+        self._cache.discard(lambda key, cached: cached.data_id == data_id)
+
+
+response_cache = ResponseCache()
@@ -1,3 +1,4 @@
+import logging
 import traceback
 
 from fastapi import FastAPI, APIRouter
@@ -22,7 +23,7 @@ def standardize_response(func: Callable) -> Callable:
                 result = await func(*args, **kwargs)
                 return StandardResponse(status="success", data=result, error=None)
             except Exception as e:
-                print(traceback.format_exc())
+                logging.error(traceback.format_exc())
 
                 return JSONResponse(
                     content={
@@ -42,7 +43,7 @@ def standardize_response(func: Callable) -> Callable:
                 result = func(*args, **kwargs)
                 return StandardResponse(status="success", data=result, error=None)
             except Exception as e:
-                print(traceback.format_exc())
+                logging.error(traceback.format_exc())
                 return JSONResponse(
                     content={
                         "status": "error",
@@ -0,0 +1,41 @@
+import hashlib
+import json
+import os
+
+from utils.lru import LRUCache
+
+REBALANCING_RESULT_CACHE_SIZE = int(os.getenv("REBALANCING_RESULT_CACHE_SIZE", "256"))
+
+
+class RebalancingResultCache:
+    """
+    리밸런싱 결과 캐시
+
+    같은 입력과 같은 가격 데이터 버전이면 시뮬레이션 결과도 같으므로
+    (입력, 가격 버전) 해시를 키로 /process 응답을 재사용한다.
+    """
+
+    def __init__(self, maxsize: int = REBALANCING_RESULT_CACHE_SIZE):
+        self._cache = LRUCache(maxsize)
+
+    @staticmethod
+    def make_key(input_data: dict, price_version: str) -> str:
+        payload = json.dumps(
+            {"input": input_data, "price_version": price_version}, sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        return self._cache.get(key)
+
+    def put(self, key: str, output) -> None:
+        self._cache.put(key, output)
+
+    def discard_data_id(self, data_id: int) -> None:
+        """
+        삭제된 리밸런싱 데이터를 가리키는 캐시를 제거한다.
+        """
+        self._cache.discard(lambda key, output: output.data_id == data_id)
+
+
+rebalancing_result_cache = RebalancingResultCache()
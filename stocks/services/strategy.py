@@ -0,0 +1,277 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+
+from utils.calculator import calculate_momentum_matrix
+from utils.price_matrix import PriceMatrix, carry_forward
+
+# 모멘텀 계산을 위해 시작일 이전으로 불러오는 가격 데이터 기간 (참고 기간 1개월당 일수 + 여유 일수)
+PRICE_LOOKBACK_DAYS_PER_MONTH = 31
+PRICE_LOOKBACK_MARGIN_DAYS = 7
+
+DEFAULT_STRATEGY = "dual_momentum"
+
+
+def calculate_momentum(
+    prices: PriceMatrix,
+    rebalance_dates: pd.DatetimeIndex,
+    period_months: int,
+    initial_momentum=0,
+) -> np.ndarray:
+    """
+    리밸런싱 날짜마다 직전 period_months 개월 구간의 종목별 모멘텀 (리밸런싱 횟수 x 종목 수)
+    구간에 가격이 없는 종목은 직전 모멘텀을 유지한다. (처음에는 initial_momentum)
+
+    미리 계산된 모멘텀(prices.momentum)에 있는 날짜는 그 값을 사용하고, 나머지만 가격으로 계산한다.
+    구간 시작이 가격 행렬의 첫 날짜보다 앞서면 잘린 구간으로 계산해야 하므로 미리 계산된 값을 쓰지 않는다.
+    """
+    start_dates = (rebalance_dates - pd.DateOffset(months=period_months)).values
+    end_dates = rebalance_dates.values
+
+    shape = (len(rebalance_dates), len(prices.tickers))
+    momentum = np.full(shape, np.nan)
+    present = np.zeros(shape, dtype=bool)
+    found = np.zeros(len(rebalance_dates), dtype=bool)
+    if prices.momentum is not None and len(prices.dates):
+        momentum, present, found = prices.momentum.lookup(
+            prices.tickers, end_dates, period_months
+        )
+        found &= start_dates.astype("datetime64[D]") >= prices.dates[0]
+
+    missing = ~found
+    if missing.any():
+        first_prices, last_prices, present[missing] = prices.window_prices(
+            start_dates[missing], end_dates[missing]
+        )
+        momentum[missing] = calculate_momentum_matrix(first_prices, last_prices)
+    return carry_forward(momentum, present, initial_momentum)
+
+
+class Strategy(ABC):
+    """
+    리밸런싱 전략 (calculate_weights, calculate_path_weights 를 구현하지 않으면 만들 수 없음)
+
+    - name: 등록 이름 (RebalanceInput.strategy)
+    - required_tickers: 유니버스 외에 추가로 필요한 종목을 포함한 종목 목록 (None 이면 전체 종목)
+    - select_prices: required_tickers 만 남긴 가격 행렬 (가격 데이터에 없는 종목이 있으면 ValueError)
+    - lookback_days: 시작일 이전으로 필요한 가격 데이터 기간 (일)
+    - calculate_weights: 리밸런싱 날짜별 종목 비중과 모멘텀
+    - calculate_path_weights: 가상 가격 경로별 종목 비중 (몬테카를로 시뮬레이션용)
+    """
+
+    name: str
+    description: str = ""
+
+    def required_tickers(self, universe: list | None) -> list | None:
+        return universe
+
+    def select_prices(self, prices: PriceMatrix, universe: list | None) -> PriceMatrix:
+        tickers = self.required_tickers(universe)
+        missing = [ticker for ticker in tickers or [] if ticker not in prices.tickers]
+        if missing:
+            raise ValueError(f"No price data for tickers: {', '.join(missing)}")
+        return prices.select(tickers)
+
+    def lookback_days(self, rebalance_month_period: int) -> int:
+        """
+        시작일 이전으로 필요한 가격 데이터 기간 (일), lookback_months 개월을 덮는다.
+        """
+        return (
+            self.lookback_months(rebalance_month_period) * PRICE_LOOKBACK_DAYS_PER_MONTH
+            + PRICE_LOOKBACK_MARGIN_DAYS
+        )
+
+    @abstractmethod
+    def calculate_weights(
+        self,
+        prices: PriceMatrix,
+        rebalance_dates: pd.DatetimeIndex,
+        period_months: int,
+        initial_momentum=0,
+    ) -> (np.ndarray, np.ndarray):
+        """
+        Returns:
+            비중 (리밸런싱 횟수 x 종목 수)   ||
+            모멘텀 (리밸런싱 횟수 x 종목 수)
+        """
+
+    def lookback_months(self, period_months: int) -> int:
+        """
+        첫 비중을 계산하기 전에 필요한 가격 데이터 기간 (월)
+        (calculate_path_weights 에서는 첫 비중 이전에 필요한 리밸런싱 수)
+        """
+        return period_months
+
+    @abstractmethod
+    def calculate_path_weights(
+        self, levels: np.ndarray, tickers: list, period_months: int
+    ) -> np.ndarray:
+        """
+        리밸런싱 시점의 가격 경로로 비중을 계산한다. (모든 종목의 가격이 있다고 가정)
+
+        Parameters:
+            levels: 가격 (경로 수 x 리밸런싱 횟수 x 종목 수), 리밸런싱 간격은 1개월
+
+        Returns:
+            lookback_months 번째 리밸런싱부터의 비중 (경로 수 x (리밸런싱 횟수 - lookback_months) x 종목 수)
+        """
+
+
+class DualMomentumStrategy(Strategy):
+    """
+    모멘텀 상위 top_n 종목에 같은 비중으로 투자하고,
+    방어 종목(TIP)의 최근 defensive_months 개월 수익률이 음수면 현금성 종목(BIL)에 전액 투자한다.
+    """
+
+    name = "dual_momentum"
+    description = "상대 모멘텀 상위 종목 + TIP 절대 모멘텀 필터 (음수면 BIL)"
+
+    def __init__(
+        self,
+        top_n: int = 2,
+        defensive_ticker: str = "TIP",
+        cash_ticker: str = "BIL",
+        defensive_months: int = 3,
+    ):
+        self.top_n = top_n
+        self.defensive_ticker = defensive_ticker
+        self.cash_ticker = cash_ticker
+        self.defensive_months = defensive_months
+
+    def required_tickers(self, universe: list | None) -> list | None:
+        if universe is None:
+            return None
+        extra = [self.defensive_ticker, self.cash_ticker]
+        return list(universe) + [ticker for ticker in extra if ticker not in universe]
+
+    def calculate_weights(
+        self,
+        prices: PriceMatrix,
+        rebalance_dates: pd.DatetimeIndex,
+        period_months: int,
+        initial_momentum=0,
+    ) -> (np.ndarray, np.ndarray):
+        tickers = prices.tickers
+
+        # 날짜 필터링 (최근 3개월)
+        tip_first, tip_last, tip_present = prices.window_prices(
+            (rebalance_dates - pd.DateOffset(months=self.defensive_months)).values,
+            rebalance_dates.values,
+        )
+        tip = tickers.index(self.defensive_ticker) if self.defensive_ticker in tickers else None
+        if tip is None or not tip_present[:, tip].all():
+            raise IndexError(f"{self.defensive_ticker} price data is missing")
+        tip_profit = 1 - tip_first[:, tip] / tip_last[:, tip]
+
+        momentum = calculate_momentum(prices, rebalance_dates, period_months, initial_momentum)
+
+        weights = np.zeros(momentum.shape)
+
+        # BIL과 TIP을 제외한 종목만 필터링
+        excluded = {self.cash_ticker, self.defensive_ticker}
+        candidates = np.array(
+            [i for i, ticker in enumerate(tickers) if ticker not in excluded], dtype=int
+        )
+        ranks = np.argsort(-momentum[:, candidates], axis=1, kind="stable")[:, : self.top_n]
+        rows = np.arange(len(rebalance_dates))[:, None]
+        weights[rows, candidates[ranks]] = 1 / self.top_n
+
+        buy_bil = tip_profit < 0
+        weights[buy_bil] = 0
+        if self.cash_ticker in tickers:
+            weights[buy_bil, tickers.index(self.cash_ticker)] = 1
+
+        return weights, momentum
+
+    def lookback_months(self, period_months: int) -> int:
+        return max(period_months, self.defensive_months)
+
+    def calculate_path_weights(
+        self, levels: np.ndarray, tickers: list, period_months: int
+    ) -> np.ndarray:
+        if self.defensive_ticker not in tickers:
+            raise IndexError(f"{self.defensive_ticker} price data is missing")
+        lookback = self.lookback_months(period_months)
+        periods = levels.shape[1]
+        current = levels[:, lookback:]
+
+        tip = tickers.index(self.defensive_ticker)
+        tip_first = levels[
+            :, lookback - self.defensive_months : periods - self.defensive_months, tip
+        ]
+        tip_profit = 1 - tip_first / current[..., tip]
+
+        momentum = calculate_momentum_matrix(
+            levels[:, lookback - period_months : periods - period_months], current
+        )
+
+        weights = np.zeros(current.shape)
+        excluded = {self.cash_ticker, self.defensive_ticker}
+        candidates = np.array(
+            [i for i, ticker in enumerate(tickers) if ticker not in excluded], dtype=int
+        )
+        ranks = np.argsort(-momentum[..., candidates], axis=-1, kind="stable")[..., : self.top_n]
+        np.put_along_axis(weights, candidates[ranks], 1 / self.top_n, axis=-1)
+
+        buy_bil = tip_profit < 0
+        weights[buy_bil] = 0
+        if self.cash_ticker in tickers:
+            weights[buy_bil, tickers.index(self.cash_ticker)] = 1
+        return weights
+
+
+class EqualWeightStrategy(Strategy):
+    """
+    직전 period_months 개월 구간에 가격이 있는 종목에 같은 비중으로 투자한다.
+    """
+
+    name = "equal_weight"
+    description = "가격이 있는 모든 종목에 같은 비중"
+
+    def calculate_weights(
+        self,
+        prices: PriceMatrix,
+        rebalance_dates: pd.DatetimeIndex,
+        period_months: int,
+        initial_momentum=0,
+    ) -> (np.ndarray, np.ndarray):
+        _, _, present = prices.window_prices(
+            (rebalance_dates - pd.DateOffset(months=period_months)).values,
+            rebalance_dates.values,
+        )
+        counts = present.sum(axis=1, keepdims=True)
+        weights = np.divide(
+            present, counts, out=np.zeros(present.shape), where=counts > 0
+        )
+        momentum = calculate_momentum(prices, rebalance_dates, period_months, initial_momentum)
+        return weights, momentum
+
+    def calculate_path_weights(
+        self, levels: np.ndarray, tickers: list, period_months: int
+    ) -> np.ndarray:
+        shape = levels[:, self.lookback_months(period_months) :].shape
+        return np.full(shape, 1 / len(tickers))
+
+
+STRATEGIES: dict[str, Strategy] = {}
+
+
+def register_strategy(strategy: Strategy) -> Strategy:
+    STRATEGIES[strategy.name] = strategy
+    return strategy
+
+
+def get_strategy(name: str | Strategy) -> Strategy:
+    """
+    등록된 전략을 이름으로 찾는다. (Strategy 인스턴스를 넘기면 그대로 사용)
+    """
+    if isinstance(name, Strategy):
+        return name
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {name} (available: {sorted(STRATEGIES)})")
+    return STRATEGIES[name]
+
+
+register_strategy(DualMomentumStrategy())
+register_strategy(EqualWeightStrategy())
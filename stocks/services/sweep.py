@@ -0,0 +1,190 @@
+import itertools
+import math
+import os
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from stocks.services.rebalancing import rebalancing_service
+from stocks.services.strategy import get_strategy
+from utils.price_matrix import PriceMatrix
+
+SWEEP_MAX_WORKERS = int(os.getenv("SWEEP_MAX_WORKERS", str(os.cpu_count() or 1)))
+
+SWEEP_PARAMS = [
+    "start_year",
+    "start_month",
+    "initial_nav",
+    "trading_day",
+    "trading_fee",
+    "rebalance_month_period",
+    "strategy",
+]
+STAT_KEYS = ["total_return", "cagr", "vol", "sharpe", "mdd"]
+# 낮을수록 좋은 지표 (나머지는 높을수록 좋음, mdd 는 음수라서 0 에 가까울수록 큼)
+LOWER_IS_BETTER = {"vol"}
+
+# 워커 프로세스에서 공유 메모리로 복원한 가격 행렬
+_worker_prices: PriceMatrix | None = None
+_worker_blocks: list = []
+_worker_universe: list | None = None
+
+
+def expand_grid(grid: dict) -> list:
+    """
+    파라미터별 후보 리스트를 모든 조합의 리스트로 펼친다.
+    """
+    values = [grid[name] for name in SWEEP_PARAMS]
+    return [dict(zip(SWEEP_PARAMS, combination)) for combination in itertools.product(*values)]
+
+
+def get_sweep_price_range(grid: dict) -> (datetime, list | None):
+    """
+    모든 조합에 필요한 가격 데이터의 시작일과 종목 (None 이면 전체 종목)
+    """
+    ranges = [
+        rebalancing_service.get_price_range(
+            min(grid["start_year"]), 1, 1, period, strategy, grid.get("universe")
+        )
+        for strategy in grid["strategy"]
+        for period in grid["rebalance_month_period"]
+    ]
+    since = min(since for since, _ in ranges)
+    if any(tickers is None for _, tickers in ranges):
+        return since, None
+    return since, list(dict.fromkeys(ticker for _, tickers in ranges for ticker in tickers))
+
+
+class SharedPriceMatrix:
+    """
+    가격 행렬의 배열들을 공유 메모리에 올려 워커 프로세스가 복사 없이 읽게 한다.
+    미리 계산된 모멘텀(momentum)은 워커를 만들 때 한 번만 전달된다.
+    """
+
+    ARRAYS = ["dates", "prices", "prev_valid", "next_valid"]
+
+    def __init__(self, prices: PriceMatrix):
+        self.tickers = prices.tickers
+        self.offset = prices.offset
+        self.momentum = prices.momentum
+        self.blocks = []
+        self.specs = {}
+        for name in self.ARRAYS:
+            array = np.ascontiguousarray(getattr(prices, name))
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+            self.blocks.append(block)
+            self.specs[name] = (block.name, array.shape, array.dtype.str)
+
+    @property
+    def handle(self) -> tuple:
+        """
+        워커 프로세스에서 attach 에 넘길 값
+        """
+        return self.specs, self.tickers, self.offset, self.momentum
+
+    @staticmethod
+    def attach(handle: tuple) -> (PriceMatrix, list):
+        """
+        워커 프로세스에서 공유 메모리의 가격 행렬을 연다.
+
+        Returns:
+            가격 행렬   ||
+            공유 메모리 블록 (가격 행렬을 사용하는 동안 참조를 유지해야 함)
+        """
+        specs, tickers, offset, momentum = handle
+        blocks = []
+        arrays = {}
+        for name, (block_name, shape, dtype) in specs.items():
+            block = shared_memory.SharedMemory(name=block_name)
+            blocks.append(block)
+            arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+        prices = PriceMatrix(
+            arrays["dates"],
+            tickers,
+            arrays["prices"],
+            arrays["prev_valid"],
+            arrays["next_valid"],
+            offset,
+            momentum,
+        )
+        return prices, blocks
+
+    def close(self) -> None:
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+
+
+def _init_worker(handle: tuple, universe: list | None) -> None:
+    global _worker_prices, _worker_universe
+    _worker_universe = universe
+    _worker_prices, blocks = SharedPriceMatrix.attach(handle)
+    _worker_blocks.extend(blocks)
+
+
+def _run_combination(params: dict) -> dict:
+    row = dict(params)
+    try:
+        _, stats, _ = rebalancing_service.simulate(
+            _worker_prices,
+            *[params[name] for name in SWEEP_PARAMS if name != "strategy"],
+            strategy=params["strategy"],
+            universe=_worker_universe,
+        )
+        row.update({key: _to_number(stats[key]) for key in STAT_KEYS})
+        row["error"] = None
+    except Exception as e:
+        row.update({key: None for key in STAT_KEYS})
+        row["error"] = str(e)
+    return row
+
+
+def sort_score(value, sort_by: str) -> float:
+    """
+    sort_by 지표가 좋을수록 큰 값 (값이 없거나 유한하지 않으면 -inf)
+    """
+    if value is None or not math.isfinite(float(value)):
+        return -math.inf
+    return -float(value) if sort_by in LOWER_IS_BETTER else float(value)
+
+
+def _to_number(value):
+    value = float(value)
+    return None if math.isnan(value) or math.isinf(value) else value
+
+
+def run_sweep(
+    prices: PriceMatrix,
+    grid: dict,
+    sort_by: str = "sharpe",
+    max_workers: int = SWEEP_MAX_WORKERS,
+) -> list:
+    """
+    파라미터 조합마다 리밸런싱을 실행하고 sort_by 지표가 좋은 순으로 정렬한 결과를 반환한다.
+    (vol 처럼 LOWER_IS_BETTER 에 있는 지표는 오름차순, 나머지는 내림차순)
+    가격 행렬은 한 번만 공유 메모리에 올리고 프로세스 풀에서 조합을 나눠 실행한다.
+    실패했거나 지표가 없는 조합은 맨 뒤에 위치한다.
+    """
+    if sort_by not in STAT_KEYS:
+        raise ValueError(f"sort_by must be one of {STAT_KEYS}")
+
+    for strategy in grid["strategy"]:
+        get_strategy(strategy)
+
+    combinations = expand_grid(grid)
+    shared = SharedPriceMatrix(prices)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(shared.handle, grid.get("universe")),
+        ) as executor:
+            chunksize = max(1, len(combinations) // (max_workers * 8))
+            results = list(executor.map(_run_combination, combinations, chunksize=chunksize))
+    finally:
+        shared.close()
+
+    return sorted(results, key=lambda row: -sort_score(row[sort_by], sort_by))
@@ -0,0 +1,260 @@
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
+
+from stocks.services.rebalancing import rebalancing_service
+from stocks.services.strategy import DualMomentumStrategy
+from stocks.services.sweep import STAT_KEYS, SharedPriceMatrix, sort_score
+from utils.momentum_table import MomentumTable
+from utils.price_matrix import PriceMatrix
+from utils.trading_calendar import clamp_date
+
+WALK_FORWARD_MAX_WORKERS = int(
+    os.getenv("WALK_FORWARD_MAX_WORKERS", str(os.cpu_count() or 1))
+)
+
+# 워커 프로세스에서 공유 메모리로 복원한 가격 행렬
+_worker_prices: PriceMatrix | None = None
+_worker_blocks: list = []
+_worker_universe: list | None = None
+# 워커 프로세스에서 top_n 별로 재사용하는 전략
+_worker_strategies: dict = {}
+
+
+def make_windows(
+    start: datetime, end_date, in_sample_months: int, out_of_sample_months: int
+) -> list:
+    """
+    start 부터 out_of_sample_months 씩 이동하는 (학습 구간 시작, 검증 구간 시작, 검증 구간 끝) 목록
+    학습 구간은 in_sample_months, 검증 구간은 out_of_sample_months 개월이며
+    검증 구간 시작이 end_date 이후면 끝난다. (모두 월의 1일)
+    """
+    windows = []
+    for k in itertools.count():
+        in_sample_start = start + relativedelta(months=k * out_of_sample_months)
+        out_of_sample_start = in_sample_start + relativedelta(months=in_sample_months)
+        if np.datetime64(out_of_sample_start, "D") > np.datetime64(end_date, "D"):
+            return windows
+        out_of_sample_end = out_of_sample_start + relativedelta(months=out_of_sample_months)
+        windows.append((in_sample_start, out_of_sample_start, out_of_sample_end))
+
+
+def with_momentum(prices: PriceMatrix, months_list: list) -> PriceMatrix:
+    """
+    후보 기간의 모멘텀을 미리 계산해 둔 가격 행렬 (모든 구간, 모든 후보가 같은 값을 재사용)
+    이미 모든 기간의 모멘텀이 있으면 그대로 반환한다.
+    """
+    momentum = prices.momentum
+    if momentum is not None and all(months in momentum.values for months in months_list):
+        return prices
+    return PriceMatrix(
+        prices.dates,
+        prices.tickers,
+        prices.prices,
+        prices.prev_valid,
+        prices.next_valid,
+        prices.offset,
+        MomentumTable.from_prices(prices, sorted(set(months_list))),
+        prices.calendar,
+    )
+
+
+def _init_worker(handle: tuple, universe: list | None) -> None:
+    global _worker_prices, _worker_universe
+    _worker_universe = universe
+    _worker_prices, blocks = SharedPriceMatrix.attach(handle)
+    _worker_blocks.extend(blocks)
+
+
+def _simulate(
+    start: datetime, end: datetime, params: dict, rebalance_month_period: int, top_n: int
+) -> (dict, list, datetime):
+    """
+    start 월부터 end 월의 리밸런싱까지 실행한다.
+
+    Returns:
+        투자 성과 지표   ||
+        NAV 리스트   ||
+        마지막 리밸런싱 날짜
+    """
+    if top_n not in _worker_strategies:
+        _worker_strategies[top_n] = DualMomentumStrategy(top_n=top_n)
+    trading_day = params["trading_day"]
+    prices = _worker_prices.until(clamp_date(end.year, end.month, trading_day))
+    _, stats, nav_history = rebalancing_service.simulate(
+        prices,
+        start.year,
+        start.month,
+        params["initial_nav"],
+        trading_day,
+        params["trading_fee"],
+        rebalance_month_period,
+        strategy=_worker_strategies[top_n],
+        universe=_worker_universe,
+    )
+    last_date = rebalancing_service.get_rebalance_dates(
+        prices, clamp_date(start.year, start.month, trading_day), trading_day, 1
+    )[-1]
+    return stats, nav_history, last_date
+
+
+def _run_window(task: dict) -> dict:
+    """
+    학습 구간에서 후보마다 실행해 sort_by 가 가장 좋은 후보를 고르고, 그 후보로 검증 구간을 실행한다.
+    """
+    in_sample_start, out_of_sample_start, out_of_sample_end = task["window"]
+    params = task["params"]
+    result = {
+        "in_sample": [in_sample_start.date().isoformat(), out_of_sample_start.date().isoformat()],
+        "out_of_sample": [
+            out_of_sample_start.date().isoformat(),
+            out_of_sample_end.date().isoformat(),
+        ],
+        "candidates": [],
+    }
+
+    best = None
+    for candidate in task["candidates"]:
+        try:
+            stats, _, _ = _simulate(
+                in_sample_start, out_of_sample_start, params, **candidate
+            )
+            value = float(stats[params["sort_by"]])
+            score = sort_score(value, params["sort_by"])
+        except Exception as e:
+            result["candidates"].append(candidate | {"score": None, "error": str(e)})
+            continue
+        result["candidates"].append(
+            candidate | {"score": value if math.isfinite(value) else None, "error": None}
+        )
+        if best is None or score > best[0]:
+            best = (score, candidate, stats)
+
+    if best is None:
+        result.update(params=None, in_sample_stats=None, out_of_sample_stats=None)
+        result["error"] = "No candidate could be evaluated on the in-sample window"
+        return result
+
+    _, candidate, in_sample_stats = best
+    try:
+        stats, nav_history, last_date = _simulate(
+            out_of_sample_start, out_of_sample_end, params, **candidate
+        )
+    except Exception as e:
+        result.update(params=candidate, in_sample_stats=in_sample_stats, out_of_sample_stats=None)
+        result["error"] = str(e)
+        return result
+    result.update(
+        params=candidate,
+        in_sample_stats=in_sample_stats,
+        out_of_sample_stats=stats,
+        nav_history=nav_history,
+        last_rebalance_date=last_date.date().isoformat(),
+        error=None,
+    )
+    return result
+
+
+def stitch_nav(windows: list, initial_nav: float) -> list:
+    """
+    검증 구간의 NAV 를 직전 NAV 에 맞춰 비율로 이어 붙인다.
+
+    검증 구간은 후보마다 따로 실행하므로 구간마다 현금에서 새로 시작하고,
+    NAV 의 두 번째 값은 시작일에 전부 매수한 뒤의 NAV 다. (수익률 없이 수수료만 빠짐)
+    바로 이어지는 구간의 시작일은 직전 구간의 마지막 리밸런싱 날짜와 같으므로
+    이 매수 단계를 빼고 이어 붙여 같은 날짜의 단계가 두 번 들어가지 않게 한다.
+    (구간 사이에 후보가 바뀔 때의 매매 비용은 반영하지 않는다)
+    """
+    nav_history = [initial_nav]
+    previous_end = None
+    for window in windows:
+        skip = 1 if window["out_of_sample"][0] == previous_end else 0
+        window_nav = window["nav_history"][skip:]
+        scale = nav_history[-1] / window_nav[0]
+        nav_history.extend(nav * scale for nav in window_nav[1:])
+        previous_end = window["out_of_sample"][1]
+    return nav_history
+
+
+def run_walk_forward(
+    prices: PriceMatrix,
+    start_year: int,
+    start_month: int,
+    initial_nav: float,
+    trading_day: int,
+    trading_fee: float,
+    rebalance_month_periods: list,
+    top_ns: list,
+    in_sample_months: int = 60,
+    out_of_sample_months: int = 12,
+    sort_by: str = "sharpe",
+    universe: list = None,
+    max_workers: int = WALK_FORWARD_MAX_WORKERS,
+) -> dict:
+    """
+    워크 포워드 최적화 (dual_momentum 의 rebalance_month_period, top_n)
+
+    학습 구간마다 모든 (rebalance_month_period, top_n) 후보를 실행해 sort_by 가 가장 좋은 후보를 고르고,
+    (vol 은 가장 작은 후보)
+    바로 다음 검증 구간을 그 후보로 실행한 뒤 검증 구간의 NAV 를 이어 붙인다.
+    후보 기간의 모멘텀은 한 번만 계산해 모든 구간과 후보가 공유하고,
+    구간은 프로세스 풀에서 나눠 실행한다.
+
+    Returns:
+        {"windows": 구간별 결과, "nav_history": 이어 붙인 검증 구간 NAV, "stats": 투자 성과 지표}
+    """
+    if sort_by not in STAT_KEYS:
+        raise ValueError(f"sort_by must be one of {STAT_KEYS}")
+    if in_sample_months < 1 or out_of_sample_months < 1:
+        raise ValueError("in_sample_months and out_of_sample_months must be at least 1")
+
+    windows = make_windows(
+        datetime(start_year, start_month, 1),
+        prices.max_date,
+        in_sample_months,
+        out_of_sample_months,
+    )
+    if not windows:
+        raise ValueError("Not enough price data for a single walk-forward window")
+
+    params = {
+        "initial_nav": initial_nav,
+        "trading_day": trading_day,
+        "trading_fee": trading_fee,
+        "sort_by": sort_by,
+    }
+    candidates = [
+        {"rebalance_month_period": period, "top_n": top_n}
+        for period, top_n in itertools.product(rebalance_month_periods, top_ns)
+    ]
+    tasks = [
+        {"window": window, "params": params, "candidates": candidates} for window in windows
+    ]
+
+    shared = SharedPriceMatrix(with_momentum(prices, rebalance_month_periods))
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(shared.handle, universe),
+        ) as executor:
+            results = list(executor.map(_run_window, tasks))
+    finally:
+        shared.close()
+
+    completed = [window for window in results if window["error"] is None]
+    nav_history = stitch_nav(completed, initial_nav)
+    stats = None
+    if len(completed) and len(nav_history) > 1:
+        out_of_sample_start = datetime.fromisoformat(completed[0]["out_of_sample"][0])
+        first_date = clamp_date(out_of_sample_start.year, out_of_sample_start.month, trading_day)
+        last_date = datetime.fromisoformat(completed[-1]["last_rebalance_date"])
+        stats = rebalancing_service.calculate_statistics(
+            nav_history, (last_date - first_date).days
+        )
+    return {"windows": results, "nav_history": nav_history, "stats": stats}
@@ -0,0 +1,61 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# stocks.core.database 가 import 시점에 엔진을 만들므로 먼저 테스트용 SQLite 를 지정한다
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+)
+
+TICKERS = ["SPY", "QQQ", "GLD", "TIP", "BIL"]
+
+
+def make_price_frame(tickers: list = TICKERS, start="2015-01-01", end="2019-12-31", seed=0):
+    """
+    종목별 기하 브라운 운동 가격 (date, ticker, price) DataFrame (영업일 기준)
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, end)
+    frames = []
+    for ticker in tickers:
+        returns = rng.normal(0.0003, 0.01 + 0.01 * rng.random(), len(dates))
+        frames.append(
+            pd.DataFrame(
+                {"date": dates, "ticker": ticker, "price": 100 * np.exp(np.cumsum(returns))}
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.fixture
+def price_frame() -> pd.DataFrame:
+    return make_price_frame()
+
+
+@pytest.fixture(scope="session")
+def app():
+    """
+    합성 가격을 저장한 테스트 DB 를 쓰는 FastAPI 앱
+    """
+    from main import app
+    from stocks.core.database import SessionLocal
+    from stocks.core.executor import shutdown_pools
+    from stocks.infra.crud.ticker import bulk_create_tickers
+    from stocks.infra.database.daily_ticker import daily_ticker_repo
+
+    frame = make_price_frame(start="2010-01-01", end="2020-12-31")
+    session = SessionLocal()
+    try:
+        bulk_create_tickers(
+            session,
+            frame.assign(date=frame["date"].dt.date).to_dict("records"),
+        )
+        daily_ticker_repo.refresh_momentum(session)
+    finally:
+        session.close()
+
+    yield app
+    shutdown_pools()
@@ -0,0 +1,89 @@
+"""
+엔진 단계별 성능 회귀 벤치마크 (pytest-benchmark)
+
+기본 실행에서는 건너뛰고(--benchmark-skip), CI 에서 저장된 기준과 비교한다.
+    pytest --benchmark-only --benchmark-autosave
+    pytest --benchmark-only --benchmark-compare --benchmark-compare-fail=median:20%
+"""
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from stocks.jobs.benchmark_suite import BENCH_PARAMS, generate_prices
+from stocks.services.monte_carlo import run_monte_carlo
+from stocks.services.rebalancing import rebalancing_service
+from stocks.services.strategy import get_strategy
+from utils.price_matrix import PriceMatrix
+
+START_YEAR = 2012
+
+
+@pytest.fixture(scope="module")
+def price_frame() -> pd.DataFrame:
+    frame = generate_prices(tickers=50, years=15)
+    return frame.assign(date=pd.to_datetime(frame["date"]))
+
+
+@pytest.fixture(scope="module")
+def matrix(price_frame) -> PriceMatrix:
+    return PriceMatrix.from_frame(price_frame)
+
+
+@pytest.fixture(scope="module")
+def rebalance_dates(matrix) -> pd.DatetimeIndex:
+    start_date = datetime(START_YEAR, BENCH_PARAMS["start_month"], BENCH_PARAMS["trading_day"])
+    return pd.DatetimeIndex(
+        rebalancing_service.get_rebalance_dates(matrix, start_date, BENCH_PARAMS["trading_day"], 1)
+    )
+
+
+@pytest.mark.benchmark(group="price_matrix")
+def test_from_frame(benchmark, price_frame):
+    matrix = benchmark(PriceMatrix.from_frame, price_frame)
+    assert len(matrix.tickers) == 50
+
+
+@pytest.mark.benchmark(group="engine")
+@pytest.mark.parametrize("strategy", ["dual_momentum", "equal_weight"])
+def test_calculate_weights(benchmark, matrix, rebalance_dates, strategy):
+    weights, _ = benchmark(
+        get_strategy(strategy).calculate_weights,
+        matrix,
+        rebalance_dates,
+        BENCH_PARAMS["rebalance_month_period"],
+    )
+    assert weights.shape == (len(rebalance_dates), len(matrix.tickers))
+
+
+@pytest.mark.benchmark(group="engine")
+def test_calculate_profit_rates(benchmark, matrix, rebalance_dates):
+    profit_rates, _, _ = benchmark(
+        rebalancing_service.calculate_profit_rates,
+        matrix,
+        rebalance_dates,
+        BENCH_PARAMS["rebalance_month_period"],
+    )
+    assert profit_rates.shape == (len(rebalance_dates), len(matrix.tickers))
+
+
+@pytest.mark.benchmark(group="engine")
+def test_simulate(benchmark, matrix, rebalance_dates):
+    weights, stats, nav_history = benchmark(
+        rebalancing_service.simulate, matrix, START_YEAR, initial_nav=1000.0, **BENCH_PARAMS
+    )
+    assert len(nav_history) == len(rebalance_dates) + 1
+
+
+@pytest.mark.benchmark(group="monte_carlo")
+def test_monte_carlo(benchmark, matrix):
+    result = benchmark(
+        run_monte_carlo,
+        matrix,
+        START_YEAR,
+        initial_nav=1000.0,
+        paths=500,
+        seed=0,
+        **BENCH_PARAMS,
+    )
+    assert result["paths"] == 500
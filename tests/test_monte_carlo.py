@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stocks.services.monte_carlo import (
+    block_bootstrap_indices,
+    chunk_paths_for,
+    execute_trades_batch,
+    run_monte_carlo,
+)
+from stocks.services.rebalancing import rebalancing_service
+from stocks.services.strategy import get_strategy
+from utils.price_matrix import PriceMatrix
+
+
+def test_bootstrap_indices_do_not_depend_on_chunking():
+    whole = block_bootstrap_indices(np.random.default_rng(3), 10, 40, 60, 12)
+    rng = np.random.default_rng(3)
+    chunks = [block_bootstrap_indices(rng, n, 40, 60, 12) for n in (3, 1, 6)]
+
+    np.testing.assert_array_equal(np.concatenate(chunks), whole)
+    assert whole.min() >= 0 and whole.max() < 60
+
+
+def test_chunk_paths_follows_memory_budget():
+    assert chunk_paths_for(100, 10, memory_budget=6 * 101 * 10 * 8 * 50) == 50
+    assert chunk_paths_for(100, 10, memory_budget=1) == 1
+
+
+@pytest.mark.parametrize("chunk_paths", [None, 1, 7, 64])
+def test_results_do_not_depend_on_chunk_size(price_frame, chunk_paths):
+    prices = PriceMatrix.from_frame(price_frame)
+    args = (prices, 2016, 1, 1000.0, 15, 0.001, 3)
+
+    expected = run_monte_carlo(*args, paths=64, seed=11, chunk_paths=64)
+    assert run_monte_carlo(*args, paths=64, seed=11, chunk_paths=chunk_paths) == expected
+
+
+@pytest.mark.parametrize("trading_fee, rebalance_month_period", [(0.001, 3), (0.01, 6), (0.0, 1)])
+def test_batch_trades_match_simulate_on_identity_path(
+    price_frame, trading_fee, rebalance_month_period
+):
+    prices = PriceMatrix.from_frame(price_frame)
+    args = (2016, 1, 1000.0, 15, trading_fee, rebalance_month_period)
+    _, _, nav_history = rebalancing_service.simulate(prices, *args)
+
+    # simulate 가 실제로 쓴 비중과 가격 변화율을 그대로 하나의 경로로 넣는다
+    strategy = get_strategy("dual_momentum")
+    start_date = datetime(2016, 1, 15)
+    sliced = rebalancing_service._slice_prices(
+        prices, start_date, rebalance_month_period, strategy, None
+    )
+    rebalance_dates = pd.DatetimeIndex(
+        rebalancing_service.get_rebalance_dates(sliced, start_date, 15, 1)
+    )
+    weights, _ = strategy.calculate_weights(sliced, rebalance_dates, rebalance_month_period)
+    profit_rates, seen, _ = rebalancing_service.calculate_profit_rates(
+        sliced, rebalance_dates, rebalance_month_period
+    )
+    growth = np.where(seen, profit_rates, 0.0)
+
+    nav = execute_trades_batch(
+        np.stack([weights] * 3), np.stack([growth] * 3), 1000.0, trading_fee
+    )
+    for path_nav in nav:
+        np.testing.assert_array_equal(path_nav, nav_history)
@@ -0,0 +1,118 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from stocks.infra.crud.ticker import bulk_create_tickers
+from stocks.infra.database import daily_ticker
+from stocks.infra.database.ticker_momentum import momentum_history_query, ticker_momentum_repo
+from stocks.jobs import fetch_stock_data
+from stocks.models import Base, PriceDataChange
+from utils.momentum_table import calculate_momentum_frame
+from utils.price_matrix import PriceMatrix
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def to_rows(frame) -> list:
+    return frame.assign(date=frame["date"].dt.date).to_dict("records")
+
+
+def logged_since(session) -> list:
+    return session.execute(select(PriceDataChange.since).order_by(PriceDataChange.version)).scalars().all()
+
+
+def test_bulk_create_reports_and_logs_only_inserted_rows(session, price_frame):
+    old = price_frame[price_frame["date"] <= "2019-12-30"]
+    assert bulk_create_tickers(session, to_rows(old)) == (
+        len(old),
+        datetime.date(2015, 1, 1),
+        datetime.date(2019, 12, 30),
+    )
+
+    # 최근 한 달을 다시 가져오면 새 날짜(12/31)만 저장되고 기록된다
+    recent = price_frame[price_frame["date"] >= "2019-12-01"]
+    new_day = datetime.date(2019, 12, 31)
+    assert bulk_create_tickers(session, to_rows(recent)) == (5, new_day, new_day)
+    assert bulk_create_tickers(session, to_rows(recent)) == (0, None, None)
+    assert logged_since(session) == [datetime.date(2015, 1, 1), new_day]
+
+
+def test_new_day_refreshes_cache_incrementally(session, price_frame, monkeypatch):
+    bulk_create_tickers(session, to_rows(price_frame[price_frame["date"] <= "2019-12-30"]))
+    cache = daily_ticker.PriceHistoryCache(refresh_seconds=0)
+    cache.get(session)
+
+    queried = []
+    query = daily_ticker.price_history_query
+    monkeypatch.setattr(
+        daily_ticker,
+        "price_history_query",
+        lambda after_date=None: queried.append(after_date) or query(after_date),
+    )
+    bulk_create_tickers(session, to_rows(price_frame[price_frame["date"] >= "2019-12-01"]))
+    matrix = cache.get(session)
+
+    assert None not in queried
+    assert matrix.max_date == datetime.date(2019, 12, 31)
+    assert len(matrix.dates) == price_frame["date"].nunique()
+
+
+def test_fetch_job_refreshes_momentum_for_inserted_dates_only(session, price_frame, monkeypatch):
+    bulk_create_tickers(session, to_rows(price_frame[price_frame["date"] <= "2019-12-30"]))
+    recent = price_frame[price_frame["date"] >= "2019-12-01"]
+
+    async def fetch(tickers, range, concurrency):
+        return {
+            ticker: [(row.date.date(), row.price) for row in group.itertuples()]
+            for ticker, group in recent.groupby("ticker")
+        }
+
+    refreshed = []
+    monkeypatch.setattr(fetch_stock_data, "async_fetch_adjusted_close_prices", fetch)
+    monkeypatch.setattr(fetch_stock_data, "SessionLocal", lambda: session)
+    monkeypatch.setattr(
+        fetch_stock_data.daily_ticker_repo,
+        "refresh_momentum",
+        lambda db, since, until: refreshed.append((since, until)),
+    )
+
+    new_day = datetime.date(2019, 12, 31)
+    assert fetch_stock_data.update_stock_prices(list(recent["ticker"].unique())) == 5
+    assert fetch_stock_data.update_stock_prices(list(recent["ticker"].unique())) == 0
+    assert refreshed == [(new_day, new_day)]
+
+
+def test_momentum_refresh_inserts_batch_by_batch(session, price_frame, monkeypatch):
+    prices = PriceMatrix.from_frame(price_frame)
+    since, until = datetime.date(2018, 3, 1), datetime.date(2018, 6, 29)
+
+    batches = []
+    execute = session.execute
+    monkeypatch.setattr(
+        session,
+        "execute",
+        lambda statement, params=None: (batches.append(len(params)) if params else None)
+        or execute(statement, params),
+    )
+    count = ticker_momentum_repo.refresh(session, prices, since, until, [1, 3], batch_size=100)
+
+    expected = calculate_momentum_frame(prices, [1, 3], since, datetime.date(2018, 9, 29))
+    saved = pd.read_sql(momentum_history_query(), session.bind)
+    assert count == len(expected) == len(saved) == sum(batches)
+    assert max(batches) <= 100
+    saved = saved.sort_values(["date", "ticker", "months"]).reset_index(drop=True)
+    expected = expected.sort_values(["date", "ticker", "months"]).reset_index(drop=True)
+    assert (pd.to_datetime(saved["date"]) == expected["date"]).all()
+    assert np.allclose(saved["momentum"], expected["momentum"], equal_nan=True)
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from stocks.services.rebalancing import rebalancing_service
+from utils.price_matrix import PriceMatrix
+
+
+def test_from_frame_sorts_tickers(price_frame):
+    matrix = PriceMatrix.from_frame(price_frame)
+
+    assert matrix.tickers == sorted(price_frame["ticker"].unique())
+
+
+def test_append_inserts_new_ticker_in_order(price_frame):
+    old = price_frame[price_frame["date"] < "2018-01-01"]
+    new = price_frame[price_frame["date"] >= "2018-01-01"]
+    matrix = PriceMatrix.from_frame(old[old["ticker"] != "GLD"]).append(
+        PriceMatrix.from_frame(new)
+    )
+
+    assert matrix.tickers == ["BIL", "GLD", "QQQ", "SPY", "TIP"]
+    gld = matrix.prices[:, matrix.tickers.index("GLD")]
+    assert np.isnan(gld[matrix.dates < np.datetime64("2018-01-01")]).all()
+    expected = PriceMatrix.from_frame(new).prices
+    np.testing.assert_array_equal(matrix.prices[-len(expected) :], expected)
+
+
+def test_results_do_not_depend_on_row_order(price_frame):
+    shuffled = price_frame.sample(frac=1, random_state=1)
+    reversed_tickers = pd.concat(
+        [price_frame[price_frame["ticker"] == t] for t in reversed(price_frame["ticker"].unique())]
+    )
+
+    results = [
+        rebalancing_service.simulate(PriceMatrix.from_frame(frame), 2016, 1, 1000.0, 15, 0.01, 3)
+        for frame in (price_frame, shuffled, reversed_tickers)
+    ]
+
+    weights, stats, nav_history = results[0]
+    assert [ticker for ticker, _ in weights[0]] == ["BIL", "GLD", "QQQ", "SPY", "TIP"]
+    for other in results[1:]:
+        assert other == (weights, stats, nav_history)
+
+
+def test_simulate_rejects_start_after_last_price(price_frame):
+    matrix = PriceMatrix.from_frame(price_frame)
+
+    with pytest.raises(ValueError, match="No price data on or after 2020-01-15"):
+        rebalancing_service.simulate(matrix, 2020, 1, 1000.0, 15, 0.01, 3)
+    with pytest.raises(ValueError, match="No rebalance date after 2019-12-31"):
+        rebalancing_service.simulate(matrix, 2019, 12, 1000.0, 31, 0.01, 3)
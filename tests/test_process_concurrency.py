@@ -0,0 +1,88 @@
+import asyncio
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select
+
+from stocks.core.database import SessionLocal
+from stocks.infra.database.daily_ticker import daily_ticker_repo
+from stocks.models import RebalancingData
+from stocks.services.rebalancing import rebalancing_service
+
+INPUTS = [
+    {
+        "start_year": start_year,
+        "start_month": start_month,
+        "initial_nav": 1000.0,
+        "trading_day": trading_day,
+        "trading_fee": 0.001,
+        "rebalance_month_period": period,
+    }
+    for start_year, start_month, trading_day, period in [
+        (2012, 1, 15, 3),
+        (2013, 6, 28, 6),
+        (2015, 2, 31, 1),
+        (2016, 11, 1, 12),
+    ]
+]
+
+
+async def post_all(app, bodies: list) -> list:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = await asyncio.gather(
+            *[client.post("/api/v1/rebalancing/process", json=body) for body in bodies]
+        )
+    assert all(response.status_code == 200 for response in responses)
+    return [response.json()["data"] for response in responses]
+
+
+def count_rows() -> dict:
+    session = SessionLocal()
+    try:
+        rows = session.execute(
+            select(RebalancingData.input_hash, func.count()).group_by(RebalancingData.input_hash)
+        ).all()
+    finally:
+        session.close()
+    return dict(rows)
+
+
+def simulate_serially(body: dict) -> dict:
+    """
+    같은 가격 행렬로 API 를 거치지 않고 직접 실행한 결과 (응답의 output, last_rebalance_weight 형태)
+    """
+    session = SessionLocal()
+    try:
+        since, tickers = rebalancing_service.get_input_price_range(body)
+        prices = daily_ticker_repo.fetch_price_matrix(session, since, tickers)
+    finally:
+        session.close()
+    rebalance_weight_list, stats, _ = rebalancing_service.simulate(prices, **body)
+    return jsonable_encoder({"output": stats, "last_rebalance_weight": rebalance_weight_list[-1]})
+
+
+def test_parallel_process_matches_serial_and_saves_once(app):
+    # 같은 입력을 여러 번 섞어서 동시에 요청한다
+    bodies = INPUTS * 4
+    parallel = asyncio.run(post_all(app, bodies))
+
+    rows = count_rows()
+    assert len(rows) == len(INPUTS)
+    assert set(rows.values()) == {1}
+
+    by_input = {}
+    for body, result in zip(bodies, parallel):
+        by_input.setdefault(tuple(body.values()), []).append(result)
+    for results in by_input.values():
+        assert all(result == results[0] for result in results)
+
+    # 동시에 실행한 결과가 같은 가격으로 하나씩 직접 실행한 결과와 같다
+    for body, result in zip(INPUTS, parallel):
+        expected = simulate_serially(body)
+        assert result["output"] == expected["output"]
+        assert result["last_rebalance_weight"] == expected["last_rebalance_weight"]
+
+    # 다시 요청해도 새로 저장하지 않는다
+    asyncio.run(post_all(app, INPUTS))
+    assert count_rows() == rows
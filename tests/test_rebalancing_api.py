@@ -0,0 +1,35 @@
+import asyncio
+
+import httpx
+import pytest
+
+BODY = {
+    "start_year": 2015,
+    "start_month": 1,
+    "initial_nav": 1000.0,
+    "trading_day": 15,
+    "trading_fee": 0.001,
+    "rebalance_month_period": 3,
+}
+
+
+async def post(app, path: str, body: dict) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post(f"/api/v1/rebalancing{path}", json=body)
+
+
+@pytest.mark.parametrize("path", ["/process", "/daily_nav"])
+def test_start_after_last_price_is_bad_request(app, path):
+    response = asyncio.run(post(app, path, {**BODY, "start_year": 2030}))
+
+    assert response.status_code == 400
+    assert "No price data on or after 2030-01-15" in response.text
+
+
+@pytest.mark.parametrize("path", ["/process", "/daily_nav", "/monte_carlo"])
+def test_unknown_universe_ticker_is_bad_request(app, path):
+    response = asyncio.run(post(app, path, {**BODY, "universe": ["SPY", "XXX", "QQQ"]}))
+
+    assert response.status_code == 400
+    assert "No price data for tickers: XXX" in response.text
@@ -0,0 +1,33 @@
+import json
+import math
+
+import numpy as np
+import pytest
+
+from stocks.core import response
+
+CONTENT = {
+    "nav": [1000.0, math.nan, math.inf],
+    "stats": {"sharpe": np.float64("nan"), "cagr": 1.5},
+    "weights": [("SPY", 0.5), ("BIL", -math.inf)],
+}
+EXPECTED = {
+    "nav": [1000.0, None, None],
+    "stats": {"sharpe": None, "cagr": 1.5},
+    "weights": [["SPY", 0.5], ["BIL", None]],
+}
+
+
+def test_json_fallback_serializes_non_finite_as_null(monkeypatch):
+    monkeypatch.setattr(response, "orjson", None)
+
+    assert json.loads(response.dumps(CONTENT)) == EXPECTED
+
+
+def test_json_fallback_matches_orjson(monkeypatch):
+    if response.orjson is None:
+        pytest.skip("orjson is not installed")
+    with_orjson = response.dumps(CONTENT)
+    monkeypatch.setattr(response, "orjson", None)
+
+    assert response.dumps(CONTENT) == with_orjson
@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from stocks.services.rebalancing import rebalancing_service
+from stocks.services.strategy import STRATEGIES, Strategy, register_strategy
+from utils.price_matrix import PriceMatrix
+
+
+def test_incomplete_strategy_cannot_be_registered():
+    class NoPathWeights(Strategy):
+        name = "no_path_weights"
+
+        def calculate_weights(self, prices, rebalance_dates, period_months, initial_momentum=0):
+            return None, None
+
+    with pytest.raises(TypeError):
+        register_strategy(NoPathWeights())
+    assert "no_path_weights" not in STRATEGIES
+
+
+@pytest.mark.parametrize("name", sorted(STRATEGIES))
+@pytest.mark.parametrize("period", [1, 3, 6, 12])
+def test_lookback_days_covers_rebalance_period(price_frame, name, period):
+    strategy = STRATEGIES[name]
+    assert strategy.lookback_days(period) >= strategy.lookback_months(period) * 31
+
+    # 필요한 기간만 불러와도 전체 가격으로 실행한 결과와 같아야 한다
+    since = datetime(2017, 3, 10) - timedelta(days=strategy.lookback_days(period))
+    full = PriceMatrix.from_frame(price_frame)
+    trimmed = PriceMatrix.from_frame(price_frame[price_frame["date"] >= since])
+    args = (2017, 3, 1000.0, 10, 0.001, period)
+    assert rebalancing_service.simulate(trimmed, *args, strategy=name) == (
+        rebalancing_service.simulate(full, *args, strategy=name)
+    )
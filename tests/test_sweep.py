@@ -0,0 +1,25 @@
+import pytest
+
+from stocks.services.sweep import STAT_KEYS, run_sweep
+from utils.price_matrix import PriceMatrix
+
+GRID = {
+    "start_year": [2016],
+    "start_month": [1],
+    "initial_nav": [1000.0],
+    "trading_day": [15],
+    "trading_fee": [0.001],
+    "rebalance_month_period": [1, 3, 6],
+    "strategy": ["dual_momentum", "equal_weight"],
+}
+
+
+@pytest.mark.parametrize("sort_by", STAT_KEYS)
+def test_sweep_sorts_best_first(price_frame, sort_by):
+    prices = PriceMatrix.from_frame(price_frame)
+    values = [row[sort_by] for row in run_sweep(prices, GRID, sort_by, max_workers=2)]
+
+    # vol 은 낮을수록 좋은 지표이므로 오름차순, 나머지는 내림차순
+    expected = sorted(values, reverse=sort_by != "vol")
+    assert values == expected
+    assert len(set(values)) > 1
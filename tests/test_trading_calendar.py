@@ -0,0 +1,63 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+from stocks.schemas.rebalancing import RebalanceInput, RebalanceSweepInput
+from utils.trading_calendar import TradingCalendar, clamp_date
+
+DATES = pd.bdate_range("2024-01-02", "2024-06-28").values.astype("datetime64[D]")
+
+
+def test_next_trading_date_picks_last_trading_day_on_or_before_target():
+    calendar = TradingCalendar(DATES)
+
+    # 2024-03-31 은 일요일
+    assert calendar.next_trading_date(datetime(2024, 2, 29), 31) == pd.Timestamp("2024-03-29")
+    assert calendar.next_trading_date(datetime(2024, 1, 31), 31) == pd.Timestamp("2024-02-29")
+
+
+def test_next_trading_date_is_none_without_trading_day_before_target():
+    calendar = TradingCalendar(DATES)
+
+    assert calendar.next_trading_date(datetime(2023, 11, 15), 1) is None
+    assert TradingCalendar(np.array([], dtype="datetime64[D]")).next_trading_date(
+        datetime(2024, 1, 15), 15
+    ) is None
+
+
+def test_schedule_stops_at_end_of_data():
+    calendar = TradingCalendar(DATES)
+
+    assert calendar.schedule(pd.Timestamp("2024-04-15"), 15) == [
+        pd.Timestamp("2024-04-15"),
+        pd.Timestamp("2024-05-15"),
+        pd.Timestamp("2024-06-14"),
+        pd.Timestamp("2024-06-28"),
+    ]
+    assert calendar.schedule(pd.Timestamp("2023-10-02"), 1) == [pd.Timestamp("2023-10-02")]
+
+
+def test_clamp_date_rejects_invalid_day():
+    assert clamp_date(2023, 2, 31) == datetime(2023, 2, 28)
+    with pytest.raises(ValueError):
+        clamp_date(2024, 1, 32)
+
+
+@pytest.mark.parametrize("trading_day", [0, 32])
+def test_trading_day_is_validated(trading_day):
+    data = {
+        "start_year": 2020,
+        "start_month": 1,
+        "initial_nav": 1000,
+        "trading_fee": 0.001,
+        "rebalance_month_period": 3,
+    }
+    with pytest.raises(ValidationError):
+        RebalanceInput(trading_day=trading_day, **data)
+    with pytest.raises(ValidationError):
+        RebalanceSweepInput(
+            trading_day=[15, trading_day], **{key: [value] for key, value in data.items()}
+        )
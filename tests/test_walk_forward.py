@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from stocks.services.walk_forward import run_walk_forward, stitch_nav
+from utils.price_matrix import PriceMatrix
+
+
+def test_stitch_nav_drops_repeated_entry_at_window_boundary():
+    windows = [
+        {"out_of_sample": ["2016-01-01", "2017-01-01"], "nav_history": [100.0, 99.0, 110.0]},
+        {"out_of_sample": ["2017-01-01", "2018-01-01"], "nav_history": [100.0, 99.0, 99.0 * 1.2]},
+        # 직전 구간과 떨어진 구간은 시작일의 매수 단계를 그대로 둔다
+        {"out_of_sample": ["2019-01-01", "2020-01-01"], "nav_history": [100.0, 99.0]},
+    ]
+
+    assert stitch_nav(windows, 1000.0) == pytest.approx([1000.0, 990.0, 1100.0, 1320.0, 1306.8])
+
+
+def test_walk_forward_has_no_zero_return_step_between_windows(price_frame):
+    result = run_walk_forward(
+        PriceMatrix.from_frame(price_frame),
+        2015,
+        1,
+        1000.0,
+        15,
+        0.0,
+        [1, 3],
+        [1, 2],
+        in_sample_months=12,
+        out_of_sample_months=12,
+        max_workers=2,
+    )
+    windows = result["windows"]
+    assert len(windows) == 4 and all(window["error"] is None for window in windows)
+
+    # 수수료가 0 이면 시작일의 매수 단계는 수익률이 0 이므로 첫 구간에만 남는다
+    returns = np.diff(result["nav_history"])
+    assert returns[0] == 0
+    assert np.count_nonzero(returns[1:] == 0) == 0
+    assert len(result["nav_history"]) == 2 + sum(len(w["nav_history"]) - 2 for w in windows)
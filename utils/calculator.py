@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 
@@ -6,3 +7,35 @@ def calculate_momentum(stock_prices: pd.DataFrame) -> float:
     initial_price = stock_prices.iloc[0].price
     latest_price = stock_prices.iloc[-1].price
     return (latest_price - initial_price) / initial_price
+
+
+def calculate_momentum_matrix(
+    initial_prices: np.ndarray, latest_prices: np.ndarray
+) -> np.ndarray:
+    """모멘텀 계산 (구간 x 종목 행렬 단위)"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (latest_prices - initial_prices) / initial_prices
+
+
+def round_numpy(values: np.ndarray, decimals: int = 2) -> np.ndarray:
+    """NumPy 스칼라에 round() 를 적용한 것과 같은 반올림 (np.round)"""
+    return np.round(values, decimals)
+
+
+def round_python(values: np.ndarray, decimals: int = 2) -> np.ndarray:
+    """파이썬 float 에 round() 를 적용한 것과 같은 반올림 (십진수 기준 정확한 반올림)"""
+    values = np.asarray(values, dtype=np.float64)
+    return np.array(
+        [round(value, decimals) for value in values.ravel().tolist()], dtype=np.float64
+    ).reshape(values.shape)
+
+
+def sequential_sum(initial, values: np.ndarray) -> np.ndarray:
+    """
+    initial 에 values 를 앞에서부터 차례로 더한 누적값 (마지막 축 길이 + 1)
+    np.sum 은 더하는 순서가 달라 결과가 조금 다를 수 있으므로, 반복문으로 더한 것과 같은 결과가 필요할 때 사용
+    values 가 2차원 이상이면 마지막 축을 따라 행마다 누적한다. (initial 은 행마다 하나)
+    """
+    values = np.asarray(values)
+    initial = np.broadcast_to(np.asarray(initial)[..., None], values.shape[:-1] + (1,))
+    return np.cumsum(np.concatenate([initial, values], axis=-1), axis=-1)
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class PurchaseListObject:
     stock_code: str
     purchase_amount: float
@@ -20,3 +23,75 @@ class TickerInfo:
     momentum: float = 0
     profit_rate: float = 0
     current_price: float = 0
+    seen: bool = False
+
+
+# 종목별 상태 필드 (TickerInfo 와 같은 이름), RebalancingContext 에서는 종목 순서의 배열로 보관
+TICKER_INFO_FIELDS = [
+    "weight",
+    "before_weight",
+    "target_nav",
+    "actioned",
+    "fee",
+    "before_nav",
+    "after_nav",
+    "momentum",
+    "profit_rate",
+    "current_price",
+    "seen",
+]
+BOOL_TICKER_INFO_FIELDS = {"actioned", "seen"}
+
+
+def _to_json_value(value):
+    # NumPy 스칼라는 JSON 으로 저장할 수 있도록 파이썬 값으로 변환
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class RebalancingContext:
+    """
+    리밸런싱 1회 실행 동안의 시뮬레이션 상태
+
+    종목별 상태(TICKER_INFO_FIELDS)는 tickers 순서로 정렬된 NumPy 배열이다.
+    예) context.weight[i] 는 tickers[i] 의 비중
+    """
+
+    def __init__(self, initial_nav: float, tickers: list):
+        self.account_status = AccountStatus()
+        self.account_status.initial_nav = initial_nav
+        self.account_status.current_nav = initial_nav
+        self.total_nav = initial_nav
+        self.tickers = list(tickers)
+        for field in TICKER_INFO_FIELDS:
+            dtype = bool if field in BOOL_TICKER_INFO_FIELDS else np.float64
+            setattr(self, field, np.zeros(len(self.tickers), dtype=dtype))
+
+    def to_state(self) -> dict:
+        """
+        JSON 으로 저장할 수 있는 현재 상태
+        """
+        columns = {field: getattr(self, field).tolist() for field in TICKER_INFO_FIELDS}
+        return {
+            "initial_nav": self.account_status.initial_nav,
+            "current_nav": _to_json_value(self.account_status.current_nav),
+            "total_nav": _to_json_value(self.total_nav),
+            "ticker_info": [
+                {"ticker": ticker} | {field: columns[field][i] for field in TICKER_INFO_FIELDS}
+                for i, ticker in enumerate(self.tickers)
+            ],
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "RebalancingContext":
+        """
+        to_state() 로 저장한 상태를 복원한다.
+        """
+        tickers = [info["ticker"] for info in state["ticker_info"]]
+        context = cls(state["initial_nav"], tickers)
+        context.account_status.current_nav = state["current_nav"]
+        context.total_nav = state["total_nav"]
+        for field in TICKER_INFO_FIELDS:
+            dtype = bool if field in BOOL_TICKER_INFO_FIELDS else np.float64
+            values = [info[field] for info in state["ticker_info"]]
+            setattr(context, field, np.array(values, dtype=dtype))
+        return context
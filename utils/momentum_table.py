@@ -0,0 +1,176 @@
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from utils.calculator import calculate_momentum_matrix
+from utils.price_matrix import PriceMatrix
+
+MOMENTUM_COLUMNS = ["date", "ticker", "months", "momentum"]
+
+
+def calculate_momentum_frame(
+    prices: PriceMatrix, months_list: list, start_date=None, end_date=None
+) -> pd.DataFrame:
+    """
+    [start_date, end_date] 의 거래일마다 직전 months 개월 구간의 종목별 모멘텀을 계산한다.
+    구간에 가격이 없는 종목은 행을 만들지 않는다.
+
+    Returns:
+        (date, ticker, months, momentum) DataFrame
+    """
+    lo = 0 if start_date is None else int(
+        np.searchsorted(prices.dates, np.datetime64(start_date, "D"), side="left")
+    )
+    hi = len(prices.dates) if end_date is None else int(
+        np.searchsorted(prices.dates, np.datetime64(end_date, "D"), side="right")
+    )
+    dates = pd.DatetimeIndex(prices.dates[lo:hi])
+    if len(dates) == 0 or len(prices.tickers) == 0:
+        return pd.DataFrame(columns=MOMENTUM_COLUMNS)
+
+    frames = []
+    for months in months_list:
+        first_prices, last_prices, present = prices.window_prices(
+            (dates - pd.DateOffset(months=months)).values, dates.values
+        )
+        momentum = calculate_momentum_matrix(first_prices, last_prices)
+        rows, columns = np.nonzero(present)
+        frames.append(
+            pd.DataFrame(
+                {
+                    "date": dates[rows],
+                    "ticker": np.array(prices.tickers, dtype=object)[columns],
+                    "months": months,
+                    "momentum": momentum[rows, columns],
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+class MomentumTable:
+    """
+    ticker_momentum 테이블을 기간(개월)별 (날짜 x 종목) 행렬로 보관하는 구조체
+
+    - dates: 오름차순으로 정렬된 거래일 배열 (datetime64[D])
+    - tickers: 종목 리스트
+    - values: {기간: 모멘텀 행렬}
+    - present: {기간: 값 존재 여부 행렬} (구간에 가격이 없으면 False)
+
+    since() 로 잘라낸 행렬은 원본 배열을 복사하지 않고 공유하므로 수정하면 안 된다.
+    """
+
+    def __init__(self, dates: np.ndarray, tickers: list, values: dict, present: dict):
+        self.dates = dates
+        self.tickers = tickers
+        self.values = values
+        self.present = present
+
+    @cached_property
+    def _columns(self) -> dict:
+        return {ticker: i for i, ticker in enumerate(self.tickers)}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "MomentumTable":
+        """
+        (date, ticker, months, momentum) DataFrame 을 행렬로 변환한다.
+        """
+        dates = np.unique(df["date"].values.astype("datetime64[D]"))
+        tickers = list(pd.unique(df["ticker"]))
+        rows = np.searchsorted(dates, df["date"].values.astype("datetime64[D]"))
+        columns = pd.Index(tickers).get_indexer(df["ticker"])
+        values = {}
+        present = {}
+        for months in pd.unique(df["months"]):
+            selected = (df["months"] == months).to_numpy()
+            months = int(months)
+            values[months] = np.full((len(dates), len(tickers)), np.nan)
+            present[months] = np.zeros((len(dates), len(tickers)), dtype=bool)
+            values[months][rows[selected], columns[selected]] = df["momentum"].to_numpy(
+                dtype=np.float64
+            )[selected]
+            present[months][rows[selected], columns[selected]] = True
+        return cls(dates, tickers, values, present)
+
+    @classmethod
+    def from_prices(cls, prices: PriceMatrix, months_list: list) -> "MomentumTable":
+        """
+        가격 행렬의 모든 거래일에 대해 months_list 기간의 모멘텀을 바로 행렬로 계산한다.
+        (calculate_momentum_frame 후 from_frame 한 것과 같고, DataFrame 을 거치지 않음)
+        """
+        dates = pd.DatetimeIndex(prices.dates)
+        values = {}
+        present = {}
+        for months in months_list:
+            first_prices, last_prices, present[months] = prices.window_prices(
+                (dates - pd.DateOffset(months=months)).values, dates.values
+            )
+            values[months] = np.where(
+                present[months], calculate_momentum_matrix(first_prices, last_prices), np.nan
+            )
+        return cls(prices.dates, list(prices.tickers), values, present)
+
+    @property
+    def max_date(self):
+        return self.dates[-1] if len(self.dates) else None
+
+    def append(self, other: "MomentumTable") -> "MomentumTable":
+        """
+        현재 행렬의 마지막 날짜 이후의 모멘텀을 이어 붙인 새 행렬을 만든다.
+        두 행렬에 모두 있는 기간만 남기고, 새로 등장한 종목은 오른쪽 열로 추가된다.
+        """
+        if len(other.dates) == 0:
+            return self
+        if len(self.dates) == 0:
+            return other
+        tickers = self.tickers + [t for t in other.tickers if t not in self.tickers]
+        columns = [tickers.index(t) for t in other.tickers]
+        shape = (len(self.dates) + len(other.dates), len(tickers))
+        values = {}
+        present = {}
+        for months in self.values.keys() & other.values.keys():
+            values[months] = np.full(shape, np.nan)
+            values[months][: len(self.dates), : len(self.tickers)] = self.values[months]
+            values[months][len(self.dates) :, columns] = other.values[months]
+            present[months] = np.zeros(shape, dtype=bool)
+            present[months][: len(self.dates), : len(self.tickers)] = self.present[months]
+            present[months][len(self.dates) :, columns] = other.present[months]
+        return MomentumTable(np.concatenate([self.dates, other.dates]), tickers, values, present)
+
+    def since(self, start_date) -> "MomentumTable":
+        """
+        start_date 이후(당일 포함)의 모멘텀만 남긴 행렬을 반환한다.
+        """
+        start = int(np.searchsorted(self.dates, np.datetime64(start_date, "D"), side="left"))
+        return MomentumTable(
+            self.dates[start:],
+            self.tickers,
+            {months: values[start:] for months, values in self.values.items()},
+            {months: present[start:] for months, present in self.present.items()},
+        )
+
+    def lookup(
+        self, tickers: list, dates: np.ndarray, months: int
+    ) -> (np.ndarray, np.ndarray, np.ndarray):
+        """
+        날짜마다 tickers 순서의 모멘텀을 찾는다.
+        날짜가 행렬에 없거나, 기간이 없거나, 행렬에 없는 종목이 있으면 해당 날짜는 찾지 못한 것으로 본다.
+
+        Returns:
+            모멘텀 (날짜 수 x 종목 수)   ||
+            값 존재 여부 (날짜 수 x 종목 수)   ||
+            찾은 날짜 여부 (날짜 수)
+        """
+        shape = (len(dates), len(tickers))
+        columns = [self._columns.get(ticker, -1) for ticker in tickers]
+        if months not in self.values or -1 in columns or len(self.dates) == 0:
+            return np.full(shape, np.nan), np.zeros(shape, dtype=bool), np.zeros(len(dates), bool)
+
+        dates = dates.astype("datetime64[D]")
+        rows = np.minimum(np.searchsorted(self.dates, dates), len(self.dates) - 1)
+        found = self.dates[rows] == dates
+        index = (rows[:, None], np.array(columns, dtype=int))
+        values = np.where(found[:, None], self.values[months][index], np.nan)
+        present = found[:, None] & self.present[months][index]
+        return values, present, found
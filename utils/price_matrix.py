@@ -0,0 +1,251 @@
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from utils.trading_calendar import TradingCalendar
+
+
+class PriceMatrix:
+    """
+    가격 데이터를 (날짜 x 종목) NumPy 행렬로 보관하는 구조체
+
+    - dates: 오름차순으로 정렬된 거래일 배열 (datetime64[D])
+    - tickers: 종목 리스트 (항상 이름순)
+    - prices: 가격 행렬, 해당 날짜에 가격이 없으면 NaN
+    - momentum: 미리 계산된 모멘텀 (MomentumTable, 없으면 None)
+    - calendar: 거래일 달력 (TradingCalendar), 잘라낸 행렬끼리 리밸런싱 일정 캐시를 공유
+
+    since() 로 잘라낸 행렬은 원본 배열을 복사하지 않고 공유하므로 수정하면 안 된다.
+
+    종목 순서는 매도 수수료 차감 순서와 비중 목록(rebalance_weight_list)의 순서를 정하므로
+    DB 조회 순서나 데이터가 들어온 순서와 무관하게 항상 이름순으로 맞춘다.
+    """
+
+    def __init__(
+        self,
+        dates: np.ndarray,
+        tickers: list,
+        prices: np.ndarray,
+        prev_valid: np.ndarray = None,
+        next_valid: np.ndarray = None,
+        offset: int = 0,
+        momentum=None,
+        calendar: TradingCalendar = None,
+    ):
+        self.dates = dates
+        self.tickers = tickers
+        self.prices = prices
+        # prev_valid/next_valid 는 원본 행렬 기준의 행 번호이므로 잘라낸 위치(offset)를 함께 보관
+        self.offset = offset
+        self.momentum = momentum
+        self.calendar = calendar if calendar is not None else TradingCalendar(dates)
+
+        if prev_valid is None or next_valid is None:
+            valid = ~np.isnan(prices)
+            row_index = np.arange(len(dates))[:, None]
+            # 각 위치에서 가장 가까운 이전/이후의 유효한 가격 행 번호
+            prev_valid = np.maximum.accumulate(np.where(valid, row_index, -1), axis=0)
+            next_valid = np.minimum.accumulate(
+                np.where(valid, row_index, len(dates))[::-1], axis=0
+            )[::-1]
+        self.prev_valid = prev_valid
+        self.next_valid = next_valid
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "PriceMatrix":
+        """
+        fetch_ticker_data 가 반환하는 (date, ticker, price) 형태의 DataFrame 을 행렬로 변환한다.
+        종목은 이름순으로 정렬한다. (DataFrame 의 행 순서와 무관)
+        """
+        tickers = sorted(pd.unique(df["ticker"]))
+        pivot = df.pivot(index="date", columns="ticker", values="price")
+        pivot = pivot.reindex(columns=tickers).sort_index()
+        return cls(
+            pivot.index.values.astype("datetime64[D]"),
+            tickers,
+            pivot.to_numpy(dtype=np.float64),
+        )
+
+    def append(self, other: "PriceMatrix") -> "PriceMatrix":
+        """
+        현재 행렬의 마지막 날짜 이후의 가격을 이어 붙인 새 행렬을 만든다.
+        새로 등장한 종목도 이름순 위치에 끼워 넣는다.
+        """
+        if len(other.dates) == 0:
+            return self
+        tickers = sorted(set(self.tickers) | set(other.tickers))
+        index = pd.Index(tickers)
+        prices = np.full((len(self.dates) + len(other.dates), len(tickers)), np.nan)
+        prices[: len(self.dates), index.get_indexer(self.tickers)] = self.prices
+        prices[len(self.dates) :, index.get_indexer(other.tickers)] = other.prices
+        return PriceMatrix(np.concatenate([self.dates, other.dates]), tickers, prices)
+
+    def since(self, start_date) -> "PriceMatrix":
+        """
+        start_date 이후(당일 포함)의 가격만 남긴 행렬을 반환한다.
+        구간 안에 가격이 하나도 없는 종목이 없으면 배열을 복사하지 않는다.
+        """
+        start = int(np.searchsorted(self.dates, np.datetime64(start_date, "D"), side="left"))
+        offset = self.offset + start
+        momentum = self.momentum.since(start_date) if self.momentum is not None else None
+        calendar = self.calendar.slice(start)
+        listed = self.prev_valid[-1] >= offset if len(self.dates) else np.zeros(0, bool)
+        if listed.all():
+            return PriceMatrix(
+                self.dates[start:],
+                self.tickers,
+                self.prices[start:],
+                self.prev_valid[start:],
+                self.next_valid[start:],
+                offset,
+                momentum,
+                calendar,
+            )
+        return PriceMatrix(
+            self.dates[start:],
+            [t for t, is_listed in zip(self.tickers, listed) if is_listed],
+            self.prices[start:, listed],
+            momentum=momentum,
+            calendar=calendar,
+        )
+
+    def until(self, end_date) -> "PriceMatrix":
+        """
+        end_date 이전(당일 포함)의 가격만 남긴 행렬을 반환한다. (배열을 복사하지 않음)
+        구간 안에 가격이 하나도 없는 종목은 제외한다.
+        """
+        end = int(np.searchsorted(self.dates, np.datetime64(end_date, "D"), side="right"))
+        prices = PriceMatrix(
+            self.dates[:end],
+            self.tickers,
+            self.prices[:end],
+            self.prev_valid[:end],
+            self.next_valid[:end],
+            self.offset,
+            self.momentum,
+            self.calendar.slice(0, end),
+        )
+        listed = self.prev_valid[end - 1] >= self.offset if end else np.zeros(0, bool)
+        return prices.select([t for t, is_listed in zip(self.tickers, listed) if is_listed])
+
+    def select(self, tickers: list | None) -> "PriceMatrix":
+        """
+        tickers 에 있는 종목만 남긴 행렬을 반환한다. (종목 순서는 현재 행렬의 순서를 따름)
+        tickers 가 None 이면 그대로 반환한다.
+        """
+        if tickers is None:
+            return self
+        wanted = set(tickers)
+        columns = [i for i, ticker in enumerate(self.tickers) if ticker in wanted]
+        if len(columns) == len(self.tickers):
+            return self
+        return PriceMatrix(
+            self.dates,
+            [self.tickers[i] for i in columns],
+            self.prices[:, columns],
+            self.prev_valid[:, columns],
+            self.next_valid[:, columns],
+            self.offset,
+            self.momentum,
+            self.calendar,
+        )
+
+    @property
+    def max_date(self):
+        return self.dates[-1] if len(self.dates) else None
+
+    @cached_property
+    def version(self) -> str:
+        """
+        가격 데이터 버전 (마지막 날짜와 가격 개수), 데이터가 추가되면 바뀐다.
+        """
+        return f"{self.max_date}:{int(np.count_nonzero(~np.isnan(self.prices)))}"
+
+    def index_on_or_before(self, date) -> int:
+        """
+        주어진 날짜 이전(당일 포함)의 마지막 거래일 인덱스, 없으면 -1
+        """
+        return self.calendar.index_on_or_before(date)
+
+    def missing_ranges(self, ticker: str, start_date, end_date) -> list:
+        """
+        [start_date, end_date] 구간에서 ticker 의 가격이 비어있는 날짜 구간 목록
+
+        - 다른 종목에 가격이 있는 날짜(거래일)에 ticker 가격이 없으면 누락으로 본다.
+        - 행렬의 첫 날짜 이전, 마지막 날짜 이후는 거래일을 알 수 없으므로 통째로 누락으로 본다.
+
+        Returns:
+            [(시작일, 종료일), ...]  (datetime64[D], 양 끝 포함)
+        """
+        start = np.datetime64(start_date, "D")
+        end = np.datetime64(end_date, "D")
+        one_day = np.timedelta64(1, "D")
+        if start > end:
+            return []
+        if ticker not in self.tickers or len(self.dates) == 0:
+            return [(start, end)]
+
+        ranges = []
+        if start < self.dates[0]:
+            ranges.append((start, min(end, self.dates[0] - one_day)))
+
+        lo = int(np.searchsorted(self.dates, start, side="left"))
+        hi = int(np.searchsorted(self.dates, end, side="right"))
+        missing = np.isnan(self.prices[lo:hi, self.tickers.index(ticker)]).astype(np.int8)
+        edges = np.diff(np.concatenate([[0], missing, [0]]))
+        run_starts = np.flatnonzero(edges == 1) + lo
+        run_ends = np.flatnonzero(edges == -1) - 1 + lo
+        ranges.extend(zip(self.dates[run_starts], self.dates[run_ends]))
+
+        if end > self.dates[-1]:
+            ranges.append((max(start, self.dates[-1] + one_day), end))
+
+        # 바로 이어지는 구간은 하나로 합친다
+        merged = []
+        for range_start, range_end in ranges:
+            if merged and range_start <= merged[-1][1] + one_day:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], range_end))
+            else:
+                merged.append((range_start, range_end))
+        return merged
+
+    def window_prices(
+        self, start_dates: np.ndarray, end_dates: np.ndarray
+    ) -> (np.ndarray, np.ndarray, np.ndarray):
+        """
+        [start_date, end_date] 구간마다 종목별 첫 가격과 마지막 가격을 한 번에 구한다.
+        구간이 있는데 행렬에 날짜가 하나도 없으면 ValueError 를 발생시킨다.
+
+        Returns:
+            구간 내 첫 가격 (구간 수 x 종목 수)   ||
+            구간 내 마지막 가격 (구간 수 x 종목 수)   ||
+            구간 내 가격 존재 여부 (구간 수 x 종목 수)
+        """
+        if len(self.dates) == 0 and len(start_dates):
+            raise ValueError("No price data in the requested range")
+        lo = np.searchsorted(self.dates, start_dates.astype("datetime64[D]"), side="left")
+        hi = np.searchsorted(self.dates, end_dates.astype("datetime64[D]"), side="right")
+        columns = np.arange(len(self.tickers))
+
+        first_index = self.next_valid[np.minimum(lo, len(self.dates) - 1)] - self.offset
+        last_index = self.prev_valid[np.maximum(hi - 1, 0)] - self.offset
+        present = (first_index < hi[:, None]) & (last_index >= lo[:, None])
+
+        first_prices = np.where(
+            present, self.prices[np.where(present, first_index, 0), columns], np.nan
+        )
+        last_prices = np.where(
+            present, self.prices[np.where(present, last_index, 0), columns], np.nan
+        )
+        return first_prices, last_prices, present
+
+
+def carry_forward(values: np.ndarray, updated: np.ndarray, initial) -> np.ndarray:
+    """
+    updated 가 False 인 행은 직전에 갱신된 값을 유지한다. (갱신된 적이 없으면 initial)
+    """
+    row_index = np.where(updated, np.arange(len(values))[:, None], -1)
+    row_index = np.maximum.accumulate(row_index, axis=0)
+    columns = np.arange(values.shape[1])
+    return np.where(row_index >= 0, values[np.maximum(row_index, 0), columns], initial)
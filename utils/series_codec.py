@@ -0,0 +1,99 @@
+import json
+import os
+import struct
+import zlib
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:  # zstandard 가 없으면 zlib 으로 압축
+    zstandard = None
+
+# 저장 시 사용할 압축 방식 (zstd, zlib, none)
+SERIES_COMPRESSION = os.getenv(
+    "SERIES_COMPRESSION", "zstd" if zstandard is not None else "zlib"
+)
+
+# 블롭 형식: MAGIC(2) + 압축 방식(1) + 본문
+MAGIC = b"S1"
+COMPRESSION_FLAGS = {"none": b"n", "zlib": b"z", "zstd": b"s"}
+
+
+def _compress(payload: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        if zstandard is None:
+            raise ValueError("zstandard is not installed")
+        payload = zstandard.ZstdCompressor(level=3).compress(payload)
+    elif compression == "zlib":
+        payload = zlib.compress(payload, 6)
+    elif compression != "none":
+        raise ValueError(f"Unknown compression: {compression}")
+    return MAGIC + COMPRESSION_FLAGS[compression] + payload
+
+
+def _decompress(blob: bytes) -> bytes:
+    if blob[:2] != MAGIC:
+        raise ValueError("Unknown series format")
+    flag, payload = blob[2:3], blob[3:]
+    if flag == b"s":
+        if zstandard is None:
+            raise ValueError("zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if flag == b"z":
+        return zlib.decompress(payload)
+    return payload
+
+
+def encode_floats(values: list, compression: str = SERIES_COMPRESSION) -> bytes:
+    """
+    float 리스트를 float64 배열로 저장한다. (값이 바뀌지 않음)
+    """
+    return _compress(np.asarray(values, dtype="<f8").tobytes(), compression)
+
+
+def decode_floats(blob: bytes) -> list:
+    return np.frombuffer(_decompress(blob), dtype="<f8").tolist()
+
+
+def encode_weights(weight_list: list, compression: str = SERIES_COMPRESSION) -> bytes:
+    """
+    리밸런싱별 [(종목, 비중), ...] 리스트를 (리밸런싱 횟수 x 종목 수) float64 행렬로 저장한다.
+    종목 목록은 한 번만 저장하고, 해당 리밸런싱에 없는 종목은 NaN 으로 표시한다.
+
+    본문: 종목 목록 JSON 길이(4) + 리밸런싱 횟수(4) + 종목 목록 JSON + 행렬
+    """
+    tickers = list(dict.fromkeys(ticker for weights in weight_list for ticker, _ in weights))
+    if all(len(weights) == len(tickers) for weights in weight_list) and all(
+        [ticker for ticker, _ in weights] == tickers for weights in weight_list
+    ):
+        # 모든 리밸런싱의 종목 순서가 같으면 (일반적인 경우) 한 번에 변환
+        matrix = np.array(
+            [[weight for _, weight in weights] for weights in weight_list], dtype="<f8"
+        ).reshape(len(weight_list), len(tickers))
+    else:
+        columns = {ticker: i for i, ticker in enumerate(tickers)}
+        matrix = np.full((len(weight_list), len(tickers)), np.nan, dtype="<f8")
+        for i, weights in enumerate(weight_list):
+            for ticker, weight in weights:
+                matrix[i, columns[ticker]] = weight
+    header = json.dumps(tickers).encode("utf-8")
+    return _compress(
+        struct.pack("<II", len(header), len(weight_list)) + header + matrix.tobytes(), compression
+    )
+
+
+def decode_weights(blob: bytes) -> list:
+    payload = _decompress(blob)
+    header_size, rows = struct.unpack("<II", payload[:8])
+    tickers = json.loads(payload[8 : 8 + header_size])
+    matrix = np.frombuffer(payload[8 + header_size :], dtype="<f8").reshape(rows, len(tickers))
+    present = ~np.isnan(matrix)
+    return [
+        [
+            [ticker, weight]
+            for ticker, weight, is_present in zip(tickers, row, row_present)
+            if is_present
+        ]
+        for row, row_present in zip(matrix.tolist(), present.tolist())
+    ]
@@ -0,0 +1,100 @@
+import os
+from calendar import monthrange
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+from utils.lru import LRUCache
+
+# 달력별로 보관할 리밸런싱 일정 수 (잘라낸 달력끼리 공유)
+TRADING_SCHEDULE_CACHE_SIZE = int(os.getenv("TRADING_SCHEDULE_CACHE_SIZE", "1024"))
+
+
+def clamp_date(year: int, month: int, day: int) -> datetime:
+    """
+    year 년 month 월의 day 일 (그 달에 없는 날짜면 그 달의 마지막 날)
+    예) clamp_date(2024, 2, 31) -> 2024-02-29
+    """
+    if not 1 <= day <= 31:
+        raise ValueError(f"day must be 1 ~ 31: {day}")
+    return datetime(year, month, min(day, monthrange(year, month)[1]))
+
+
+class TradingCalendar:
+    """
+    거래일 달력 (daily_ticker 에 있는 날짜)
+
+    - dates: 오름차순으로 정렬된 거래일 배열 (datetime64[D])
+    - 날짜 조회는 이진 탐색 (O(log n))
+    - schedule() 로 계산한 리밸런싱 일정은 캐시하며, slice() 로 잘라낸 달력과 캐시를 공유한다.
+      (가격 캐시가 다시 만들어지면 달력도 새로 만들어지므로 새 가격이 들어오면 캐시도 비워진다.)
+    """
+
+    def __init__(self, dates: np.ndarray, schedules: LRUCache = None):
+        self.dates = dates
+        self._schedules = (
+            schedules if schedules is not None else LRUCache(TRADING_SCHEDULE_CACHE_SIZE)
+        )
+
+    def slice(self, start: int, end: int = None) -> "TradingCalendar":
+        """
+        dates[start:end] 만 남긴 달력 (배열을 복사하지 않고 일정 캐시를 공유)
+        """
+        return TradingCalendar(self.dates[start:end], self._schedules)
+
+    def __reduce__(self):
+        # 다른 프로세스로 넘길 때는 날짜만 보내고 일정 캐시는 새로 만든다
+        return TradingCalendar, (self.dates,)
+
+    def index_on_or_before(self, date) -> int:
+        """
+        주어진 날짜 이전(당일 포함)의 마지막 거래일 인덱스, 없으면 -1
+        """
+        return int(np.searchsorted(self.dates, np.datetime64(date, "D"), side="right")) - 1
+
+    @staticmethod
+    def target_date(current_date, trading_day: int, months: int = 1) -> datetime:
+        """
+        current_date 의 months 개월 뒤 trading_day 일 (거래일 여부와 무관, 그 달에 없는 날짜면 말일)
+        """
+        next_month = current_date + relativedelta(months=months)
+        return clamp_date(next_month.year, next_month.month, trading_day)
+
+    def next_trading_date(
+        self, current_date, trading_day: int, months: int = 1
+    ) -> pd.Timestamp | None:
+        """
+        current_date 다음 리밸런싱 날짜 - target_date 이전(당일 포함)의 마지막 거래일
+        target_date 이전에 거래일이 없으면 None
+        (target_date 가 마지막 거래일 이후면 마지막 거래일)
+        """
+        target_date = self.target_date(current_date, trading_day, months)
+        index = self.index_on_or_before(target_date)
+        if index < 0:
+            return None
+        return pd.Timestamp(self.dates[index])
+
+    def schedule(self, start_date, trading_day: int, months: int = 1) -> list:
+        """
+        start_date 와, 더 이상 다음 리밸런싱 날짜가 없을 때까지의 리밸런싱 날짜 목록
+        (다음 날짜가 없거나 이전 날짜와 같으면 멈춘다)
+        """
+        key = (
+            self.dates[0] if len(self.dates) else None,
+            self.dates[-1] if len(self.dates) else None,
+            start_date,
+            trading_day,
+            months,
+        )
+        dates = self._schedules.get(key)
+        if dates is None:
+            dates = [start_date]
+            while True:
+                next_date = self.next_trading_date(dates[-1], trading_day, months)
+                if next_date is None or next_date <= dates[-1]:
+                    break
+                dates.append(next_date)
+            self._schedules.put(key, dates)
+        return list(dates)